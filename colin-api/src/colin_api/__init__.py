@@ -23,6 +23,7 @@ from sentry_sdk.integrations.flask import FlaskIntegration  # noqa: I001
 
 from colin_api import config, errorhandlers
 from colin_api.resources import API, API_BLUEPRINT, OPS_BLUEPRINT
+from colin_api.resources.db import DB
 from colin_api.services import flags
 from colin_api.utils.auth import jwt
 from colin_api.utils.logging import setup_logging
@@ -43,6 +44,7 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
             integrations=[FlaskIntegration()]
         )
 
+    DB.init_app(app)
     flags.init_app(app)
     errorhandlers.init_app(API)
     app.register_blueprint(API_BLUEPRINT)
@@ -74,6 +74,11 @@ class _Config:  # pylint: disable=too-few-public-methods
     ORACLE_HOST = os.getenv('ORACLE_HOST', '')
     ORACLE_PORT = int(os.getenv('ORACLE_PORT', '1521'))
     ORACLE_BNI_DB_LINK = os.getenv('ORACLE_BNI_DB_LINK', '')
+    # session pool, one per worker process; the wait timeout is in milliseconds
+    ORACLE_POOL_MIN = int(os.getenv('ORACLE_POOL_MIN', '1'))
+    ORACLE_POOL_MAX = int(os.getenv('ORACLE_POOL_MAX', '10'))
+    ORACLE_POOL_INCREMENT = int(os.getenv('ORACLE_POOL_INCREMENT', '1'))
+    ORACLE_POOL_WAIT_TIMEOUT = int(os.getenv('ORACLE_POOL_WAIT_TIMEOUT', '1500'))
 
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = os.getenv('JWT_OIDC_WELL_KNOWN_CONFIG')
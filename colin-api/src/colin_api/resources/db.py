@@ -15,15 +15,28 @@
 
 These will get initialized by the application.
 """
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 import cx_Oracle
 from flask import _app_ctx_stack, current_app
 
 
 class OracleDB:
-    """Oracle database connection object for re-use in application."""
+    """Oracle database connection object for re-use in application.
+
+    Each worker process holds one session pool per app, created on first use and sized from the config.
+    Connections from acquire or cursor are released back to the pool as soon as the caller is done with them.
+    Any connection still held when the app context tears down, e.g. from the connection property, is released then.
+    """
 
     def __init__(self, app=None):
         """initializer, supports setting the app context on instantiation."""
+        self._pool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.app = None
         if app is not None:
             self.init_app(app)
 
@@ -34,14 +47,26 @@ class OracleDB:
         :return: naked
         """
         self.app = app
+        app.extensions['oracle_pool_stats'] = {'acquired': 0, 'waited': 0, 'failed': 0, 'acquireMs': 0.0}
         app.teardown_appcontext(self.teardown)
 
     @staticmethod
-    def teardown():
-        """Oracle session pool cleans up after itself."""
+    def teardown(exception=None):  # pylint: disable=unused-argument; passed by flask
+        """Release the connections of this app context that were not released by their callers."""
         ctx = _app_ctx_stack.top
-        if hasattr(ctx, 'oracle_pool'):
-            ctx.oracle_pool.close()
+        connections = getattr(ctx, '_oracle_connections', None)
+        if not connections:
+            return
+
+        if (pool := OracleDB._get_app_pool(ctx.app)) is None:
+            return
+
+        for connection in connections:
+            try:
+                pool.release(connection)
+            except cx_Oracle.Error as err:  # pylint: disable=c-extension-no-member
+                ctx.app.logger.error(f'Unable to release oracle connection: {err}')
+        ctx._oracle_connections = []  # pylint: disable = protected-access; need this attribute
 
     @staticmethod
     def _create_pool():
@@ -65,32 +90,129 @@ class OracleDB:
                 current_app.config.get('ORACLE_HOST'),
                 current_app.config.get('ORACLE_PORT'),
                 current_app.config.get('ORACLE_DB_NAME')),
-            min=1,
-            max=10,
-            increment=1,
+            min=current_app.config.get('ORACLE_POOL_MIN', 1),
+            max=current_app.config.get('ORACLE_POOL_MAX', 10),
+            increment=current_app.config.get('ORACLE_POOL_INCREMENT', 1),
             connectiontype=cx_Oracle.Connection,  # pylint:disable=c-extension-no-member
             threaded=True,
-            getmode=cx_Oracle.SPOOL_ATTRVAL_NOWAIT,  # pylint:disable=c-extension-no-member
-            waitTimeout=1500,
+            getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,  # pylint:disable=c-extension-no-member
+            waitTimeout=current_app.config.get('ORACLE_POOL_WAIT_TIMEOUT', 1500),
             timeout=3600,
             sessionCallback=init_session,
             encoding='UTF-8',
             nencoding='UTF-8')
 
+    @staticmethod
+    def _get_app_pool(app):
+        """Return the session pool this process created for the app, if any."""
+        pid, pool = app.extensions.get('oracle_pool', (None, None))
+        return pool if pid == os.getpid() else None
+
+    @property
+    def pool(self):
+        """Return the session pool of the current app, creating it on first use in this process."""
+        app = current_app._get_current_object()  # pylint: disable = protected-access; need the app object
+        if (pool := self._get_app_pool(app)) is None:
+            with self._pool_lock:
+                if (pool := self._get_app_pool(app)) is None:
+                    pool = self._create_pool()
+                    app.extensions['oracle_pool'] = (os.getpid(), pool)
+        return pool
+
+    def pool_stats(self) -> dict:
+        """Return the busy, open and wait counts of the session pool of the current app."""
+        with self._stats_lock:
+            stats = dict(current_app.extensions.get('oracle_pool_stats', {}))
+        pool = self.pool
+        return {
+            'busy': pool.busy,
+            'open': pool.opened,
+            'min': pool.min,
+            'max': pool.max,
+            'acquired': stats.get('acquired', 0),
+            'waited': stats.get('waited', 0),
+            'failed': stats.get('failed', 0),
+            'avgAcquireMs': round(stats['acquireMs'] / stats['acquired'], 2) if stats.get('acquired') else 0
+        }
+
     @property
     def connection(self):  # pylint: disable=inconsistent-return-statements
         """Create connection property for the NROService.
 
-        If this is running in a Flask context,
-        then either get the existing connection pool or create a new one
-        and then return an acquired session
+        If this is running in a Flask context, then acquire a session from the process session pool.
+        The caller releases the session back to the pool with release, or it is released when the app context
+        tears down. Prefer acquire or cursor, which release it for the caller.
         :return: cx_Oracle.connection type
         """
         ctx = _app_ctx_stack.top
         if ctx is not None:
-            if not hasattr(ctx, '_oracle_pool'):
-                ctx._oracle_pool = self._create_pool()  # pylint: disable = protected-access; need this method
-            return ctx._oracle_pool.acquire()  # pylint: disable = protected-access; need this method
+            pool = self.pool
+            stats = ctx.app.extensions.setdefault('oracle_pool_stats',
+                                                  {'acquired': 0, 'waited': 0, 'failed': 0, 'acquireMs': 0.0})
+            waited = pool.busy >= pool.max
+
+            start = time.perf_counter()
+            try:
+                connection = pool.acquire()
+            except cx_Oracle.DatabaseError:  # pylint: disable=c-extension-no-member
+                with self._stats_lock:
+                    stats['waited'] += waited
+                    stats['failed'] += 1
+                raise
+            with self._stats_lock:
+                stats['waited'] += waited
+                stats['acquired'] += 1
+                stats['acquireMs'] += (time.perf_counter() - start) * 1000
+
+            if not hasattr(ctx, '_oracle_connections'):
+                ctx._oracle_connections = []  # pylint: disable = protected-access; need this attribute
+            ctx._oracle_connections.append(connection)  # pylint: disable = protected-access; need this attribute
+            return connection
+
+    def release(self, connection):
+        """Release the connection back to the session pool and stop tracking it for the app context teardown."""
+        ctx = _app_ctx_stack.top
+        connections = getattr(ctx, '_oracle_connections', None) or []
+        # connections don't compare by value, so remove this one by identity
+        ctx_connections = [c for c in connections if c is not connection]
+        if len(ctx_connections) == len(connections):
+            return
+        ctx._oracle_connections = ctx_connections  # pylint: disable = protected-access; need this attribute
+
+        try:
+            self.pool.release(connection)
+        except cx_Oracle.Error as err:  # pylint: disable=c-extension-no-member
+            ctx.app.logger.error(f'Unable to release oracle connection: {err}')
+
+    @contextmanager
+    def acquire(self, connection=None):
+        """Yield connection, or a session acquired from the pool for the duration of the block.
+
+        An acquired session is rolled back if the block raises, and released back to the pool on exit.
+        A connection passed in belongs to the caller and is yielded as is.
+        """
+        if connection is not None:
+            yield connection
+            return
+
+        connection = self.connection
+        try:
+            yield connection
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            self.release(connection)
+
+    @contextmanager
+    def cursor(self, cursor=None):
+        """Yield cursor, or a cursor of a session acquired from the pool for the duration of the block."""
+        if cursor is not None:
+            yield cursor
+            return
+
+        with self.acquire() as connection:
+            yield connection.cursor()
 
 
 # export instance of this class
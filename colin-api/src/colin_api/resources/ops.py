@@ -34,8 +34,8 @@ class Healthz(Resource):
         """Return a JSON object stating the health of the Service and dependencies."""
         try:
             # check db connection working
-            cursor = DB.connection.cursor()
-            cursor.execute('select 1 from dual')
+            with DB.cursor() as cursor:
+                cursor.execute('select 1 from dual')
 
         except cx_Oracle.DatabaseError as err:  # pylint:disable=c-extension-no-member
             try:
@@ -56,3 +56,17 @@ class Readyz(Resource):
     def get():
         """Return a JSON object that identifies if the service is setupAnd ready to work."""
         return {'message': 'api is ready'}, 200
+
+
+@API.route('pool')
+class Pool(Resource):
+    """Reports on the oracle session pool of this worker process."""
+
+    @staticmethod
+    def get():
+        """Return a JSON object with the busy, open and wait counts of the session pool."""
+        try:
+            return DB.pool_stats(), 200
+        except cx_Oracle.DatabaseError as err:  # pylint:disable=c-extension-no-member
+            current_app.logger.error(err.with_traceback(None))
+            return {'message': 'pool is unavailable'}, 500
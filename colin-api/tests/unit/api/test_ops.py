@@ -44,3 +44,15 @@ def test_ops_readyz(client):
 
     assert 200 == rv.status_code
     assert {'message': 'api is ready'} == rv.json
+
+
+@oracle_integration
+def test_ops_pool(client):
+    """Assert that the session pool counts are reported."""
+    client.get('/ops/healthz')
+    rv = client.get('/ops/pool')
+
+    assert 200 == rv.status_code
+    assert rv.json['open'] >= 1
+    assert rv.json['acquired'] >= 1
+    assert {'busy', 'open', 'min', 'max', 'waited', 'failed'} <= set(rv.json.keys())
@@ -62,6 +62,10 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     NATS_CLIENT_NAME = os.getenv('NATS_CLIENT_NAME', None)
     NATS_EMAILER_SUBJECT = os.getenv('NATS_EMAILER_SUBJECT', 'entity.email')
 
+    # businesses read a page at a time, with the reminders of a page published a batch at a time
+    AR_REMINDER_PAGE_SIZE = int(os.getenv('AR_REMINDER_PAGE_SIZE', '500'))
+    AR_REMINDER_PUBLISH_BATCH_SIZE = int(os.getenv('AR_REMINDER_PUBLISH_BATCH_SIZE', '50'))
+
     SECRET_KEY = 'a secret'
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
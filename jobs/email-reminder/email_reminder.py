@@ -16,6 +16,8 @@ import asyncio
 import logging
 import os
 import sys
+import time
+from dataclasses import dataclass
 
 import requests
 import sentry_sdk  # noqa: I001, E501; pylint: disable=ungrouped-imports; conflicts with Flake8
@@ -72,8 +74,8 @@ def register_shellcontext(app):
     app.shell_context_processor(shell_context)
 
 
-async def send_email(business_id: int, ar_fee: str, ar_year: str, app: Flask, qsm: QueueService):
-    """Put bn email messages on the queue for all businesses with new tax ids."""
+async def send_email(business_id: int, ar_fee: str, ar_year: str, app: Flask, qsm: QueueService) -> bool:
+    """Put the ar reminder email message on the queue, returning if it was published."""
     try:
         subject = app.config['NATS_EMAILER_SUBJECT']
         payload = {
@@ -86,12 +88,14 @@ async def send_email(business_id: int, ar_fee: str, ar_year: str, app: Flask, qs
             }
         }
         await qsm.publish_json_to_subject(payload, subject)
+        return True
     except Exception as err:  # pylint: disable=broad-except # noqa F841;
         # mark any failure for human review
         capture_message(
             f'Queue Error: Failed to place ar reminder email for business id {business_id} on Queue with error:{err}',
             level='error'
         )
+        return False
 
 
 def get_ar_fee(app: Flask, legal_type: str, token: str) -> str:
@@ -117,25 +121,94 @@ def get_ar_fee(app: Flask, legal_type: str, token: str) -> str:
     return str(ar_fee)
 
 
-def get_businesses(legal_types: list):
-    """Get businesses to send AR reminder today."""
+def get_ar_fees(app: Flask, legal_types: list, token: str) -> dict:
+    """Get the AR fee of each legal type, once for the run."""
+    return {legal_type: get_ar_fee(app, legal_type, token) for legal_type in dict.fromkeys(legal_types)}
+
+
+def get_businesses(legal_types: list, after_id: int = 0, limit: int = 500) -> list:
+    """Get a page of the businesses to send AR reminder today, starting after the business id after_id.
+
+    The page is keyed on the business id, so the businesses reminded (and dropping out of the filter) don't shift
+    the businesses still to be read.
+    """
     where_clause = text(
         'CASE WHEN last_ar_reminder_year IS NULL THEN date(founding_date)' +
         ' ELSE date(founding_date)' +
         ' + MAKE_INTERVAL(YEARS := last_ar_reminder_year - EXTRACT(YEAR FROM founding_date)::INTEGER)' +
         " END  + interval '1 year' <= CURRENT_DATE")
-    return db.session.query(Business).filter(
+    return db.session.query(Business.id,
+                            Business.legal_type,
+                            Business.founding_date,
+                            Business.last_ar_reminder_year).filter(
         Business.legal_type.in_(legal_types),
         Business.send_ar_ind == True,  # pylint: disable=singleton-comparison; # noqa: E712;
         Business.state == Business.State.ACTIVE,
         # restoration_expiry_date will have a value for limitedRestoration and limitedRestorationExtension
         Business.restoration_expiry_date == None,  # pylint: disable=singleton-comparison; # noqa: E711;
+        Business.id > after_id,
         where_clause
-    ).order_by(Business.id).paginate(per_page=20)
+    ).order_by(Business.id).limit(limit).all()
+
+
+def update_ar_reminder_years(ar_years: dict):
+    """Set the last ar reminder year of the businesses, in one commit, from a dict of business id to year.
+
+    The businesses are updated through the session rather than with a bulk update, so the change is versioned
+    in businesses_version like any other change to the business.
+    """
+    if ar_years:
+        for business in db.session.query(Business).filter(Business.id.in_(list(ar_years))).all():
+            business.last_ar_reminder_year = ar_years[business.id]
+        db.session.commit()
+
+
+@dataclass
+class ReminderStats:
+    """The counts of a reminder run."""
+
+    selected: int = 0
+    published: int = 0
+    failed: int = 0
+    started: float = 0
+
+    def log(self, app: Flask):
+        """Log the counts and the throughput of the run."""
+        elapsed = time.perf_counter() - self.started
+        app.logger.info(f'AR reminders: {self.selected} selected, {self.published} published, '
+                        f'{self.failed} failed in {elapsed:.1f}s '
+                        f'({self.published / elapsed if elapsed else 0:.1f} reminders/s)')
+
+
+async def send_ar_reminders(app: Flask, qsm: QueueService,  # pylint: disable=too-many-arguments
+                            businesses: list, ar_fees: dict, stats: ReminderStats):
+    """Publish the reminders of the businesses a batch at a time, then advance the reminded businesses' year.
+
+    Only the businesses whose reminder was acked by the queue are advanced, the others are picked up again next run.
+    """
+    batch_size = app.config['AR_REMINDER_PUBLISH_BATCH_SIZE']
+    for start in range(0, len(businesses), batch_size):
+        batch = businesses[start:start + batch_size]
+        ar_years = {business.id: (business.last_ar_reminder_year or business.founding_date.year) + 1
+                    for business in batch}
+        results = await asyncio.gather(*[send_email(business.id,
+                                                    ar_fees[business.legal_type],
+                                                    str(ar_years[business.id]),
+                                                    app,
+                                                    qsm)
+                                         for business in batch])
+        published = {business.id: ar_years[business.id]
+                     for business, result in zip(batch, results) if result}
+        update_ar_reminder_years(published)
+
+        stats.published += len(published)
+        stats.failed += len(batch) - len(published)
+        app.logger.debug(f'Queued ar reminders for {len(published)} of {len(batch)} businesses.')
 
 
 async def find_and_send_ar_reminder(app: Flask, qsm: QueueService):  # pylint: disable=redefined-outer-name
     """Find business to send annual report reminder."""
+    stats = ReminderStats(started=time.perf_counter())
     try:
         legal_types = [Business.LegalTypes.BCOMP.value]  # entity types to send ar reminder
 
@@ -146,33 +219,28 @@ async def find_and_send_ar_reminder(app: Flask, qsm: QueueService):  # pylint: d
                  Business.LegalTypes.BC_ULC_COMPANY.value]
             )
 
-        ar_fees = {}
-
         # get token
         token = AccountService.get_bearer_token()
-        for legal_type in legal_types:
-            ar_fees[legal_type] = get_ar_fee(app, legal_type, token)
+        ar_fees = get_ar_fees(app, legal_types, token)
+
+        # connect once, rather than from each of the concurrent publishes
+        await qsm.connect()
 
         app.logger.debug('Getting businesses to send AR reminder today')
-        pagination = get_businesses(legal_types)
-        while pagination.items:
+        page_size = app.config['AR_REMINDER_PAGE_SIZE']
+        after_id = 0
+        while businesses := get_businesses(legal_types, after_id, page_size):
             app.logger.debug('Processing businesses to send AR reminder')
-            for business in pagination.items:
-                ar_year = (business.last_ar_reminder_year
-                           if business.last_ar_reminder_year else business.founding_date.year) + 1
-
-                await send_email(business.id, ar_fees[business.legal_type], str(ar_year), app, qsm)
-                app.logger.debug(f'Successfully queued ar reminder for business id {business.id}.')
-                business.last_ar_reminder_year = ar_year
-                business.save()
-
-            if pagination.next_num:
-                pagination = pagination.next()
-            else:
+            stats.selected += len(businesses)
+            await send_ar_reminders(app, qsm, businesses, ar_fees, stats)
+            after_id = businesses[-1].id
+            if len(businesses) < page_size:
                 break
 
     except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
         app.logger.error(err)
+    finally:
+        stats.log(app)
 
 
 async def send_outstanding_bcomps_ar_reminder(app: Flask, qsm: QueueService):  # pylint: disable=redefined-outer-name
@@ -78,6 +78,10 @@ class _Config(object):  # pylint: disable=too-few-public-methods
 
     PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 
+    # the due filings are fetched a page at a time and published in batches
+    FED_PAGE_SIZE = int(os.getenv('FED_PAGE_SIZE', '500'))
+    FED_PUBLISH_BATCH_SIZE = int(os.getenv('FED_PUBLISH_BATCH_SIZE', '50'))
+
     COLIN_URL = os.getenv('COLIN_URL', '')
     LEGAL_URL = os.getenv('LEGAL_URL', '')
     AUTH_URL = os.getenv('AUTH_URL', '')
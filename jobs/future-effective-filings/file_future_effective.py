@@ -19,11 +19,9 @@ import asyncio
 import logging
 import os
 import random
-from datetime import datetime, timezone
 
 import requests
 import sentry_sdk  # noqa: I001; pylint: disable=ungrouped-imports; conflicts with Flake8
-from dateutil.parser import parse
 from dotenv import find_dotenv, load_dotenv
 from entity_queue_common.service import ServiceWorker
 from flask import Flask
@@ -74,14 +72,30 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     return app
 
 
-def get_filings(app: Flask = None):
-    """Get a filing with filing_id."""
-    response = requests.get(f'{app.config["LEGAL_URL"]}/internal/filings/PAID')
+def get_due_filing_ids(app: Flask, after_id: int = 0) -> list:
+    """Get a page of the ids of the PAID filings that are due, starting after after_id."""
+    response = requests.get(f'{app.config["LEGAL_URL"]}/internal/filings/future_effective',
+                            params={'limit': app.config['FED_PAGE_SIZE'], 'afterId': after_id})
     if not response or response.status_code != 200:
         app.logger.error(f'Failed to collect filings from legal-api. \
             {response} {response.json()} {response.status_code}')
         raise Exception
-    return response.json()
+    return response.json()['filingIds']
+
+
+async def publish_filings(application: Flask, queue_service: ServiceWorker, filing_ids: list):
+    """Put the filings on the filer queue, publishing a batch of them at a time."""
+    batch_size = application.config['FED_PUBLISH_BATCH_SIZE']
+    for start in range(0, len(filing_ids), batch_size):
+        batch = filing_ids[start:start + batch_size]
+        results = await asyncio.gather(*[queue_service.publish(subject, {'filing': {'id': filing_id}})
+                                         for filing_id in batch],
+                                       return_exceptions=True)
+        for filing_id, result in zip(batch, results):
+            if isinstance(result, Exception):
+                application.logger.error(f'Failed to put filing {filing_id} on the queue: {result}')
+            else:
+                application.logger.debug(f'Successfully put filing {filing_id} on the queue.')
 
 
 async def run(loop, application: Flask = None):  # pylint: disable=redefined-outer-name
@@ -100,22 +114,21 @@ async def run(loop, application: Flask = None):  # pylint: disable=redefined-out
 
     with application.app_context():
         try:
-            filings = get_filings(app=application)
-            if not filings:
+            # legal-api only returns the filings that are due, a page at a time
+            after_id = 0
+            total = 0
+            while filing_ids := get_due_filing_ids(application, after_id):
+                await publish_filings(application, queue_service, filing_ids)
+                total += len(filing_ids)
+                after_id = filing_ids[-1]
+                if len(filing_ids) < application.config['FED_PAGE_SIZE']:
+                    break
+            if not total:
                 application.logger.debug('No PAID filings found to apply.')
-            for filing in filings:
-                filing_id = filing['filing']['header']['filingId']
-                effective_date = filing['filing']['header']['effectiveDate']
-                # NB: effective_date and now are both UTC
-                now = datetime.utcnow().replace(tzinfo=timezone.utc)
-                valid = effective_date and parse(effective_date) <= now
-                if valid:
-                    msg = {'filing': {'id': filing_id}}
-                    await queue_service.publish(subject, msg)
-                    application.logger.debug(f'Successfully put filing {filing_id} on the queue.')
         except Exception as err:  # pylint: disable=broad-except
             application.logger.error(err)
 
+
 if __name__ == '__main__':
     application = create_app()
     try:
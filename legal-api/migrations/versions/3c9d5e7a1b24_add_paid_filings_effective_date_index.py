@@ -0,0 +1,26 @@
+"""add_paid_filings_effective_date_index
+
+Revision ID: 3c9d5e7a1b24
+Revises: 8e1f3b6c2d47
+Create Date: 2024-08-19 10:12:44.218736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9d5e7a1b24'
+down_revision = '8e1f3b6c2d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the future effective filings job only looks for the PAID filings that are due
+    op.create_index('ix_filings_paid_effective_date', 'filings', ['effective_date'], unique=False,
+                    postgresql_where=sa.text("status = 'PAID'"))
+
+
+def downgrade():
+    op.drop_index('ix_filings_paid_effective_date', table_name='filings')
@@ -0,0 +1,26 @@
+"""add_filings_ledger_index
+
+Revision ID: 5a7c4e2f9d31
+Revises: bb9f4ab856b1
+Create Date: 2024-08-06 10:12:41.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c4e2f9d31'
+down_revision = 'bb9f4ab856b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # supports keyset paging of the filings ledger on (filing_date, id)
+    op.create_index('ix_filings_business_id_status_filing_date_id', 'filings',
+                    ['business_id', 'status', 'filing_date', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_filings_business_id_status_filing_date_id', table_name='filings')
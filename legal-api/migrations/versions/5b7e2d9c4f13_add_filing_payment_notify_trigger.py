@@ -0,0 +1,39 @@
+"""add_filing_payment_notify_trigger
+
+Revision ID: 5b7e2d9c4f13
+Revises: 3c9d5e7a1b24
+Create Date: 2024-08-26 09:41:07.552310
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2d9c4f13'
+down_revision = '3c9d5e7a1b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # entity-pay listens on filing_payment for the filing carrying a payment token, the notification
+    # is only delivered once the transaction setting the token commits
+    op.execute('''
+        CREATE OR REPLACE FUNCTION notify_filing_payment() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('filing_payment', NEW.payment_id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER filings_payment_notify
+            AFTER INSERT OR UPDATE OF payment_id ON filings
+            FOR EACH ROW
+            WHEN (NEW.payment_id IS NOT NULL)
+            EXECUTE PROCEDURE notify_filing_payment();
+    ''')
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS filings_payment_notify ON filings;')
+    op.execute('DROP FUNCTION IF EXISTS notify_filing_payment();')
@@ -0,0 +1,46 @@
+"""add_outbox_messages
+
+Revision ID: 8e1f3b6c2d47
+Revises: 5a7c4e2f9d31
+Create Date: 2024-08-12 09:41:07.512934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1f3b6c2d47'
+down_revision = '5a7c4e2f9d31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbox_messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('destination', sa.Enum('NATS', 'GCP', name='outbox_destination'), nullable=False),
+        sa.Column('subject', sa.VARCHAR(length=100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('transaction_id', sa.BigInteger(), nullable=True),
+        sa.Column('filing_id', sa.Integer(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_date', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('next_attempt_date', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('delivered_date', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['filing_id'], ['filings.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_messages_filing_id', 'outbox_messages', ['filing_id'], unique=False)
+    # the relay only ever looks at the undelivered messages
+    op.create_index('ix_outbox_messages_pending', 'outbox_messages', ['next_attempt_date', 'id'], unique=False,
+                    postgresql_where=sa.text('delivered_date IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_outbox_messages_pending', table_name='outbox_messages')
+    op.drop_index('ix_outbox_messages_filing_id', table_name='outbox_messages')
+    op.drop_table('outbox_messages')
+    op.execute("DROP TYPE outbox_destination;")
@@ -65,7 +65,13 @@ class _Config():  # pylint: disable=too-few-public-methods
     AUTH_SVC_URL = os.getenv('AUTH_SVC_URL', 'http://')
     REPORT_SVC_URL = os.getenv('REPORT_SVC_URL', 'http://')
     REPORT_TEMPLATE_PATH = os.getenv('REPORT_PATH', 'report-templates')
+    # report templates are assembled once, REPORT_TEMPLATE_AUTO_RELOAD reassembles the ones changed on disk
+    REPORT_TEMPLATE_AUTO_RELOAD = os.getenv('REPORT_TEMPLATE_AUTO_RELOAD', 'False').lower() == 'true'
+    # documents of a filing rendered at once for the documents bundle
+    DOCUMENT_BUNDLE_CONCURRENCY = int(os.getenv('DOCUMENT_BUNDLE_CONCURRENCY', '4'))
     FONTS_PATH = os.getenv('FONTS_PATH', 'fonts')
+    # registrar's stamps kept rendered, by their stamp data
+    PDF_STAMP_CACHE_SIZE = int(os.getenv('PDF_STAMP_CACHE_SIZE', '32'))
 
     GO_LIVE_DATE = os.getenv('GO_LIVE_DATE')
 
@@ -115,12 +121,30 @@ class _Config():  # pylint: disable=too-few-public-methods
     NATS_ENTITY_EVENT_SUBJECT = os.getenv('NATS_ENTITY_EVENT_SUBJECT', 'entity.events')
     NATS_EMAILER_SUBJECT = os.getenv('NATS_EMAILER_SUBJECT', 'entity.email')
     NATS_QUEUE = os.getenv('NATS_QUEUE', 'entity-filer-worker')
+    # publishes are made by a publisher thread, which batches up to NATS_PUBLISH_BATCH_SIZE waiting messages
+    try:
+        NATS_PUBLISH_TIMEOUT = int(os.getenv('NATS_PUBLISH_TIMEOUT', '10'))
+    except (TypeError, ValueError):
+        NATS_PUBLISH_TIMEOUT = 10
+    try:
+        NATS_PUBLISH_BATCH_SIZE = int(os.getenv('NATS_PUBLISH_BATCH_SIZE', '20'))
+    except (TypeError, ValueError):
+        NATS_PUBLISH_BATCH_SIZE = 20
 
     # NAMEX PROXY Settings
     NAMEX_AUTH_SVC_URL = os.getenv('NAMEX_AUTH_SVC_URL', 'http://')
     NAMEX_SERVICE_CLIENT_USERNAME = os.getenv('NAMEX_SERVICE_CLIENT_USERNAME')
     NAMEX_SERVICE_CLIENT_SECRET = os.getenv('NAMEX_SERVICE_CLIENT_SECRET')
     NAMEX_SVC_URL = os.getenv('NAMEX_SVC_URL', 'http://')
+    try:
+        NAMEX_SVC_TIMEOUT = int(os.getenv('NAMEX_SVC_TIMEOUT', '20'))
+    except (TypeError, ValueError):
+        NAMEX_SVC_TIMEOUT = 20
+    # how long an NR response is reused within a single request / unit of work
+    try:
+        NAMEX_NR_CACHE_TIMEOUT = int(os.getenv('NAMEX_NR_CACHE_TIMEOUT', '10'))
+    except (TypeError, ValueError):
+        NAMEX_NR_CACHE_TIMEOUT = 10
 
     # service accounts
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL')
@@ -137,6 +161,11 @@ class _Config():  # pylint: disable=too-few-public-methods
     MINIO_ACCESS_SECRET = os.getenv('MINIO_ACCESS_SECRET')
     MINIO_BUCKET_BUSINESSES = os.getenv('MINIO_BUCKET_BUSINESSES', 'businesses')
     MINIO_SECURE = True
+    MINIO_POOL_SIZE = int(os.getenv('MINIO_POOL_SIZE', '10'))
+    MINIO_STREAM_CHUNK_SIZE = int(os.getenv('MINIO_STREAM_CHUNK_SIZE', str(64 * 1024)))
+
+    # rendered pdfs of the completed filings, kept in the minio bucket
+    REPORT_CACHE_ENABLED = os.getenv('REPORT_CACHE_ENABLED', 'True').lower() == 'true'
 
     # determines which year of NAICS data will be used to drive NAICS search
     NAICS_YEAR = int(os.getenv('NAICS_YEAR', '2022'))
@@ -168,6 +197,16 @@ class _Config():  # pylint: disable=too-few-public-methods
     except (TypeError, ValueError):
         CACHE_DEFAULT_TIMEOUT = 300
 
+    # auth api, connection pool size and how long entity authorizations are cached (capped by the token expiry)
+    try:
+        AUTH_API_POOL_SIZE = int(os.getenv('AUTH_API_POOL_SIZE', '10'))
+    except (TypeError, ValueError):
+        AUTH_API_POOL_SIZE = 10
+    try:
+        AUTHORIZATIONS_CACHE_TIMEOUT = int(os.getenv('AUTHORIZATIONS_CACHE_TIMEOUT', '60'))
+    except (TypeError, ValueError):
+        AUTHORIZATIONS_CACHE_TIMEOUT = 60
+
     # MRAS
     MRAS_SVC_URL = os.getenv('MRAS_SVC_URL')
     MRAS_SVC_API_KEY = os.getenv('MRAS_SVC_API_KEY')
@@ -176,6 +215,12 @@ class _Config():  # pylint: disable=too-few-public-methods
     REPORT_API_GOTENBERG_AUDIENCE = os.getenv('REPORT_API_GOTENBERG_AUDIENCE', '')
     REPORT_API_GOTENBERG_URL = os.getenv('REPORT_API_GOTENBERG_URL', 'https://')
 
+    # filings ledger, default page size when paging with a cursor
+    try:
+        LEDGER_PAGE_SIZE = int(os.getenv('LEDGER_PAGE_SIZE', '50'))
+    except (TypeError, ValueError):
+        LEDGER_PAGE_SIZE = 50
+
     # involuntary dissolution
     STAGE_1_DELAY = int(os.getenv('STAGE_1_DELAY', '42'))
     STAGE_2_DELAY = int(os.getenv('STAGE_2_DELAY', '30'))
@@ -189,6 +234,7 @@ class DevConfig(_Config):  # pylint: disable=too-few-public-methods
 
     TESTING = False
     DEBUG = True
+    REPORT_TEMPLATE_AUTO_RELOAD = os.getenv('REPORT_TEMPLATE_AUTO_RELOAD', 'True').lower() == 'true'
 
 
 class TestConfig(_Config):  # pylint: disable=too-few-public-methods
@@ -213,6 +259,8 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
 
     # URLs
     AUTH_SVC_URL = os.getenv('AUTH_SVC_URL', 'http://test-auth-url')
+    # tests mock different auth api responses for the same token
+    AUTHORIZATIONS_CACHE_TIMEOUT = 0
 
     # JWT OIDC settings
     # JWT_OIDC_TEST_MODE will set jwt_manager to use
@@ -274,6 +322,9 @@ NrQw+2OdQACBJiEHsdZzAkBcsTk7frTH4yGx0VfHxXDPjfTj4wmD6gZIlcIr9lZg
     MINIO_ACCESS_SECRET = 'minio123'
     MINIO_BUCKET_BUSINESSES = 'businesses'
     MINIO_SECURE = False
+    REPORT_CACHE_ENABLED = False
+    # the test data is only visible to the session of the test, so render the bundle in the request thread
+    DOCUMENT_BUNDLE_CONCURRENCY = 1
 
     # determines which year of NAICS data will be used to drive NAICS search
     NAICS_YEAR = 2022
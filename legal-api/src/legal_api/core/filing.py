@@ -16,17 +16,19 @@
 from __future__ import annotations
 
 # from dataclasses import dataclass, field
+import base64
 import copy
 from contextlib import suppress
 from enum import Enum
-from typing import Dict, Final, List, Optional
+from typing import Dict, Final, List, Optional, Tuple
 
 from flask import current_app, url_for
 from flask_jwt_oidc import JwtManager
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select, tuple_
+from sqlalchemy.orm import joinedload
 
 from legal_api.core.meta import FilingMeta
-from legal_api.models import Business, Document, DocumentType
+from legal_api.models import Business, Comment, Document, DocumentType
 from legal_api.models import Filing as FilingStorage  # noqa: I001
 from legal_api.models import UserRoles
 from legal_api.services import VersionedBusinessDetailsService  # noqa: I005
@@ -350,38 +352,66 @@ class Filing:
         return False
 
     @staticmethod
-    def ledger(business_id: int,  # pylint: disable=too-many-arguments
+    def _ledger_query(business_id: int, statuses: List(str) = None, effective_date=None):
+        """Return the query of the filings that make up a business ledger."""
+        query = FilingStorage.query.filter(FilingStorage.business_id == business_id)
+
+        if effective_date:
+            query = query.filter(FilingStorage.effective_date <= effective_date)
+        if statuses and isinstance(statuses, List):
+            query = query.filter(FilingStorage._status.in_(statuses))  # pylint: disable=protected-access;required by SA
+
+        return query
+
+    @staticmethod
+    def ledger(business_id: int,  # pylint: disable=too-many-arguments,too-many-locals
                jwt: JwtManager = None,
                statuses: List(str) = None,
                start: int = None,
                size: int = None,
                effective_date=None,
+               keyset: Tuple[datetime, int] = None,
                **kwargs) \
             -> list:
         """Return the ledger list by directly querying the storage objects.
 
+        When a keyset of (filing_date, filing_id) is provided, only the filings that sort after it are returned,
+        which pages through the ledger in constant time instead of using the start offset.
+
         Note: Sort of breaks the "core" style, but searches are always interesting ducks.
         """
         base_url = current_app.config.get('LEGAL_API_BASE_URL')
 
         business = Business.find_by_internal_id(business_id)
 
-        query = FilingStorage.query.filter(FilingStorage.business_id == business_id)
+        # submitters, parent filings and comment counts are fetched with the filings,
+        # so the number of queries doesn't grow with the size of the ledger
+        comments_count = select([func.count(Comment.id)]). \
+            where(Comment.filing_id == FilingStorage.id). \
+            label('comments_count')
+        query = Filing._ledger_query(business_id, statuses, effective_date). \
+            with_entities(FilingStorage, comments_count). \
+            options(joinedload(FilingStorage.filing_submitter),
+                    joinedload(FilingStorage.parent_filing).joinedload(FilingStorage.parent_filing))
 
-        if effective_date:
-            query = query.filter(FilingStorage.effective_date <= effective_date)
-        if statuses and isinstance(statuses, List):
-            query = query.filter(FilingStorage._status.in_(statuses))  # pylint: disable=protected-access;required by SA
+        if keyset:
+            filing_date, filing_id = keyset
+            query = query.filter(tuple_(FilingStorage._filing_date,  # pylint: disable=protected-access
+                                        FilingStorage.id) < tuple_(filing_date, filing_id))
 
-        if start:
+        query = query.order_by(desc(FilingStorage.filing_date), desc(FilingStorage.id))
+
+        if start and not keyset:
             query = query.offset(start)
         if size:
             query = query.limit(size)
 
-        query = query.order_by(desc(FilingStorage.filing_date))
+        rows = query.all()
+        legal_types = VersionedBusinessDetailsService.get_business_revision_legal_types(
+            business_id, [filing.transaction_id for filing, _ in rows])
 
         ledger = []
-        for filing in query.all():
+        for filing, filing_comments_count in rows:
 
             submitter_displayname = REDACTED_STAFF_SUBMITTER
             if (submitter := filing.filing_submitter) \
@@ -392,7 +422,10 @@ class Filing:
             ledger_filing = {
                 'availableOnPaperOnly': filing.paper_only,
                 'businessIdentifier': business.identifier,
-                'displayName': FilingMeta.display_name(business, filing=filing),
+                'displayName': FilingMeta.display_name(business,
+                                                       filing=filing,
+                                                       legal_type=legal_types.get(filing.transaction_id,
+                                                                                  business.legal_type)),
                 'effectiveDate': filing.effective_date,
                 'filingId': filing.id,
                 'name': filing.filing_type,
@@ -401,7 +434,7 @@ class Filing:
                 'submitter': submitter_displayname,
                 'submittedDate': filing._filing_date,  # pylint: disable=protected-access
 
-                **Filing.common_ledger_items(business.identifier, filing),
+                **Filing.common_ledger_items(business.identifier, filing, filing_comments_count),
             }
             if filing.filing_sub_type:
                 ledger_filing['filingSubType'] = filing.filing_sub_type
@@ -425,7 +458,29 @@ class Filing:
         return ledger
 
     @staticmethod
-    def common_ledger_items(business_identifier: str, filing_storage: FilingStorage) -> dict:
+    def ledger_count(business_id: int, statuses: List(str) = None, effective_date=None) -> int:
+        """Return the number of filings in the ledger."""
+        return Filing._ledger_query(business_id, statuses, effective_date). \
+            with_entities(func.count(FilingStorage.id)). \
+            scalar()
+
+    @staticmethod
+    def encode_ledger_cursor(filing_date: datetime, filing_id: int) -> str:
+        """Return an opaque cursor for the ledger position of a filing."""
+        return base64.urlsafe_b64encode(f'{filing_date.isoformat()}|{filing_id}'.encode()).decode()
+
+    @staticmethod
+    def decode_ledger_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+        """Return the (filing_date, filing_id) keyset of a ledger cursor, or None if it isn't valid."""
+        with suppress(ValueError, TypeError):
+            filing_date, filing_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            return datetime.fromisoformat(filing_date), int(filing_id)
+        return None
+
+    @staticmethod
+    def common_ledger_items(business_identifier: str,
+                            filing_storage: FilingStorage,
+                            comments_count: int = None) -> dict:
         """Return attributes and links that also get included in T-business filings."""
         no_output_filing_types = ['Involuntary Dissolution', 'conversion']
         base_url = current_app.config.get('LEGAL_API_BASE_URL')
@@ -433,7 +488,7 @@ class Filing:
         filing._storage = filing_storage  # pylint: disable=protected-access
         return {
             'displayLedger': Filing._is_display_ledger(filing_storage),
-            'commentsCount': filing_storage.comments_count,
+            'commentsCount': filing_storage.comments_count if comments_count is None else comments_count,
             'commentsLink': f'{base_url}/{business_identifier}/filings/{filing_storage.id}/comments',
             'documentsLink': f'{base_url}/{business_identifier}/filings/{filing_storage.id}/documents' if
             filing_storage.filing_type not in no_output_filing_types else None,
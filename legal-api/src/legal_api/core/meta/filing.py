@@ -516,8 +516,12 @@ class FilingMeta:  # pylint: disable=too-few-public-methods
     """Create all the information about a filing."""
 
     @staticmethod
-    def display_name(business: Business, filing: FilingStorage) -> Optional[str]:
-        """Return the name of the filing to display on outputs."""
+    def display_name(business: Business, filing: FilingStorage, legal_type: str = None) -> Optional[str]:
+        """Return the name of the filing to display on outputs.
+
+        legal_type can be supplied when the as-of-filing legal type has already been looked up,
+        e.g. by the ledger, so the business version table isn't queried again.
+        """
         # if there is no lookup
         if not (names := FILINGS.get(filing.filing_type, {}).get('displayName')):
             if not (filing.filing_sub_type and
@@ -527,13 +531,15 @@ class FilingMeta:  # pylint: disable=too-few-public-methods
                                 re.sub(r'([A-Z])', r':\1', filing.filing_type).split(':'))
 
         business_revision = business
-        # retrieve business revision at time of filing so legal type is correct when returned for display name
-        if filing.transaction_id and \
-                (bus_rev_temp := VersionService.get_business_revision_obj(filing.transaction_id, business.id)):
-            business_revision = bus_rev_temp
+        if not legal_type:
+            # retrieve business revision at time of filing so legal type is correct when returned for display name
+            if filing.transaction_id and \
+                    (bus_rev_temp := VersionService.get_business_revision_obj(filing.transaction_id, business.id)):
+                business_revision = bus_rev_temp
+            legal_type = business_revision.legal_type
 
         if isinstance(names, MutableMapping):
-            name = names.get(business_revision.legal_type)
+            name = names.get(legal_type)
         else:
             name = names
 
@@ -20,7 +20,7 @@ from .amalgamating_business import AmalgamatingBusiness
 from .amalgamation import Amalgamation
 from .batch import Batch
 from .batch_processing import BatchProcessing
-from .business import Business  # noqa: I001
+from .business import Business, BusinessProjection  # noqa: I001
 from .colin_update import ColinLastUpdate
 from .comment import Comment
 from .configuration import Configuration
@@ -39,6 +39,7 @@ from .jurisdiction import Jurisdiction
 from .naics_element import NaicsElement
 from .naics_structure import NaicsStructure
 from .office import Office, OfficeType
+from .outbox_message import OutboxMessage
 from .party_role import Party, PartyRole
 from .registration_bootstrap import RegistrationBootstrap
 from .request_tracker import RequestTracker
@@ -60,6 +61,7 @@ __all__ = (
     'Batch',
     'BatchProcessing',
     'Business',
+    'BusinessProjection',
     'ColinLastUpdate',
     'Comment',
     'Configuration',
@@ -80,6 +82,7 @@ __all__ = (
     'NaicsStructure',
     'Office',
     'OfficeType',
+    'OutboxMessage',
     'Party',
     'PartyRole',
     'RegistrationBootstrap',
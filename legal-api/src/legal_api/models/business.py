@@ -21,11 +21,13 @@ from typing import Final, Optional
 
 import datedelta
 import pytz
+from dateutil.parser import isoparse
 from flask import current_app
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import OperationalError, ResourceClosedError
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import aliased, backref
-from sqlalchemy.sql import and_, exists, func, not_, text
+from sqlalchemy.sql import and_, exists, func, not_, select, text
 from sqlalchemy_continuum import version_class
 
 from legal_api.exceptions import BusinessException
@@ -299,30 +301,38 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
         Legal Name Easy Fix
         """
         if self.is_firm:
-            sort_name = func.trim(
-                func.coalesce(Party.organization_name, '') +
-                func.coalesce(Party.last_name + ' ', '') +
-                func.coalesce(Party.first_name + ' ', '') +
-                func.coalesce(Party.middle_initial, '')
-            )
-
             parties_query = self.party_roles.join(Party).filter(
                 func.lower(PartyRole.role).in_([
                     PartyRole.RoleTypes.PARTNER.value,
                     PartyRole.RoleTypes.PROPRIETOR.value
                 ]),
                 PartyRole.cessation_date.is_(None)
-            ).order_by(sort_name)
+            ).order_by(Business._party_sort_name())
 
             parties = [party_role.party for party_role in parties_query.all()]
 
-            legal_names = ', '.join(party.name for party in parties[:2])
-            if len(parties) > 2:
-                legal_names += ', et al'
-            return legal_names
+            return Business._firm_legal_name([party.name for party in parties])
 
         return self.legal_name
 
+    @staticmethod
+    def _party_sort_name():
+        """Return the expression firm parties are sorted by when composing the legal name."""
+        return func.trim(
+            func.coalesce(Party.organization_name, '') +
+            func.coalesce(Party.last_name + ' ', '') +
+            func.coalesce(Party.first_name + ' ', '') +
+            func.coalesce(Party.middle_initial, '')
+        )
+
+    @staticmethod
+    def _firm_legal_name(party_names: list) -> str:
+        """Return the legal name of a firm from the names of its partners/proprietor."""
+        legal_names = ', '.join(party_names[:2])
+        if len(party_names) > 2:
+            legal_names += ', et al'
+        return legal_names
+
     @property
     def next_anniversary(self):
         """Retrieve the next anniversary date for which an AR filing is due."""
@@ -394,6 +404,13 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
     @property
     def good_standing(self):
         """Return true if in good standing, otherwise false."""
+        return self._get_good_standing(self._has_no_transition_filed_after_restoration)
+
+    def _get_good_standing(self, has_no_transition_filed_after_restoration) -> bool:
+        """Return true if in good standing, otherwise false.
+
+        has_no_transition_filed_after_restoration is only called when the involuntary dissolution flag is on.
+        """
         from legal_api.services import flags  # pylint: disable=import-outside-toplevel
 
         # A firm is always in good standing
@@ -401,7 +418,7 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
             return True
         # When involuntary dissolution feature flag is on, check transition filing
         if flags.is_on('enable_involuntary_dissolution'):
-            if self._has_no_transition_filed_after_restoration():
+            if has_no_transition_filed_after_restoration():
                 return False
         # Date of last AR or founding date if they haven't yet filed one
         last_ar_date = self.last_ar_date or self.founding_date
@@ -420,6 +437,16 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
 
         Check whether the business needs to file Transition but does not file it within 12 months after restoration.
         """
+        condition = Business._no_transition_filed_after_restoration_condition(self)
+        return db.session.query(condition).scalar()
+
+    @staticmethod
+    def _no_transition_filed_after_restoration_condition(business):
+        """Return the EXISTS condition of the no transition filed after restoration check.
+
+        business is either a Business instance, or the Business class for a condition correlated to the businesses
+        of an enclosing query.
+        """
         from legal_api.core.filing import Filing as CoreFiling  # pylint: disable=import-outside-toplevel
 
         new_act_date = func.date('2004-03-29 00:00:00+00:00')
@@ -427,11 +454,11 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
         transition_filing = aliased(Filing)
 
         restoration_filing_effective_cutoff = restoration_filing.effective_date + text("""INTERVAL '1 YEAR'""")
-        condition = exists().where(
+        return exists().where(
             and_(
-                self.legal_type != Business.LegalTypes.EXTRA_PRO_A.value,
-                self.founding_date < new_act_date,
-                restoration_filing.business_id == self.id,
+                business.legal_type != Business.LegalTypes.EXTRA_PRO_A.value,
+                business.founding_date < new_act_date,
+                restoration_filing.business_id == business.id,
                 restoration_filing._filing_type.in_([  # pylint: disable=protected-access
                     CoreFiling.FilingTypes.RESTORATION.value,
                     CoreFiling.FilingTypes.RESTORATIONAPPLICATION.value
@@ -441,7 +468,7 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
                 not_(
                     exists().where(
                         and_(
-                            transition_filing.business_id == self.id,
+                            transition_filing.business_id == business.id,
                             transition_filing._filing_type == \
                             CoreFiling.FilingTypes.TRANSITION.value,  # pylint: disable=protected-access
                             transition_filing._status == \
@@ -455,7 +482,6 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
                 )
             )
         )
-        return db.session.query(condition).scalar()
 
     @property
     def in_dissolution(self):
@@ -485,12 +511,13 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
             self.save()
         return self
 
-    def json(self, slim=False):
+    def json(self, slim=False, projection: 'BusinessProjection' = None):
         """Return the Business as a json object.
 
         None fields are not included.
+        When a BusinessProjection is provided, the derived fields are taken from it instead of being queried.
         """
-        slim_json = self._slim_json()
+        slim_json = self._slim_json(projection)
         if slim:
             return slim_json
 
@@ -520,20 +547,20 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
             'noDissolution': self.no_dissolution,
             'associationType': self.association_type,
             'allowedActions': self.allowable_actions,
-            'alternateNames': self.get_alternate_names()
+            'alternateNames': projection.alternate_names if projection else self.get_alternate_names()
         }
-        self._extend_json(d)
+        self._extend_json(d, projection)
 
         return d
 
-    def _slim_json(self):
+    def _slim_json(self, projection: 'BusinessProjection' = None):
         """Return a smaller/faster version of the business json."""
         d = {
             'adminFreeze': self.admin_freeze or False,
-            'goodStanding': self.good_standing,
+            'goodStanding': projection.good_standing if projection else self.good_standing,
             'identifier': self.identifier,
-            'inDissolution': self.in_dissolution,
-            'legalName': self.business_legal_name,
+            'inDissolution': projection.in_dissolution if projection else self.in_dissolution,
+            'legalName': projection.business_legal_name if projection else self.business_legal_name,
             'legalType': self.legal_type,
             'state': self.state.name if self.state else Business.State.ACTIVE.name
         }
@@ -543,7 +570,7 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
 
         return d
 
-    def _extend_json(self, d):
+    def _extend_json(self, d, projection: 'BusinessProjection' = None):
         """Include conditional fields to json."""
         base_url = current_app.config.get('LEGAL_API_BASE_URL')
 
@@ -558,7 +585,7 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
         if self.fiscal_year_end_date:
             d['fiscalYearEndDate'] = datetime.date(self.fiscal_year_end_date).isoformat()
         if self.state_filing_id:
-            if (amalgamated_into := self.get_amalgamated_into()):
+            if (amalgamated_into := self.get_amalgamated_into(projection)):
                 d['amalgamatedInto'] = amalgamated_into
             else:
                 d['stateFiling'] = f'{base_url}/{self.identifier}/filings/{self.state_filing_id}'
@@ -576,8 +603,12 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
             d['jurisdictionRegion'] = self.foreign_jurisdiction_region
             d['foreignLegalName'] = self.foreign_legal_name
 
-        d['hasCorrections'] = Filing.has_completed_filing(self.id, 'correction')
-        d['hasCourtOrders'] = Filing.has_completed_filing(self.id, 'courtOrder')
+        if projection:
+            d['hasCorrections'] = projection.has_corrections
+            d['hasCourtOrders'] = projection.has_court_orders
+        else:
+            d['hasCorrections'] = Filing.has_completed_filing(self.id, 'correction')
+            d['hasCourtOrders'] = Filing.has_completed_filing(self.id, 'courtOrder')
 
     @property
     def compliance_warnings(self):
@@ -702,11 +733,7 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
         )
 
         for alias, alias_type, effective_date in aliases_query:
-            alternate_names.append({
-                'name': alias,
-                'startDate': LegislationDatetime.format_as_legislation_date(effective_date),
-                'type': alias_type
-            })
+            alternate_names.append(Business._alias_alternate_name(alias, alias_type, effective_date))
 
         # Get SP DBA entries if not SP
         if self.legal_type != Business.LegalTypes.SOLE_PROP:
@@ -729,30 +756,42 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
             )
 
             for legal_type, identifier, legal_name, founding_date, start_date in proprietors_query:
-                alternate_names.append({
-                    'entityType': legal_type,
-                    'identifier': identifier,
-                    'name': legal_name,
-                    'registeredDate': founding_date.isoformat(),
-                    'startDate': LegislationDatetime.format_as_legislation_date(start_date) if start_date else None,
-                    'type': 'DBA'
-                })
+                alternate_names.append(
+                    Business._dba_alternate_name(legal_type, identifier, legal_name, founding_date, start_date))
 
         # For firms also get existing business record
         if self.is_firm:
-            alternate_names.append({
-                'entityType': self.legal_type,
-                'identifier': self.identifier,
-                'name': self.legal_name,
-                'registeredDate': self.founding_date.isoformat(),
-                'startDate':
-                    LegislationDatetime.format_as_legislation_date(self.start_date) if self.start_date else None,
-                'type': 'DBA'
-            })
+            alternate_names.append(Business._dba_alternate_name(
+                self.legal_type, self.identifier, self.legal_name, self.founding_date, self.start_date))
 
         return alternate_names
 
-    def get_amalgamated_into(self) -> dict:
+    @staticmethod
+    def _alias_alternate_name(alias: str, alias_type: str, effective_date: datetime) -> dict:
+        """Return the alternate name entry of a name translation."""
+        return {
+            'name': alias,
+            'startDate': LegislationDatetime.format_as_legislation_date(effective_date),
+            'type': alias_type
+        }
+
+    @staticmethod
+    def _dba_alternate_name(legal_type: str,  # pylint: disable=too-many-arguments
+                            identifier: str,
+                            legal_name: str,
+                            founding_date: datetime,
+                            start_date: datetime) -> dict:
+        """Return the alternate name entry of a firm."""
+        return {
+            'entityType': legal_type,
+            'identifier': identifier,
+            'name': legal_name,
+            'registeredDate': founding_date.isoformat(),
+            'startDate': LegislationDatetime.format_as_legislation_date(start_date) if start_date else None,
+            'type': 'DBA'
+        }
+
+    def get_amalgamated_into(self, projection: 'BusinessProjection' = None) -> dict:
         """Get amalgamated into if this business is part of an amalgamation.
 
         Return TED:
@@ -762,9 +801,14 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
             1. Not a TING (not part of an amalgamation)
             2. TED is Historical and TING is Active (through putBackOn filing)
         """
-        if (self.state == Business.State.HISTORICAL and
-            self.state_filing_id and
-            (state_filing := Filing.find_by_id(self.state_filing_id)) and
+        if not (self.state == Business.State.HISTORICAL and self.state_filing_id):
+            return None
+
+        if projection:
+            if projection.state_filing_is_amalgamation_application:
+                return Amalgamation.get_revision_json(projection.state_filing_transaction_id,
+                                                      projection.state_filing_business_id)
+        elif ((state_filing := Filing.find_by_id(self.state_filing_id)) and
                 state_filing.is_amalgamation_application):
             return Amalgamation.get_revision_json(state_filing.transaction_id, state_filing.business_id)
 
@@ -829,6 +873,194 @@ class Business(db.Model):  # pylint: disable=too-many-instance-attributes,disabl
         return True
 
 
+class BusinessProjection:  # pylint: disable=too-many-instance-attributes
+    """The derived fields of the business json, loaded in a single statement.
+
+    Business.json runs a query for each of good standing, in dissolution, the firm legal name, the alternate names,
+    the amalgamated into check and the corrections/court orders flags. The projection loads all of them with
+    correlated subqueries, for one business or for many businesses at once.
+    """
+
+    def __init__(self, business: Business, row):
+        """Create the projection of the business from its loaded row."""
+        self.business = business
+        self.no_transition_filed_after_restoration = bool(row.no_transition_filed_after_restoration)
+        self.in_dissolution = bool(row.in_dissolution)
+        self.has_corrections = bool(row.has_corrections)
+        self.has_court_orders = bool(row.has_court_orders)
+        self.state_filing_is_amalgamation_application = \
+            row.state_filing_type == Filing.FILINGS['amalgamationApplication'].get('name')
+        self.state_filing_transaction_id = row.state_filing_transaction_id
+        self.state_filing_business_id = row.state_filing_business_id
+        self._firm_parties = row.firm_parties or []
+        self._aliases = row.aliases or []
+        self._proprietors = row.proprietors or []
+
+    @property
+    def good_standing(self) -> bool:
+        """Return true if in good standing, otherwise false."""
+        return self.business._get_good_standing(  # pylint: disable=protected-access
+            lambda: self.no_transition_filed_after_restoration)
+
+    @property
+    def business_legal_name(self) -> str:
+        """Return the legal name, composed from the partners/proprietor for firms."""
+        if self.business.is_firm:
+            return Business._firm_legal_name([  # pylint: disable=protected-access
+                Party.full_name(party['partyType'],
+                                party['firstName'],
+                                party['middleInitial'],
+                                party['lastName'],
+                                party['organizationName'])
+                for party in self._firm_parties
+            ])
+        return self.business.legal_name
+
+    @property
+    def alternate_names(self) -> list:
+        """Return the alternate names, matching Business.get_alternate_names."""
+        # pylint: disable=protected-access
+        alternate_names = [
+            Business._alias_alternate_name(alias['alias'],
+                                           alias['type'],
+                                           BusinessProjection._as_datetime(alias['effectiveDate']))
+            for alias in self._aliases
+        ]
+
+        if self.business.legal_type != Business.LegalTypes.SOLE_PROP:
+            alternate_names.extend(
+                Business._dba_alternate_name(proprietor['legalType'],
+                                             proprietor['identifier'],
+                                             proprietor['legalName'],
+                                             BusinessProjection._as_datetime(proprietor['foundingDate']),
+                                             BusinessProjection._as_datetime(proprietor['startDate']))
+                for proprietor in self._proprietors
+            )
+
+        if self.business.is_firm:
+            alternate_names.append(Business._dba_alternate_name(self.business.legal_type,
+                                                                self.business.identifier,
+                                                                self.business.legal_name,
+                                                                self.business.founding_date,
+                                                                self.business.start_date))
+
+        return alternate_names
+
+    @staticmethod
+    def _as_datetime(value: Optional[str]) -> Optional[datetime]:
+        """Return the datetime of a timestamp serialized by json_agg."""
+        return isoparse(value) if value else None
+
+    @classmethod
+    def load(cls, business: Business) -> 'BusinessProjection':
+        """Return the projection of a business."""
+        return cls.load_many([business])[business.id]
+
+    @classmethod
+    def load_many(cls, businesses: list) -> dict:
+        """Return the projections of the businesses, keyed by the business id."""
+        if not businesses:
+            return {}
+
+        state_filing = aliased(Filing)
+        rows = db.session.query(
+            Business.id.label('business_id'),
+            *cls._derived_columns(),
+            state_filing._filing_type.label('state_filing_type'),  # pylint: disable=protected-access
+            state_filing.transaction_id.label('state_filing_transaction_id'),
+            state_filing.business_id.label('state_filing_business_id')
+        ).outerjoin(
+            state_filing, state_filing.id == Business.state_filing_id
+        ).filter(
+            Business.id.in_([business.id for business in businesses])
+        ).all()
+
+        rows_by_id = {row.business_id: row for row in rows}
+        return {business.id: cls(business, rows_by_id[business.id]) for business in businesses}
+
+    @staticmethod
+    def _derived_columns() -> list:
+        """Return the subqueries of the derived fields, correlated to the Business being selected."""
+        # pylint: disable=protected-access
+        def has_completed_filing(filing_type: str):
+            filing = aliased(Filing)
+            return exists().where(and_(filing.business_id == Business.id,
+                                       filing._filing_type == filing_type,
+                                       filing._status == Filing.Status.COMPLETED.value))
+
+        in_dissolution = exists().where(and_(
+            BatchProcessing.business_id == Business.id,
+            BatchProcessing.status.notin_([BatchProcessing.BatchProcessingStatus.COMPLETED,
+                                           BatchProcessing.BatchProcessingStatus.WITHDRAWN]),
+            Batch.id == BatchProcessing.batch_id,
+            Batch.status != Batch.BatchStatus.COMPLETED,
+            Batch.batch_type == Batch.BatchType.INVOLUNTARY_DISSOLUTION
+        ))
+
+        firm_parties = select([func.json_agg(aggregate_order_by(
+            func.json_build_object('partyType', Party.party_type,
+                                   'firstName', Party.first_name,
+                                   'middleInitial', Party.middle_initial,
+                                   'lastName', Party.last_name,
+                                   'organizationName', Party.organization_name),
+            Business._party_sort_name()
+        ))]).select_from(
+            PartyRole
+        ).join(
+            Party, Party.id == PartyRole.party_id
+        ).where(and_(
+            PartyRole.business_id == Business.id,
+            func.lower(PartyRole.role).in_([PartyRole.RoleTypes.PARTNER.value,
+                                            PartyRole.RoleTypes.PROPRIETOR.value]),
+            PartyRole.cessation_date.is_(None)
+        )).scalar_subquery()
+
+        alias_version = version_class(Alias)
+        alias_filing = aliased(Filing)
+        aliases = select([func.json_agg(
+            func.json_build_object('alias', alias_version.alias,
+                                   'type', alias_version.type,
+                                   'effectiveDate', alias_filing.effective_date)
+        )]).select_from(
+            alias_version
+        ).outerjoin(
+            alias_filing, alias_filing.transaction_id == alias_version.transaction_id
+        ).where(and_(
+            alias_version.id.in_(select([Alias.id]).where(Alias.business_id == Business.id)),
+            alias_version.end_transaction_id is None  # noqa: E711
+        )).scalar_subquery()
+
+        proprietor_business = aliased(Business)
+        proprietors = select([func.json_agg(
+            func.json_build_object('legalType', proprietor_business.legal_type,
+                                   'identifier', proprietor_business._identifier,
+                                   'legalName', proprietor_business.legal_name,
+                                   'foundingDate', proprietor_business.founding_date,
+                                   'startDate', proprietor_business.start_date)
+        )]).select_from(
+            proprietor_business
+        ).join(
+            PartyRole, PartyRole.business_id == proprietor_business.id
+        ).join(
+            Party, Party.id == PartyRole.party_id
+        ).where(and_(
+            Party.identifier == Business._identifier,
+            Party.party_type == Party.PartyTypes.ORGANIZATION.value,
+            PartyRole.role == PartyRole.RoleTypes.PROPRIETOR.value
+        )).scalar_subquery()
+
+        return [
+            Business._no_transition_filed_after_restoration_condition(Business).label(
+                'no_transition_filed_after_restoration'),
+            in_dissolution.label('in_dissolution'),
+            has_completed_filing('correction').label('has_corrections'),
+            has_completed_filing('courtOrder').label('has_court_orders'),
+            firm_parties.label('firm_parties'),
+            aliases.label('aliases'),
+            proprietors.label('proprietors'),
+        ]
+
+
 ASSOCIATION_TYPE_DESC: Final = {
     Business.AssociationTypes.CP_COOPERATIVE.value: 'Ordinary Cooperative',
     Business.AssociationTypes.CP_HOUSING_COOPERATIVE.value: 'Housing Cooperative',
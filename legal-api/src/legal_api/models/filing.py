@@ -932,6 +932,29 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
         filings = query.all()
         return filings
 
+    @staticmethod
+    def get_blocker_filings(business_id: int, filing_types: list, status: list, state_filing_id: int = None):
+        """Return the (id, business_id, filing_type, filing_sub_type, status, effective_date) rows for blocker checks.
+
+        The business's filings of the given types and statuses, and its state filing, are returned by one query.
+        The state filing may belong to another business (e.g. an amalgamation application).
+        """
+        # pylint: disable=W0212; prevent infinite loop
+        conditions = [and_(Filing.business_id == business_id,
+                           Filing._filing_type.in_(filing_types),
+                           Filing._status.in_(status)).self_group()]
+        if state_filing_id:
+            conditions.append(Filing.id == state_filing_id)
+
+        query = db.session.query(Filing.id,
+                                 Filing.business_id,
+                                 Filing._filing_type,
+                                 Filing._filing_sub_type,
+                                 Filing._status,
+                                 Filing.effective_date). \
+            filter(or_(*conditions))
+        return query.all()
+
     @staticmethod
     def get_a_businesses_most_recent_filing_of_a_type(business_id: int, filing_type: str, filing_sub_type: str = None):
         """Return the filings of a particular type."""
@@ -1008,6 +1031,21 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
             filter(Filing._status == status).all()  # pylint: disable=singleton-comparison # noqa: E711;
         return filings
 
+    @staticmethod
+    def get_due_future_effective_filing_ids(limit: int, after_id: int = 0) -> List[int]:
+        """Return the ids of the PAID filings whose effective date has been reached, in id order.
+
+        The ids are returned a page at a time, the page starting after after_id. The filter matches the
+        ix_filings_paid_effective_date partial index, so only the PAID filings are looked at.
+        """
+        query = db.session.query(Filing.id). \
+            filter(Filing._status == Filing.Status.PAID.value). \
+            filter(Filing.effective_date <= func.now()). \
+            filter(Filing.id > after_id). \
+            order_by(Filing.id). \
+            limit(limit)
+        return [filing_id for (filing_id,) in query.all()]
+
     @staticmethod
     def get_previous_completed_filing(filing):
         """Return the previous completed filing."""
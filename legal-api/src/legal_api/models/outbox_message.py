@@ -0,0 +1,166 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This module holds the messages waiting to be relayed to the queues (transactional outbox).
+
+A message is written in the same transaction as the change it announces, so it is published if and only if
+the change is committed. A relay then publishes the pending messages and marks them delivered.
+
+The messages of a business (or of a filing without one) are published in the order they were written: a message
+is not claimed while an earlier message of its business is held, leased or backing off.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from enum import auto
+from typing import List
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import aliased
+
+from legal_api.utils.base import BaseEnum
+from legal_api.utils.datetime import datetime
+
+from .db import db
+from .filing import Filing
+
+
+class OutboxMessage(db.Model):  # pylint: disable=too-many-instance-attributes
+    """This class manages the messages waiting to be published."""
+
+    class Destination(BaseEnum):
+        """Render an Enum of the queue the message is published to."""
+
+        NATS = auto()
+        GCP = auto()
+
+    __tablename__ = 'outbox_messages'
+
+    id = db.Column(db.Integer, primary_key=True)
+    destination = db.Column('destination', db.Enum(Destination, name='outbox_destination'), nullable=False)
+    subject = db.Column('subject', db.String(100), nullable=False)
+    payload = db.Column('payload', JSONB, nullable=False)
+    transaction_id = db.Column('transaction_id', db.BigInteger)
+    attempts = db.Column('attempts', db.Integer, default=0, nullable=False)
+    last_error = db.Column('last_error', db.Text)
+    created_date = db.Column('created_date', db.DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    next_attempt_date = db.Column('next_attempt_date', db.DateTime(timezone=True), default=datetime.utcnow,
+                                  nullable=False)
+    delivered_date = db.Column('delivered_date', db.DateTime(timezone=True))
+
+    # parent keys
+    filing_id = db.Column('filing_id', db.Integer, db.ForeignKey('filings.id'), index=True)
+
+    @property
+    def json(self) -> dict:
+        """Return the outbox message as a json object."""
+        return {
+            'id': self.id,
+            'destination': self.destination.name,
+            'subject': self.subject,
+            'payload': self.payload,
+            'transactionId': self.transaction_id,
+            'filingId': self.filing_id,
+            'attempts': self.attempts
+        }
+
+    def save(self):
+        """Save the object to the database immediately."""
+        db.session.add(self)
+        db.session.commit()
+
+    @classmethod
+    def claim_pending(cls, limit: int, lease: int) -> List[dict]:
+        """Claim up to limit messages due for publishing, for lease seconds, in order, with their business id.
+
+        Claimed messages are pushed back by the lease, so other relays skip them while they are being published
+        and they come up again if this relay goes away before marking them.
+        A message waiting on an earlier message of the same business or filing that is not due is left pending.
+        """
+        now = datetime.utcnow()
+        earlier = aliased(OutboxMessage)
+        earlier_filing = aliased(Filing)
+        waiting = db.session.query(earlier.id). \
+            outerjoin(earlier_filing, earlier.filing_id == earlier_filing.id). \
+            filter(earlier.delivered_date.is_(None)). \
+            filter(earlier.next_attempt_date > now). \
+            filter(earlier.id < OutboxMessage.id). \
+            filter(or_(earlier.filing_id == OutboxMessage.filing_id,
+                       earlier_filing.business_id == Filing.business_id)). \
+            exists()
+        rows = db.session.query(OutboxMessage, Filing.business_id). \
+            outerjoin(Filing, OutboxMessage.filing_id == Filing.id). \
+            filter(OutboxMessage.delivered_date.is_(None)). \
+            filter(OutboxMessage.next_attempt_date <= now). \
+            filter(~waiting). \
+            order_by(OutboxMessage.id). \
+            limit(limit). \
+            with_for_update(of=OutboxMessage, skip_locked=True). \
+            all()
+        claimed = [{**message.json, 'businessId': business_id} for message, business_id in rows]
+        for message, _ in rows:
+            message.next_attempt_date = now + timedelta(seconds=lease)
+        db.session.commit()
+        return claimed
+
+    @classmethod
+    def release(cls, filing_id: int):
+        """Make the pending messages of the filing due for publishing now."""
+        db.session.query(OutboxMessage). \
+            filter(OutboxMessage.filing_id == filing_id). \
+            filter(OutboxMessage.delivered_date.is_(None)). \
+            update({OutboxMessage.next_attempt_date: datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def release_messages(cls, message_ids: List[int]):
+        """Make the claimed messages due again, for the messages a relay did not get to publish."""
+        if message_ids:
+            db.session.query(OutboxMessage). \
+                filter(OutboxMessage.id.in_(message_ids)). \
+                update({OutboxMessage.next_attempt_date: datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+
+    @classmethod
+    def mark_delivered(cls, message_ids: List[int]):
+        """Mark the messages as delivered."""
+        if message_ids:
+            db.session.query(OutboxMessage). \
+                filter(OutboxMessage.id.in_(message_ids)). \
+                update({OutboxMessage.delivered_date: datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+
+    @classmethod
+    def mark_failed(cls, message_id: int, error: str, retry_in: int):
+        """Record the failed attempt and put the message off for retry_in seconds."""
+        db.session.query(OutboxMessage). \
+            filter(OutboxMessage.id == message_id). \
+            update({OutboxMessage.attempts: OutboxMessage.attempts + 1,
+                    OutboxMessage.last_error: error,
+                    OutboxMessage.next_attempt_date: datetime.utcnow() + timedelta(seconds=retry_in)},
+                   synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def delete_delivered(cls, before: datetime, limit: int) -> int:
+        """Delete up to limit messages delivered before the given date, returning the number deleted."""
+        message_ids = [message_id for message_id, in db.session.query(OutboxMessage.id).
+                       filter(OutboxMessage.delivered_date < before).
+                       limit(limit)]
+        if message_ids:
+            db.session.query(OutboxMessage). \
+                filter(OutboxMessage.id.in_(message_ids)). \
+                delete(synchronize_session=False)
+            db.session.commit()
+        return len(message_ids)
@@ -111,11 +111,24 @@ class Party(db.Model):  # pylint: disable=too-many-instance-attributes
     @property
     def name(self) -> str:
         """Return the full name of the party for comparison."""
-        if self.party_type == Party.PartyTypes.PERSON.value:
-            if self.middle_initial:
-                return ' '.join((self.first_name, self.middle_initial, self.last_name)).strip().upper()
-            return ' '.join((self.first_name, self.last_name)).strip().upper()
-        return self.organization_name.strip().upper()
+        return Party.full_name(self.party_type,
+                               self.first_name,
+                               self.middle_initial,
+                               self.last_name,
+                               self.organization_name)
+
+    @staticmethod
+    def full_name(party_type: str,  # pylint: disable=too-many-arguments
+                  first_name: str,
+                  middle_initial: str,
+                  last_name: str,
+                  organization_name: str) -> str:
+        """Return the full name of a party from its name columns."""
+        if party_type == Party.PartyTypes.PERSON.value:
+            if middle_initial:
+                return ' '.join((first_name, middle_initial, last_name)).strip().upper()
+            return ' '.join((first_name, last_name)).strip().upper()
+        return organization_name.strip().upper()
 
     @property
     def valid_party_type_data(self) -> bool:
@@ -9,12 +9,10 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 """Produces a PDF output based on templates and JSON messages."""
-import base64
 import json
 import os
 from datetime import datetime
 from http import HTTPStatus
-from pathlib import Path
 from typing import Final, Optional
 
 import pycountry
@@ -23,6 +21,7 @@ from flask import current_app, jsonify
 
 from legal_api.models import Alias, AmalgamatingBusiness, Amalgamation, Business, CorpType, Filing, Jurisdiction
 from legal_api.reports.registrar_meta import RegistrarInfo
+from legal_api.reports.template_registry import ReportTemplate, substitute_template_parts, template_registry
 from legal_api.resources.v2.business import get_addresses, get_directors
 from legal_api.resources.v2.business.business_parties import get_parties
 from legal_api.services import VersionedBusinessDetailsService
@@ -31,6 +30,33 @@ from legal_api.utils.legislation_datetime import LegislationDatetime
 
 
 OUTPUT_DATE_FORMAT: Final = '%B %-d, %Y'
+TEMPLATE_PARTS: Final = [
+    'business-summary/alterations',
+    'business-summary/amalgamations',
+    'business-summary/businessDetails',
+    'business-summary/foreignJurisdiction',
+    'business-summary/liquidation',
+    'business-summary/nameChanges',
+    'business-summary/stateTransition',
+    'business-summary/recordKeeper',
+    'business-summary/parties',
+    'common/addresses',
+    'common/businessDetails',
+    'common/footerMOCS',
+    'common/nameTranslation',
+    'common/style',
+    'common/styleLetterOverride',
+    'common/certificateFooter',
+    'common/certificateLogo',
+    'common/certificateRegistrarSignature',
+    'common/certificateSeal',
+    'common/certificateStyle',
+    'common/courtOrder',
+    'footer',
+    'logo',
+    'macros',
+    'notice-of-articles/directors'
+]
 
 
 class BusinessDocument:
@@ -51,7 +77,7 @@ class BusinessDocument:
         }
         data = {
             'reportName': self._get_report_filename(),
-            'template': "'" + base64.b64encode(bytes(self._get_template(), 'utf-8')).decode() + "'",
+            'template': "'" + self._get_report_template().encoded + "'",
             'templateVars': self._get_template_data()
         }
         response = requests.post(url=current_app.config.get('REPORT_SVC_URL'), headers=headers, data=json.dumps(data))
@@ -69,52 +95,20 @@ class BusinessDocument:
                                      ReportMeta.reports[self._document_key]['reportName']).replace(' ', '_')
 
     def _get_template(self):
+        return self._get_report_template().code
+
+    def _get_report_template(self) -> ReportTemplate:
         try:
-            template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
             template_file_name = ReportMeta.reports[self._document_key]['templateName']
-            template_code = Path(f'{template_path}/{template_file_name}.html').read_text()
-            # substitute template parts
-            template_code = self._substitute_template_parts(template_code)
+            return template_registry.get(f'{template_file_name}.html', TEMPLATE_PARTS)
         except Exception as err:
             current_app.logger.error(err)
             raise err
-        return template_code
 
     @staticmethod
     def _substitute_template_parts(template_code):
-        template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
-        template_parts = [
-            'business-summary/alterations',
-            'business-summary/amalgamations',
-            'business-summary/businessDetails',
-            'business-summary/foreignJurisdiction',
-            'business-summary/liquidation',
-            'business-summary/nameChanges',
-            'business-summary/stateTransition',
-            'business-summary/recordKeeper',
-            'business-summary/parties',
-            'common/addresses',
-            'common/businessDetails',
-            'common/footerMOCS',
-            'common/nameTranslation',
-            'common/style',
-            'common/styleLetterOverride',
-            'common/certificateFooter',
-            'common/certificateLogo',
-            'common/certificateRegistrarSignature',
-            'common/certificateSeal',
-            'common/certificateStyle',
-            'common/courtOrder',
-            'footer',
-            'logo',
-            'macros',
-            'notice-of-articles/directors'
-        ]
-        # substitute template parts - marked up by [[filename]]
-        for template_part in template_parts:
-            template_part_code = Path(f'{template_path}/template-parts/{template_part}.html').read_text()
-            template_code = template_code.replace('[[{}.html]]'.format(template_part), template_part_code)
-        return template_code
+        return substitute_template_parts(template_code, TEMPLATE_PARTS,
+                                         lambda part: template_registry.get_file(f'template-parts/{part}.html'))
 
     def _get_template_data(self, get_json=False):
         """Return the json for the report template."""
@@ -9,14 +9,12 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 """Produces a PDF output based on templates and JSON messages."""
-import base64
 import copy
 import json
 import os
 from contextlib import suppress
 from datetime import datetime
 from http import HTTPStatus
-from pathlib import Path
 from typing import Final
 
 import pycountry
@@ -38,6 +36,8 @@ from legal_api.models import (
 )
 from legal_api.models.business import ASSOCIATION_TYPE_DESC
 from legal_api.reports.registrar_meta import RegistrarInfo
+from legal_api.reports.report_cache import ReportCache
+from legal_api.reports.template_registry import ReportTemplate, substitute_template_parts, template_registry
 from legal_api.services import MinioService, VersionedBusinessDetailsService
 from legal_api.utils.auth import jwt
 from legal_api.utils.formatting import float_to_str
@@ -45,6 +45,92 @@ from legal_api.utils.legislation_datetime import LegislationDatetime
 
 
 OUTPUT_DATE_FORMAT: Final = '%B %-d, %Y'
+# template parts, substituted in the order listed
+TEMPLATE_PARTS: Final = [
+    'amalgamation/amalgamatingCorp',
+    'amalgamation/amalgamationName',
+    'amalgamation/amalgamationStmt',
+    'amalgamation/approvalType',
+    'amalgamation/effectiveDate',
+    'bc-annual-report/legalObligations',
+    'bc-address-change/addresses',
+    'bc-director-change/directors',
+    'common/certificateFooter',
+    'common/certificateLogo',
+    'common/certificateRegistrarSignature',
+    'common/certificateSeal',
+    'common/certificateStyle',
+    'common/addresses',
+    'common/shareStructure',
+    'common/correctedOnCertificate',
+    'common/style',
+    'common/styleLetterOverride',
+    'common/businessDetails',
+    'common/footerMOCS',
+    'common/directors',
+    'continuation/authorization',
+    'continuation/effectiveDate',
+    'continuation/exproRegistrationInBc',
+    'continuation/foreignJurisdiction',
+    'common/completingParty',
+    'correction/businessDetails',
+    'correction/addresses',
+    'correction/associateType',
+    'correction/directors',
+    'correction/legalNameChange',
+    'correction/resolution',
+    'correction/rulesMemorandum',
+    'change-of-registration/legal-name',
+    'change-of-registration/nature-of-business',
+    'change-of-registration/addresses',
+    'change-of-registration/proprietor',
+    'change-of-registration/completingParty',
+    'change-of-registration/partner',
+    'incorporation-application/benefitCompanyStmt',
+    'incorporation-application/completingParty',
+    'incorporation-application/effectiveDate',
+    'incorporation-application/incorporator',
+    'incorporation-application/nameRequest',
+    'incorporation-application/cooperativeAssociationType',
+    'restoration-application/nameRequest',
+    'restoration-application/legalName',
+    'restoration-application/legalNameDissolution',
+    'restoration-application/approvalType',
+    'restoration-application/applicant',
+    'restoration-application/expiry',
+    'registration/nameRequest',
+    'registration/addresses',
+    'registration/completingParty',
+    'registration/party',
+    'registration-statement/party',
+    'registration-statement/business-info',
+    'registration-statement/completingParty',
+    'common/statement',
+    'common/benefitCompanyStmt',
+    'dissolution/custodianOfRecords',
+    'dissolution/dissolutionStatement',
+    'dissolution/firmsDissolutionDate',
+    'notice-of-articles/directors',
+    'notice-of-articles/restrictions',
+    'common/resolutionDates',
+    'alteration-notice/businessTypeChange',
+    'alteration-notice/legalNameChange',
+    'alteration-notice/statement',
+    'common/effectiveDate',
+    'common/nameTranslation',
+    'alteration-notice/companyProvisions',
+    'special-resolution/resolution',
+    'special-resolution/resolutionApplication',
+    'addresses',
+    'certification',
+    'directors',
+    'dissolution',
+    'footer',
+    'legalNameChange',
+    'logo',
+    'macros',
+    'style'
+]
 
 
 class Report:  # pylint: disable=too-few-public-methods, too-many-lines
@@ -68,12 +154,7 @@ class Report:  # pylint: disable=too-few-public-methods, too-many-lines
     def _get_static_report(self):
         document_type = ReportMeta.static_reports[self._report_key]['documentType']
         document: Document = self._filing.documents.filter(Document.type == document_type).first()
-        response = MinioService.get_file(document.file_key)
-        return current_app.response_class(
-            response=response.data,
-            status=response.status,
-            mimetype='application/pdf'
-        )
+        return MinioService.get_file_response(document.file_key)
 
     def _get_report(self):
         if self._filing.business_id:
@@ -81,13 +162,26 @@ class Report:  # pylint: disable=too-few-public-methods, too-many-lines
             Report._populate_business_info_to_filing(self._filing, self._business)
         if self._report_key == 'alteration':
             self._report_key = 'alterationNotice'
+        template = self._get_report_template()
+
+        cache_key = None
+        if ReportCache.is_cacheable(self._filing, template.code):
+            cache_key = ReportCache.get_key(self._filing, self._report_key, template.digest, self._business)
+            if (pdf := ReportCache.get(cache_key)) is not None:
+                return current_app.response_class(
+                    response=pdf,
+                    status=HTTPStatus.OK,
+                    mimetype='application/pdf',
+                    headers={ReportCache.HEADER: 'HIT'}
+                )
+
         headers = {
             'Authorization': 'Bearer {}'.format(jwt.get_token_auth_header()),
             'Content-Type': 'application/json'
         }
         data = {
             'reportName': self._get_report_filename(),
-            'template': "'" + base64.b64encode(bytes(self._get_template(), 'utf-8')).decode() + "'",
+            'template': "'" + template.encoded + "'",
             'templateVars': self._get_template_data()
         }
         response = requests.post(url=current_app.config.get('REPORT_SVC_URL'), headers=headers, data=json.dumps(data))
@@ -95,10 +189,14 @@ class Report:  # pylint: disable=too-few-public-methods, too-many-lines
         if response.status_code != HTTPStatus.OK:
             return jsonify(message=str(response.content)), response.status_code
 
+        if cache_key:
+            ReportCache.put(cache_key, response.content)
+
         return current_app.response_class(
             response=response.content,
             status=response.status_code,
-            mimetype='application/pdf'
+            mimetype='application/pdf',
+            headers={ReportCache.HEADER: 'MISS'} if cache_key else None
         )
 
     def _get_report_filename(self):
@@ -109,15 +207,14 @@ class Report:  # pylint: disable=too-few-public-methods, too-many-lines
         return '{}_{}_{}.pdf'.format(legal_entity_number, filing_date, description).replace(' ', '_')
 
     def _get_template(self):
+        return self._get_report_template().code
+
+    def _get_report_template(self) -> ReportTemplate:
         try:
-            template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
-            template_code = Path(f'{template_path}/{self._get_template_filename()}').read_text()
-            # substitute template parts
-            template_code = self._substitute_template_parts(template_code)
+            return template_registry.get(self._get_template_filename(), TEMPLATE_PARTS)
         except Exception as err:
             current_app.logger.error(err)
             raise err
-        return template_code
 
     @staticmethod
     def _substitute_template_parts(template_code):
@@ -133,99 +230,8 @@ class Report:  # pylint: disable=too-few-public-methods, too-many-lines
         :param template_code: string
         :return: template_code string, modified.
         """
-        template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
-        template_parts = [
-            'amalgamation/amalgamatingCorp',
-            'amalgamation/amalgamationName',
-            'amalgamation/amalgamationStmt',
-            'amalgamation/approvalType',
-            'amalgamation/effectiveDate',
-            'bc-annual-report/legalObligations',
-            'bc-address-change/addresses',
-            'bc-director-change/directors',
-            'common/certificateFooter',
-            'common/certificateLogo',
-            'common/certificateRegistrarSignature',
-            'common/certificateSeal',
-            'common/certificateStyle',
-            'common/addresses',
-            'common/shareStructure',
-            'common/correctedOnCertificate',
-            'common/style',
-            'common/styleLetterOverride',
-            'common/businessDetails',
-            'common/footerMOCS',
-            'common/directors',
-            'continuation/authorization',
-            'continuation/effectiveDate',
-            'continuation/exproRegistrationInBc',
-            'continuation/foreignJurisdiction',
-            'common/completingParty',
-            'correction/businessDetails',
-            'correction/addresses',
-            'correction/associateType',
-            'correction/directors',
-            'correction/legalNameChange',
-            'correction/resolution',
-            'correction/rulesMemorandum',
-            'change-of-registration/legal-name',
-            'change-of-registration/nature-of-business',
-            'change-of-registration/addresses',
-            'change-of-registration/proprietor',
-            'change-of-registration/completingParty',
-            'change-of-registration/partner',
-            'incorporation-application/benefitCompanyStmt',
-            'incorporation-application/completingParty',
-            'incorporation-application/effectiveDate',
-            'incorporation-application/incorporator',
-            'incorporation-application/nameRequest',
-            'incorporation-application/cooperativeAssociationType',
-            'restoration-application/nameRequest',
-            'restoration-application/legalName',
-            'restoration-application/legalNameDissolution',
-            'restoration-application/approvalType',
-            'restoration-application/applicant',
-            'restoration-application/expiry',
-            'registration/nameRequest',
-            'registration/addresses',
-            'registration/completingParty',
-            'registration/party',
-            'registration-statement/party',
-            'registration-statement/business-info',
-            'registration-statement/completingParty',
-            'common/statement',
-            'common/benefitCompanyStmt',
-            'dissolution/custodianOfRecords',
-            'dissolution/dissolutionStatement',
-            'dissolution/firmsDissolutionDate',
-            'notice-of-articles/directors',
-            'notice-of-articles/restrictions',
-            'common/resolutionDates',
-            'alteration-notice/businessTypeChange',
-            'alteration-notice/legalNameChange',
-            'alteration-notice/statement',
-            'common/effectiveDate',
-            'common/nameTranslation',
-            'alteration-notice/companyProvisions',
-            'special-resolution/resolution',
-            'special-resolution/resolutionApplication',
-            'addresses',
-            'certification',
-            'directors',
-            'dissolution',
-            'footer',
-            'legalNameChange',
-            'logo',
-            'macros',
-            'style'
-        ]
-
-        # substitute template parts - marked up by [[filename]]
-        for template_part in template_parts:
-            template_part_code = Path(f'{template_path}/template-parts/{template_part}.html').read_text()
-            template_code = template_code.replace('[[{}.html]]'.format(template_part), template_part_code)
-
-        return template_code
+        return substitute_template_parts(template_code, TEMPLATE_PARTS,
+                                         lambda part: template_registry.get_file(f'template-parts/{part}.html'))
 
     def _get_template_filename(self):
         if ReportMeta.reports[self._report_key].get('hasDifferentTemplates', False):
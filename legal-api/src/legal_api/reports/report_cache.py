@@ -0,0 +1,84 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Cache of the pdfs rendered for the completed filings.
+
+The output of a completed filing only changes when its template changes, or something the report reads from
+outside the filing changes: a correction of the filing or the tax id of the business. The pdfs are kept in minio,
+keyed by the filing id, the report type and a hash of all of those, so a changed template or a correction reads
+as a miss and the old pdf is replaced when the new one is stored.
+
+Reports printing the date they were retrieved are never cached.
+"""
+import hashlib
+import io
+from typing import Optional
+
+from flask import current_app
+
+from legal_api.models import Business, Filing
+from legal_api.services import MinioService
+
+
+class ReportCache:
+    """Keep the rendered pdfs of the completed filings in the document store."""
+
+    PREFIX = 'reports'
+    HEADER = 'X-Report-Cache'
+
+    @staticmethod
+    def is_cacheable(filing: Filing, template_code: str) -> bool:
+        """Return if the report of the filing rendered from template_code can be cached."""
+        return bool(current_app.config.get('REPORT_CACHE_ENABLED')) and \
+            filing.status == Filing.Status.COMPLETED.value and \
+            'report_date' not in template_code
+
+    @staticmethod
+    def get_key(filing: Filing, report_type: str, template_digest: str, business: Optional[Business]) -> str:
+        """Return the key of the report, which changes with the template and any correction of the filing."""
+        digest = hashlib.sha256()
+        for value in (template_digest,
+                      filing.transaction_id,
+                      filing.parent_filing_id,
+                      filing.parent_filing.status if filing.parent_filing else None,
+                      business.tax_id if business else None):
+            digest.update(str(value).encode('utf-8'))
+            digest.update(b'\0')
+        return f'{ReportCache._get_prefix(filing, report_type)}{digest.hexdigest()}.pdf'
+
+    @staticmethod
+    def get(key: str) -> Optional[bytes]:
+        """Return the cached pdf, or None if it isn't cached."""
+        response = None
+        try:
+            response = MinioService.get_file(key)
+            return response.data
+        except Exception:  # pylint: disable=broad-except; a miss or an unavailable store both mean render it
+            return None
+        finally:
+            if response:
+                response.close()
+                response.release_conn()
+
+    @staticmethod
+    def put(key: str, pdf: bytes):
+        """Cache the pdf, removing the earlier versions of the report."""
+        try:
+            MinioService.put_file(key, io.BytesIO(pdf), len(pdf))
+            prefix = key[:key.rindex('/') + 1]
+            for stale_key in MinioService.list_files(prefix):
+                if stale_key != key:
+                    MinioService.delete_file(stale_key)
+        except Exception as err:  # pylint: disable=broad-except; the pdf is still returned
+            current_app.logger.warning(f'Failed to cache report {key}: {err}')
+
+    @staticmethod
+    def _get_prefix(filing: Filing, report_type: str) -> str:
+        return f'{ReportCache.PREFIX}/{filing.id}/{report_type}/'
@@ -13,17 +13,16 @@ import copy
 import re
 from enum import auto
 from http import HTTPStatus
-from pathlib import Path
 from typing import Final
 
 import google.auth.transport.requests
 import google.oauth2.id_token
 import requests
 from flask import current_app, jsonify
-from jinja2 import Template
 
 from legal_api.models import Address
 from legal_api.reports.registrar_meta import RegistrarInfo
+from legal_api.reports.template_registry import ReportTemplate, substitute_template_parts, template_registry
 from legal_api.services import MrasService
 from legal_api.utils.base import BaseEnum
 from legal_api.utils.legislation_datetime import LegislationDatetime
@@ -37,6 +36,11 @@ HEADER_MAIL_PATH: Final = '/template-parts/common/v2/headerMail.html'
 FOOTER_PATH: Final = '/template-parts/common/v2/footer.html'
 FOOTER_MAIL_PATH: Final = '/template-parts/common/v2/footerMail.html'
 HEADER_TITLE_REPLACE: Final = '{{TITLE}}'
+TEMPLATE_PARTS: Final = [
+    'common/v2/style',
+    'common/v2/styleMail',
+    'common/certificateRegistrarSignature'
+]
 REPORT_META_DATA = {
     'marginTop': 1.93,
     'marginLeft': 0.4,
@@ -72,7 +76,7 @@ class ReportV2:
         url = current_app.config.get('REPORT_API_GOTENBERG_URL') + SINGLE_URI
         data = {
             'reportName': self._get_report_filename(),
-            'template': self._get_template(),
+            'template': self._get_report_template(),
             'templateVars': self._get_template_data()
         }
         files = self._get_report_files(data)
@@ -94,31 +98,20 @@ class ReportV2:
                                      ReportMeta.reports[self._document_key]['reportName']).replace(' ', '_')
 
     def _get_template(self):
+        return self._get_report_template().code
+
+    def _get_report_template(self) -> ReportTemplate:
         try:
-            template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
             template_file_name = ReportMeta.reports[self._document_key]['templateName']
-            template_code = Path(f'{template_path}/{template_file_name}.html').read_text(encoding='UTF-8')
-            # substitute template parts
-            template_code = self._substitute_template_parts(template_code)
+            return template_registry.get(f'{template_file_name}.html', TEMPLATE_PARTS)
         except Exception as err:
             current_app.logger.error(err)
             raise err
-        return template_code
 
     @staticmethod
     def _substitute_template_parts(template_code):
-        template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
-        template_parts = [
-            'common/v2/style',
-            'common/v2/styleMail',
-            'common/certificateRegistrarSignature'
-        ]
-        # substitute template parts - marked up by [[filename]]
-        for template_part in template_parts:
-            template_part_code = Path(f'{template_path}/template-parts/{template_part}.html')\
-                .read_text(encoding='UTF-8')
-            template_code = template_code.replace('[[{}.html]]'.format(template_part), template_part_code)
-        return template_code
+        return substitute_template_parts(template_code, TEMPLATE_PARTS,
+                                         lambda part: template_registry.get_file(f'template-parts/{part}.html'))
 
     def _get_template_data(self):
         self._report_data = {}
@@ -201,8 +194,7 @@ class ReportV2:
         """Get html by merging the template with the report data."""
         html_output = None
         try:
-            template = Template(data['template'], autoescape=True)
-            html_output = template.render(data['templateVars'])
+            html_output = data['template'].jinja_template.render(data['templateVars'])
         except Exception as err:
             current_app.logger.error('Error rendering HTML template: ' + str(err))
         return html_output
@@ -211,12 +203,11 @@ class ReportV2:
     def _get_html_from_path(path, title=None):
         html_template = None
         try:
-            template_path = current_app.config.get('REPORT_TEMPLATE_PATH') + path
-            html_template = Path(template_path).read_text(encoding='UTF-8')
+            html_template = template_registry.get_file(path.lstrip('/'))
             if title:
                 html_template = html_template.replace(HEADER_TITLE_REPLACE, title)
         except Exception as err:
-            current_app.logger.error(f'Error loading HTML template from path={template_path}: ' + str(err))
+            current_app.logger.error(f'Error loading HTML template from path={path}: ' + str(err))
         return html_template
 
     @staticmethod
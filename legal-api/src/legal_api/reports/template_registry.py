@@ -0,0 +1,118 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Registry of the assembled report templates.
+
+A report template is the main template with its [[partname.html]] template parts substituted in. Each one is
+assembled from REPORT_TEMPLATE_PATH once per process, along with its base64 form and a hash of its content,
+so a report request only has to build the template data.
+
+With REPORT_TEMPLATE_AUTO_RELOAD set (on in development), a template is assembled again when the main template
+or any of its parts change on disk.
+"""
+import base64
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import current_app
+from jinja2 import Template
+
+
+class ReportTemplate:
+    """An assembled report template."""
+
+    def __init__(self, name: str, code: str, mtime: float):
+        """Create the template from the assembled code."""
+        self.name = name
+        self.code = code
+        self.encoded = base64.b64encode(code.encode('utf-8')).decode()
+        self.digest = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        self.mtime = mtime
+        self._jinja_template: Optional[Template] = None
+
+    @property
+    def jinja_template(self) -> Template:
+        """Return the template compiled for jinja, compiling it on first use."""
+        if self._jinja_template is None:
+            self._jinja_template = Template(self.code, autoescape=True)
+        return self._jinja_template
+
+
+def substitute_template_parts(template_code: str, template_parts: Sequence[str], read_part) -> str:
+    """Substitute the template parts, marked up by [[partname.html]], into the template code."""
+    for template_part in template_parts:
+        template_code = template_code.replace('[[{}.html]]'.format(template_part), read_part(template_part))
+    return template_code
+
+
+class ReportTemplateRegistry:
+    """Hand out the assembled report templates, assembling each on first use."""
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._templates: Dict[Tuple, ReportTemplate] = {}
+        self._files: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, file_name: str, template_parts: Sequence[str]) -> ReportTemplate:
+        """Return the report template in file_name, with the template parts substituted in."""
+        template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
+        key = (template_path, file_name, tuple(template_parts))
+        template = self._templates.get(key)
+        if template:
+            if not self._auto_reload():
+                return template
+            mtime = self._get_mtime(template_path, file_name, template_parts)
+            if template.mtime == mtime:
+                return template
+
+        with self._lock:
+            mtime = self._get_mtime(template_path, file_name, template_parts)
+            template_code = substitute_template_parts(self.get_file(file_name),
+                                                      template_parts,
+                                                      lambda part: self.get_file(f'template-parts/{part}.html'))
+            template = ReportTemplate(file_name, template_code, mtime)
+            self._templates[key] = template
+        return template
+
+    def get_file(self, file_name: str) -> str:
+        """Return the content of a file in the template path, read once per process."""
+        path = os.path.join(current_app.config.get('REPORT_TEMPLATE_PATH'), file_name)
+        cached = self._files.get(path)
+        if cached and (not self._auto_reload() or cached[0] == os.path.getmtime(path)):
+            return cached[1]
+
+        mtime = os.path.getmtime(path)
+        with open(path, encoding='utf-8') as template_file:
+            content = template_file.read()
+        self._files[path] = (mtime, content)
+        return content
+
+    def clear(self):
+        """Drop the assembled templates and the files read."""
+        with self._lock:
+            self._templates.clear()
+            self._files.clear()
+
+    @staticmethod
+    def _auto_reload() -> bool:
+        return current_app.config.get('REPORT_TEMPLATE_AUTO_RELOAD', False)
+
+    @staticmethod
+    def _get_mtime(template_path: str, file_name: str, template_parts: List[str]) -> float:
+        """Return the time the template or any of its parts were last changed."""
+        paths = [os.path.join(template_path, file_name)] + \
+            [os.path.join(template_path, 'template-parts', f'{part}.html') for part in template_parts]
+        return max(os.path.getmtime(path) for path in paths)
+
+
+template_registry = ReportTemplateRegistry()  # pylint: disable=invalid-name
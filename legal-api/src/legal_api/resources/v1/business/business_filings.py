@@ -927,6 +927,28 @@ class InternalFilings(Resource):
             raise err
 
 
+@cors_preflight('GET')
+@API.route('/internal/filings/future_effective', methods=['GET', 'OPTIONS'])
+class InternalFutureEffectiveFilings(Resource):
+    """Internal service for the future effective filings job."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    def get():
+        """Return the ids of the PAID filings that are due to be applied, a page at a time.
+
+        The next page starts after the last id of this one, given as afterId.
+        """
+        try:
+            limit = min(max(int(request.args.get('limit', 500)), 1), 5000)
+            after_id = int(request.args.get('afterId', 0))
+        except ValueError:
+            return jsonify({'message': 'limit and afterId must be integers.'}), HTTPStatus.BAD_REQUEST
+
+        filing_ids = Filing.get_due_future_effective_filing_ids(limit, after_id)
+        return jsonify({'filingIds': filing_ids, 'limit': limit, 'afterId': after_id}), HTTPStatus.OK
+
+
 @cors_preflight('GET, POST, PUT, PATCH, DELETE')
 @API.route('/internal/filings/colin_id', methods=['GET', 'OPTIONS'])
 @API.route('/internal/filings/colin_id/<int:colin_id>', methods=['GET', 'POST', 'OPTIONS'])
@@ -16,6 +16,7 @@ from flask_restx import Namespace, Resource
 from sqlalchemy import exc, text
 
 from legal_api.models import db
+from legal_api.services.authz import get_authorizations_cache_stats
 
 
 API = Namespace('OPS', description='Service - OPS checks')
@@ -51,3 +52,13 @@ class Readyz(Resource):
         """Return a JSON object that identifies if the service is setupAnd ready to work."""
         # TODO: add a poll to the DB when called
         return {'message': 'api is ready'}, 200
+
+
+@API.route('authz-cache')
+class AuthzCache(Resource):
+    """Reports how well the entity authorizations cache of this process is working."""
+
+    @staticmethod
+    def get():
+        """Return a JSON object with the hit and miss counts, and the hit rate, of the authorizations cache."""
+        return get_authorizations_cache_stats(), 200
@@ -24,7 +24,7 @@ from flask_cors import cross_origin
 from sqlalchemy import and_
 
 from legal_api.core import Filing as CoreFiling
-from legal_api.models import Business, Filing, RegistrationBootstrap, db
+from legal_api.models import Business, BusinessProjection, Filing, RegistrationBootstrap, db
 from legal_api.resources.v2.business.business_filings import saving_filings
 from legal_api.services import (  # noqa: I001;
     ACCOUNT_IDENTITY,
@@ -59,10 +59,13 @@ def get_businesses(identifier: str):
 
     # getting all business info is expensive so returning the slim version is desirable for some flows
     # - (i.e. business/person search updates)
+    # the derived fields of the business json are loaded in a single statement
+    projection = BusinessProjection.load(business)
+
     if str(request.args.get('slim', None)).lower() == 'true':
-        business_json = business.json(slim=True)
+        business_json = business.json(slim=True, projection=projection)
         # need to add the alternateNames array here because it is not a part of slim JSON
-        business_json['alternateNames'] = business.get_alternate_names()
+        business_json['alternateNames'] = projection.alternate_names
         return jsonify(business=business_json)
 
     warnings = check_warnings(business)
@@ -73,7 +76,7 @@ def get_businesses(identifier: str):
     allowable_actions = get_allowable_actions(jwt, business)
     business.allowable_actions = allowable_actions
 
-    business_json = business.json()
+    business_json = business.json(projection=projection)
     recent_filing_json = CoreFiling.get_most_recent_filing_json(business.id, None, jwt)
     if recent_filing_json:
         business_json['submitter'] = recent_filing_json['filing']['header']['submitter']
@@ -169,13 +172,14 @@ def search_businesses():
 
         bus_results = []
 
-        # SBC-AUTH only uses alternateNames for SP and GP at the moment
-        # we are not returning alternateNames for non-firms due to performance issues
-        for business in bus_query.all():
-            business_json = business.json(slim=True)
-            # add alternateNames array to slim json only to firms
-            if business.legal_type in (Business.LegalTypes.SOLE_PROP, Business.LegalTypes.PARTNERSHIP):
-                business_json['alternateNames'] = business.get_alternate_names()
+        # the derived fields of all the businesses are loaded together, so the number of queries
+        # doesn't grow with the number of identifiers
+        businesses = bus_query.all()
+        projections = BusinessProjection.load_many(businesses)
+        for business in businesses:
+            projection = projections[business.id]
+            business_json = business.json(slim=True, projection=projection)
+            business_json['alternateNames'] = projection.alternate_names
             bus_results.append(business_json)
 
         draft_results = []
@@ -15,17 +15,22 @@
 
 Provides all the search and retrieval from the business entity documents.
 """
+import re
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
-from typing import Final
+from typing import Final, List, Optional, Tuple
 
 import requests
-from flask import current_app, jsonify, request
+from flask import copy_current_request_context, current_app, jsonify, request
 from flask_cors import cross_origin
 
 from legal_api.core import Filing
 from legal_api.exceptions import ErrorCode, get_error_message
 from legal_api.models import Business, Document, Filing as FilingModel  # noqa: I001
 from legal_api.reports import get_pdf
+from legal_api.reports.report_cache import ReportCache
 from legal_api.services import MinioService, authorized
 from legal_api.utils.auth import jwt
 from legal_api.utils.legislation_datetime import LegislationDatetime
@@ -54,22 +59,9 @@ def get_documents(identifier: str, filing_id: int, legal_filing_name: str = None
             message=get_error_message(ErrorCode.NOT_AUTHORIZED, **{'identifier': identifier})
         ), HTTPStatus.UNAUTHORIZED
 
-    if identifier.startswith('T'):
-        filing_model = FilingModel.get_temp_reg_filing(identifier)
-        business = Business.find_by_internal_id(filing_model.business_id)
-    else:
-        business = Business.find_by_identifier(identifier)
-
-    if not business and not identifier.startswith('T'):
-        return jsonify(
-            message=get_error_message(ErrorCode.MISSING_BUSINESS, **{'identifier': identifier})
-        ), HTTPStatus.NOT_FOUND
-
-    if not (filing := Filing.get(identifier, filing_id)):
-        return jsonify(
-            message=get_error_message(ErrorCode.FILING_NOT_FOUND,
-                                      **{'filing_id': filing_id, 'identifier': identifier})
-        ), HTTPStatus.NOT_FOUND
+    business, filing, error = _find_business_and_filing(identifier, filing_id)
+    if error:
+        return error
 
     if not legal_filing_name and not file_key:
         if identifier.startswith('T') and filing.status == Filing.Status.COMPLETED:
@@ -84,16 +76,195 @@ def get_documents(identifier: str, filing_id: int, legal_filing_name: str = None
             return get_pdf(filing.storage, legal_filing_name)
         elif file_key and (document := Document.find_by_file_key(file_key)):
             if document.filing_id == filing.id:  # make sure the file belongs to this filing
-                response = MinioService.get_file(document.file_key)
-                return current_app.response_class(
-                    response=response.data,
-                    status=response.status,
-                    mimetype='application/pdf'
-                )
+                return MinioService.get_file_response(document.file_key)
 
     return {}, HTTPStatus.NOT_FOUND
 
 
+@cors_preflight('GET')
+@bp.route(DOCUMENTS_BASE_ROUTE + '/bundle', methods=['GET', 'OPTIONS'])
+@cross_origin(origin='*')
+@jwt.requires_auth
+def get_documents_bundle(identifier: str, filing_id: int):
+    """Return all of the documents of the filing in one zip.
+
+    The documents are rendered concurrently, the Server-Timing header has the render time of each one.
+    """
+    if not authorized(identifier, jwt, ['view', ]):
+        return jsonify(
+            message=get_error_message(ErrorCode.NOT_AUTHORIZED, **{'identifier': identifier})
+        ), HTTPStatus.UNAUTHORIZED
+
+    business, filing, error = _find_business_and_filing(identifier, filing_id)
+    if error:
+        return error
+
+    if (identifier.startswith('T') and filing.status == Filing.Status.COMPLETED) or \
+            not (document_list := Filing.get_document_list(business, filing, jwt)) or \
+            not (documents := _get_bundle_documents(document_list['documents'])):
+        return {}, HTTPStatus.NOT_FOUND
+
+    start = time.perf_counter()
+    workers = min(len(documents), max(1, current_app.config.get('DOCUMENT_BUNDLE_CONCURRENCY', 4)))
+    if workers == 1:
+        rendered = [_render_bundle_document(identifier, filing_id, path) for _, path in documents]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bundle') as executor:
+            # each document renders under its own copy of the request context, and so its own db session
+            futures = [executor.submit(copy_current_request_context(_render_bundle_document),
+                                       identifier, filing_id, path)
+                       for _, path in documents]
+            rendered = [future.result() for future in futures]
+    elapsed = (time.perf_counter() - start) * 1000
+
+    files = []
+    timings = []
+    errors = []
+    for (file_name, _), (content, status, cache, duration) in zip(documents, rendered):
+        metric = re.sub(r'[^A-Za-z0-9_-]', '_', file_name.rsplit('.', 1)[0])
+        timings.append(f'{metric};dur={duration:.1f}' + (f';desc="{cache}"' if cache else ''))
+        if content is None:
+            errors.append(f'{file_name}={status}')
+            continue
+        files.append((file_name, content))
+    timings.append(f'total;dur={elapsed:.1f}')
+
+    if not files:
+        return jsonify(message=f'Unable to render the documents: {", ".join(errors)}'), HTTPStatus.BAD_GATEWAY
+
+    headers = {
+        'Content-Disposition': f'attachment; filename="{identifier}_{filing_id}_documents.zip"',
+        'Server-Timing': ', '.join(timings)
+    }
+    if errors:
+        headers['X-Document-Errors'] = ', '.join(errors)
+    return current_app.response_class(_stream_zip(files), mimetype='application/zip', headers=headers)
+
+
+def _find_business_and_filing(identifier: str, filing_id: int):
+    """Return the business and the filing, or the error response when either is missing."""
+    if identifier.startswith('T'):
+        filing_model = FilingModel.get_temp_reg_filing(identifier)
+        business = Business.find_by_internal_id(filing_model.business_id)
+    else:
+        business = Business.find_by_identifier(identifier)
+
+    if not business and not identifier.startswith('T'):
+        return None, None, (jsonify(
+            message=get_error_message(ErrorCode.MISSING_BUSINESS, **{'identifier': identifier})
+        ), HTTPStatus.NOT_FOUND)
+
+    if not (filing := Filing.get(identifier, filing_id)):
+        return None, None, (jsonify(
+            message=get_error_message(ErrorCode.FILING_NOT_FOUND,
+                                      **{'filing_id': filing_id, 'identifier': identifier})
+        ), HTTPStatus.NOT_FOUND)
+
+    return business, filing, None
+
+
+def _get_bundle_documents(documents: dict) -> List[Tuple[str, str]]:
+    """Return the file name and the path under the documents route of each document in the document list."""
+    urls = []  # the url of each document, with the name to give it if it has one
+    for name, value in documents.items():
+        if name == 'legalFilings':
+            urls.extend((None, url) for legal_filing in value for url in legal_filing.values())
+        elif name == 'staticDocuments':
+            urls.extend((static_document['name'], static_document['url']) for static_document in value)
+        else:
+            urls.append((None, value))
+
+    bundle = []
+    file_names = set()
+    for file_name, url in urls:
+        path = url[url.rindex('/documents/') + len('/documents/'):]
+        file_name = file_name or path.rsplit('/', 1)[-1]
+        if not file_name.lower().endswith('.pdf'):
+            file_name += '.pdf'
+        while file_name in file_names:
+            file_name = f'{file_name[:-4]}_1.pdf'
+        file_names.add(file_name)
+        bundle.append((file_name, path))
+    return bundle
+
+
+def _render_bundle_document(identifier: str, filing_id: int, path: str) \
+        -> Tuple[Optional[bytes], int, Optional[str], float]:
+    """Render the document at path under the documents route.
+
+    Returns the pdf, or None if it failed to render, the status, whether it came from the report cache and the
+    time it took in ms.
+    """
+    start = time.perf_counter()
+    response = None
+    try:
+        business, filing, error = _find_business_and_filing(identifier, filing_id)
+        if error:
+            response = current_app.make_response(error)
+        elif path.lower().startswith('receipt'):
+            response = current_app.make_response(_get_receipt(business, filing, jwt.get_token_auth_header()))
+        elif path.startswith('static/'):
+            document = Document.find_by_file_key(path[len('static/'):])
+            if not document or document.filing_id != filing.id:
+                response = current_app.make_response(({}, HTTPStatus.NOT_FOUND))
+            else:
+                file = MinioService.get_file(document.file_key)
+                try:
+                    response = current_app.response_class(response=file.data, status=file.status)
+                finally:
+                    file.close()
+                    file.release_conn()
+        else:
+            response = current_app.make_response(get_pdf(filing.storage, path))
+
+        ok = response.status_code in (HTTPStatus.OK, HTTPStatus.CREATED)
+        # static reports are streamed from minio in direct passthrough, so the body is read from the iterable
+        content = b''.join(response.iter_encoded()) if ok else None
+    except Exception as err:  # pylint: disable=broad-except; a failed document is reported, not the whole bundle
+        current_app.logger.error(f'Failed to render {path} for filing {filing_id}: {err}')
+        return None, HTTPStatus.INTERNAL_SERVER_ERROR.value, None, (time.perf_counter() - start) * 1000
+    finally:
+        if response is not None:
+            # gives a streamed file's connection back to the minio pool
+            response.close()
+
+    return (content,
+            response.status_code,
+            response.headers.get(ReportCache.HEADER),
+            (time.perf_counter() - start) * 1000)
+
+
+class _ZipStream:
+    """A write-only file collecting what the zip writes, for it to be streamed out as it is written."""
+
+    def __init__(self):
+        """Create the empty stream."""
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        """Collect the data written."""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        """Nothing to flush, the data is handed out by drain."""
+
+    def drain(self) -> bytes:
+        """Return the data written since the last drain."""
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+def _stream_zip(files: List[Tuple[str, bytes]]):
+    """Stream the zip of the files, a file at a time. The pdfs are already compressed, so they are stored."""
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as bundle:
+        for file_name, content in files:
+            bundle.writestr(file_name, content)
+            yield stream.drain()
+    yield stream.drain()
+
+
 def _get_document_list(business, filing):
     """Get list of document outputs."""
     if not (document_list := Filing.get_document_list(business, filing, jwt)):
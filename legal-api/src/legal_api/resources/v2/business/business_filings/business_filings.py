@@ -335,6 +335,8 @@ class ListFilingResource():  # pylint: disable=too-many-public-methods
 
         ledger_start = request.args.get('start', default=None, type=int)
         ledger_size = request.args.get('size', default=None, type=int)
+        ledger_cursor = request.args.get('cursor', default=None)
+        ledger_total = str(request.args.get('total', None)).lower() == 'true'
         datetime_str = request.args.get('effective_date', default=None)
 
         effective_date = None
@@ -349,14 +351,40 @@ class ListFilingResource():  # pylint: disable=too-many-public-methods
         if not business:
             return jsonify(filings=[]), HTTPStatus.NOT_FOUND
 
+        statuses = [Filing.Status.COMPLETED.value, Filing.Status.PAID.value]
+
+        if ledger_cursor is None:
+            filings = CoreFiling.ledger(business.id,
+                                        jwt=user_jwt,
+                                        statuses=statuses,
+                                        start=ledger_start,
+                                        size=ledger_size,
+                                        effective_date=effective_date)
+
+            return jsonify(filings=filings)
+
+        # cursor mode, an empty cursor returns the first page
+        keyset = None
+        if ledger_cursor and not (keyset := CoreFiling.decode_ledger_cursor(ledger_cursor)):
+            return ({'message': 'Invalid cursor.'}, HTTPStatus.BAD_REQUEST)
+
+        ledger_size = ledger_size or current_app.config.get('LEDGER_PAGE_SIZE')
         filings = CoreFiling.ledger(business.id,
                                     jwt=user_jwt,
-                                    statuses=[Filing.Status.COMPLETED.value, Filing.Status.PAID.value],
-                                    start=ledger_start,
+                                    statuses=statuses,
                                     size=ledger_size,
-                                    effective_date=effective_date)
+                                    effective_date=effective_date,
+                                    keyset=keyset)
+
+        next_cursor = None
+        if len(filings) == ledger_size:
+            next_cursor = CoreFiling.encode_ledger_cursor(filings[-1]['submittedDate'], filings[-1]['filingId'])
+
+        rv = {'filings': filings, 'nextCursor': next_cursor}
+        if ledger_total:
+            rv['total'] = CoreFiling.ledger_count(business.id, statuses=statuses, effective_date=effective_date)
 
-        return jsonify(filings=filings)
+        return jsonify(rv)
 
     @staticmethod
     def _is_valid_date(datetime_str):
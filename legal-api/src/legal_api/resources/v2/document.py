@@ -66,12 +66,7 @@ def delete_minio_document(document_key):
 def get_minio_document(document_key: str):
     """Get the document from Minio."""
     try:
-        response = MinioService.get_file(document_key)
-        return current_app.response_class(
-                response=response.data,
-                status=response.status,
-                mimetype='application/pdf'
-            )
+        return MinioService.get_file_response(document_key)
     except Exception as e:
         current_app.logger.error(f'Error getting file {document_key}: {e}')
         return jsonify(
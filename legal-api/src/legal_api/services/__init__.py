@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This module wraps the calls to external services used by the API."""
+import functools
 import uuid
 
 from flask import current_app
@@ -41,6 +42,7 @@ from .naics import NaicsService
 from .namex import NameXService
 from .pdf_service import PdfService
 from .queue import QueueService
+from .service_account_token import ServiceAccountTokenCache
 from .warnings.business import check_business
 from .warnings.warning import check_warnings
 
@@ -64,8 +66,17 @@ def publish_event(business: Business, event_type: str, data: dict, subject: str,
             'identifier': business.identifier,
             'data': data
         }
-        queue.publish_json(payload, subject)
+        # events are fire and forget, the request does not wait for the ack
+        future = queue.publish_json(payload, subject, wait_for_ack=False)
+        future.add_done_callback(functools.partial(_capture_publish_error, subject, business.id))
     except Exception as err:  # pylint: disable=broad-except; # noqa: B902
         capture_message(f'Legal-api queue publish {subject} error: business.id=' + str(business.id) + str(err),
                         level='error')
         current_app.logger.error('Queue Publish %s Error: business.id=%s', subject, business.id, exc_info=True)
+
+
+def _capture_publish_error(subject: str, business_id: int, future):
+    """Report the failure of a fire and forget publish."""
+    if not future.cancelled() and (err := future.exception()):
+        capture_message(f'Legal-api queue publish {subject} error: business.id=' + str(business_id) + str(err),
+                        level='error')
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This manages all of the authentication and authorization service."""
+import copy
+import hashlib
+import threading
 from datetime import datetime, timezone
 from enum import Enum
 from http import HTTPStatus
@@ -32,6 +35,10 @@ from legal_api.services.warnings.business.business_checks import WarningType
 
 cache = Cache()
 
+_auth_api_session: Session = None
+_auth_api_session_lock = threading.Lock()
+_authorizations_cache_stats = {'hits': 0, 'misses': 0}
+
 SYSTEM_ROLE = 'system'
 STAFF_ROLE = 'staff'
 BASIC_USER = 'basic'
@@ -62,6 +69,24 @@ class BusinessRequirement(str, Enum):
     NO_RESTRICTION = 'NO_RESTRICTION'
 
 
+def _get_auth_api_session() -> Session:
+    """Return the process wide auth api session, so connections are pooled and reused across requests."""
+    global _auth_api_session  # pylint: disable=global-statement
+    if _auth_api_session is None:
+        with _auth_api_session_lock:
+            if _auth_api_session is None:
+                retries = Retry(total=5,
+                                backoff_factor=0.1,
+                                status_forcelist=[500, 502, 503, 504])
+                pool_size = current_app.config.get('AUTH_API_POOL_SIZE', 10)
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+                http = Session()
+                http.mount('http://', adapter)
+                http.mount('https://', adapter)
+                _auth_api_session = http
+    return _auth_api_session
+
+
 def _call_auth_api(path: str, token: str) -> Response:
     """Return the auth api response for the given endpoint path."""
     if not token:
@@ -74,12 +99,7 @@ def _call_auth_api(path: str, token: str) -> Response:
 
     headers = {'Authorization': 'Bearer ' + token}
     try:
-        http = Session()
-        retries = Retry(total=5,
-                        backoff_factor=0.1,
-                        status_forcelist=[500, 502, 503, 504])
-        http.mount('http://', HTTPAdapter(max_retries=retries))
-        resp = http.get(url=auth_url, headers=headers)
+        resp = _get_auth_api_session().get(url=auth_url, headers=headers)
         current_app.logger.debug(f'Auth get {path} response status: {str(resp.status_code)}')
         return resp
 
@@ -92,6 +112,51 @@ def _call_auth_api(path: str, token: str) -> Response:
         return None
 
 
+def get_authorizations_cache_stats() -> dict:
+    """Return the hit and miss counts, and hit rate, of the entity authorizations cache for this process."""
+    hits = _authorizations_cache_stats['hits']
+    misses = _authorizations_cache_stats['misses']
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hitRate': round(hits / (hits + misses), 4) if hits + misses else 0
+    }
+
+
+def _get_token_ttl(token: str) -> int:
+    """Return the number of seconds until the token expires, or 0 if the expiry is unknown."""
+    try:
+        claims = pyjwt.decode(token, options={'verify_signature': False})
+    except pyjwt.PyJWTError:
+        return 0
+    if not claims or not (expiry := claims.get('exp')):
+        return 0
+    return max(int(expiry - datetime.now(timezone.utc).timestamp()), 0)
+
+
+def get_entity_authorizations(identifier: str, token: str) -> List[str]:
+    """Return the roles the token holder has on the entity, or None if they could not be fetched.
+
+    Successful lookups are cached per token and identifier, until the cache timeout or the token expiry,
+    whichever comes first, so the requests made by a single page share one auth api call.
+    """
+    cache_key = f'entity-authorizations:{hashlib.sha256(token.encode()).hexdigest()}:{identifier}'
+    if (roles := cache.get(cache_key)) is not None:
+        _authorizations_cache_stats['hits'] += 1
+        return roles
+
+    _authorizations_cache_stats['misses'] += 1
+    rv = _call_auth_api(f'entities/{identifier}/authorizations', token)
+    if not rv or rv.status_code != HTTPStatus.OK:
+        return None
+
+    roles = rv.json().get('roles') or []
+    timeout = min(current_app.config.get('AUTHORIZATIONS_CACHE_TIMEOUT', 60), _get_token_ttl(token))
+    if timeout > 0:
+        cache.set(cache_key, roles, timeout=timeout)
+    return roles
+
+
 def authorized(  # pylint: disable=too-many-return-statements
         identifier: str, jwt: JwtManager, action: List[str]) -> bool:
     """Assert that the user is authorized to create filings against the business identifier."""
@@ -116,8 +181,7 @@ def authorized(  # pylint: disable=too-many-return-statements
         if any(elem in action for elem in staff_only_actions):
             return False
 
-        rv = _call_auth_api(f'entities/{identifier}/authorizations', jwt.get_token_auth_header())
-        if rv and rv.status_code == HTTPStatus.OK and (roles := rv.json().get('roles')):
+        if roles := get_entity_authorizations(identifier, jwt.get_token_auth_header()):
             return all(elem.lower() in roles for elem in action)
 
     return False
@@ -474,6 +538,94 @@ def get_allowable_filings_dict():
     }
 
 
+_allowable_filings_index: dict = None
+
+
+def get_allowable_filings_index() -> dict:
+    """Return the allowable filing rules compiled into lookups keyed by (user role, state, legal type).
+
+    The rules are compiled once per process; they are static, so only the blocker facts vary per business.
+    """
+    global _allowable_filings_index  # pylint: disable=global-statement
+    if _allowable_filings_index is None:
+        _allowable_filings_index = compile_allowable_filings(get_allowable_filings_dict())
+    return _allowable_filings_index
+
+
+def compile_allowable_filings(allowable_filings_dict: dict) -> dict:  # pylint: disable=too-many-locals
+    """Compile the allowable filing rules, precomputing display names, fee codes and parsed blocker checks."""
+    # importing here to avoid circular dependencies
+    # pylint: disable=import-outside-toplevel
+    from legal_api.core.meta import FilingMeta
+
+    filings = {}
+    allowed = {}
+    blocker_filing_types = set()
+
+    for user_role, states in allowable_filings_dict.items():
+        for state, allowable_filings in states.items():
+            for filing_type, allowable_filing in allowable_filings.items():
+                business_requirement = allowable_filing.get('businessRequirement', BusinessRequirement.EXIST)
+                if allowable_filing.get('legalTypes'):
+                    filing_rules = [(None, allowable_filing)]
+                else:
+                    filing_rules = [(k, v) for k, v in allowable_filing.items() if isinstance(v, dict)]
+
+                sub_types_by_legal_type = {}
+                for filing_sub_type, filing_rule in filing_rules:
+                    blocker_checks = compile_blocker_checks(filing_rule.get('blockerChecks', {}))
+                    for key in ['completedFilings', 'futureEffectiveFilings']:
+                        blocker_filing_types.update(x[0] for x in blocker_checks.get(key, []))
+
+                    for legal_type in filing_rule.get('legalTypes', []):
+                        key = (user_role, state, legal_type)
+                        filing_type_info = {'name': filing_type}
+                        if filing_sub_type:
+                            filing_type_info['type'] = filing_sub_type
+                            sub_types_by_legal_type.setdefault(legal_type, []).append(filing_sub_type)
+                        else:
+                            allowed.setdefault(key, []).append(filing_type)
+                        filing_type_info['displayName'] = FilingMeta.get_display_name(legal_type,
+                                                                                      filing_type,
+                                                                                      filing_sub_type)
+                        filing_type_info['feeCode'] = Filing.get_fee_code(legal_type, filing_type, filing_sub_type)
+                        filings.setdefault(key, []).append({'filingType': filing_type_info,
+                                                            'businessRequirement': business_requirement,
+                                                            'blockerChecks': blocker_checks})
+
+                for legal_type, sub_types in sub_types_by_legal_type.items():
+                    allowed.setdefault((user_role, state, legal_type), []).append({filing_type: sub_types})
+
+    return {
+        'filings': filings,
+        'allowed': allowed,
+        'blockerFilingTypes': sorted(blocker_filing_types)
+    }
+
+
+def compile_blocker_checks(blocker_checks: dict) -> dict:
+    """Return the blocker checks with filing info parsed into (filing type, filing sub-type) pairs."""
+    compiled = {}
+    if business_blockers := blocker_checks.get('business', []):
+        compiled['business'] = list(business_blockers)
+    for key in ['validStateFilings', 'invalidStateFilings']:
+        if filing_types := blocker_checks.get(key, []):
+            compiled[key] = [parse_filing_info(x) for x in filing_types]
+    for key in ['completedFilings', 'futureEffectiveFilings']:
+        if filing_types := blocker_checks.get(key, []):
+            compiled[key] = frozenset(parse_filing_info(x) for x in filing_types)
+    if warning_types := blocker_checks.get('warningTypes', []):
+        compiled['warningTypes'] = frozenset(warning_types)
+    return compiled
+
+
+def get_user_role(jwt: JwtManager) -> str:
+    """Return the allowable filings role for the current user."""
+    if jwt.contains_role([STAFF_ROLE, SYSTEM_ROLE, COLIN_SVC_ROLE]):
+        return 'staff'
+    return 'general'
+
+
 # pylint: disable=(too-many-arguments,too-many-locals
 def is_allowed(business: Business,
                state: Business.State,
@@ -498,12 +650,12 @@ def is_allowed(business: Business,
     if filing_type == 'amalgamationApplication' and legal_type in ['C', 'CBEN', 'CUL', 'CCC']:
         return False
 
-    allowable_filings = get_allowed_filings(business, state, legal_type, jwt, is_ignore_draft_blockers)
+    allowable_filings = evaluate_allowed_filings(business, state, legal_type, jwt, is_ignore_draft_blockers,
+                                                 filing_type)
 
     for allowable_filing in allowable_filings:
-        if allowable_filing['name'] == filing_type:
-            if not sub_filing_type or allowable_filing['type'] == sub_filing_type:
-                return True
+        if not sub_filing_type or allowable_filing.get('type') == sub_filing_type:
+            return True
 
     return False
 
@@ -536,93 +688,101 @@ def get_allowed_filings(business: Business,
                         jwt: JwtManager,
                         is_ignore_draft_blockers: bool = False):
     """Get allowed type of filing types for the current user."""
-    # importing here to avoid circular dependencies
-    # pylint: disable=import-outside-toplevel
-    from legal_api.core.meta import FilingMeta
-
-    user_role = 'general'
-    if jwt.contains_role([STAFF_ROLE, SYSTEM_ROLE, COLIN_SVC_ROLE]):
-        user_role = 'staff'
-
-    state_filing = None
-    if business and business.state_filing_id:
-        state_filing = Filing.find_by_id(business.state_filing_id)
-
-    # doing this check up front to cache result
-    business_blocker_dict: dict = business_blocker_check(business, is_ignore_draft_blockers)
-    allowable_filings = get_allowable_filings_dict().get(user_role, {}).get(state, {})
+    return evaluate_allowed_filings(business, state, legal_type, jwt, is_ignore_draft_blockers)
+
+
+def evaluate_allowed_filings(business: Business,
+                             state: Business.State,
+                             legal_type: str,
+                             jwt: JwtManager,
+                             is_ignore_draft_blockers: bool = False,
+                             filing_type: str = None):
+    """Return the allowed filing types, optionally only those of filing_type, from the compiled rule index."""
+    filing_rules = get_allowable_filings_index()['filings'].get((get_user_role(jwt), state, legal_type), [])
+    if filing_type:
+        filing_rules = [x for x in filing_rules if x['filingType']['name'] == filing_type]
+
+    business_blocker_dict = None
+    blocker_facts = None
     allowable_filing_types = []
 
-    for allowable_filing_key, allowable_filing_value in allowable_filings.items():
+    for filing_rule in filing_rules:
         # skip if business does not exist and filing is not required
         # skip if this filing does not need to be returned for existing businesses
-
-        business_status = allowable_filing_value.get('businessRequirement', BusinessRequirement.EXIST)
-
+        business_status = filing_rule['businessRequirement']
         if business_status != BusinessRequirement.NO_RESTRICTION and \
                 bool(business) ^ (business_status == BusinessRequirement.EXIST):
             continue
 
-        allowable_filing_legal_types = allowable_filing_value.get('legalTypes', [])
-
-        if allowable_filing_legal_types:
-            is_blocker = has_blocker(business, state_filing, allowable_filing_value, business_blocker_dict)
-            is_include_legal_type = legal_type in allowable_filing_legal_types
-            is_allowable = not is_blocker and is_include_legal_type
-            allowable_filing_type = {'name': allowable_filing_key,
-                                     'displayName': FilingMeta.get_display_name(legal_type, allowable_filing_key),
-                                     'feeCode': Filing.get_fee_code(legal_type, allowable_filing_key)}
-            allowable_filing_types = add_allowable_filing_type(is_allowable,
-                                                               allowable_filing_types,
-                                                               allowable_filing_type)
-            continue
+        if business and filing_rule['blockerChecks']:
+            # gathered once, and only when a rule actually needs them
+            if blocker_facts is None:
+                business_blocker_dict = business_blocker_check(business, is_ignore_draft_blockers)
+                blocker_facts = get_blocker_facts(business)
+            if has_blocker(filing_rule['blockerChecks'], business_blocker_dict, blocker_facts):
+                continue
 
-        filing_sub_type_items = \
-            filter(lambda x: isinstance(x[1], dict) and legal_type in
-                   x[1].get('legalTypes', []), allowable_filing_value.items())
-
-        for filing_sub_type_item_key, filing_sub_type_item_value in filing_sub_type_items:
-            is_allowable = not has_blocker(business, state_filing, filing_sub_type_item_value, business_blocker_dict)
-
-            allowable_filing_sub_type = {'name': allowable_filing_key,
-                                         'type': filing_sub_type_item_key,
-                                         'displayName': FilingMeta.get_display_name(legal_type,
-                                                                                    allowable_filing_key,
-                                                                                    filing_sub_type_item_key),
-                                         'feeCode': Filing.get_fee_code(legal_type,
-                                                                        allowable_filing_key,
-                                                                        filing_sub_type_item_key)}
-            allowable_filing_types = add_allowable_filing_type(is_allowable,
-                                                               allowable_filing_types,
-                                                               allowable_filing_sub_type)
+        allowable_filing_types.append(dict(filing_rule['filingType']))
 
     return allowable_filing_types
 
 
-def has_blocker(business: Business, state_filing: Filing, allowable_filing: dict, business_blocker_dict: dict):
-    """Return True if allowable filing has a blocker."""
-    if not business:
-        return False
+def get_blocker_facts(business: Business) -> dict:
+    """Return the business facts the filing blocker checks are evaluated against.
+
+    Completed filings, future effective filings and the state filing are all read by a single query.
+    """
+    blocker_filing_types = get_allowable_filings_index()['blockerFilingTypes']
+    filings = Filing.get_blocker_filings(business.id,
+                                         blocker_filing_types,
+                                         [Filing.Status.COMPLETED.value,
+                                          Filing.Status.PENDING.value,
+                                          Filing.Status.PAID.value],
+                                         business.state_filing_id)
+
+    now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    blocker_facts = {
+        'stateFiling': None,
+        'completedFilings': set(),
+        'futureEffectiveFilings': set(),
+        'warningTypes': {x['warningType'] for x in business.warnings}
+    }
+    for filing_id, business_id, filing_type, filing_sub_type, status, effective_date in filings:
+        if filing_id == business.state_filing_id:
+            blocker_facts['stateFiling'] = (filing_type, filing_sub_type)
+
+        if business_id != business.id or filing_type not in blocker_filing_types:
+            continue
+
+        if status == Filing.Status.COMPLETED.value:
+            blocker_facts['completedFilings'].add((filing_type, filing_sub_type))
+        elif effective_date and effective_date > now:
+            blocker_facts['futureEffectiveFilings'].add((filing_type, filing_sub_type))
+
+    return blocker_facts
 
-    if not (blocker_checks := allowable_filing.get('blockerChecks', {})):
+
+def has_blocker(blocker_checks: dict, business_blocker_dict: dict, blocker_facts: dict):
+    """Return True if allowable filing has a blocker."""
+    if not blocker_checks:
         return False
 
     if has_business_blocker(blocker_checks, business_blocker_dict):
         return True
 
-    if has_blocker_valid_state_filing(state_filing, blocker_checks):
+    if has_blocker_valid_state_filing(blocker_facts['stateFiling'], blocker_checks):
         return True
 
-    if has_blocker_invalid_state_filing(state_filing, blocker_checks):
+    if has_blocker_invalid_state_filing(blocker_facts['stateFiling'], blocker_checks):
         return True
 
-    if has_blocker_completed_filing(business, blocker_checks):
+    if has_blocker_completed_filing(blocker_facts['completedFilings'], blocker_checks):
         return True
 
-    if has_blocker_future_effective_filing(business, blocker_checks):
+    if has_blocker_future_effective_filing(blocker_facts['futureEffectiveFilings'], blocker_checks):
         return True
 
-    if has_blocker_warning_filing(business.warnings, blocker_checks):
+    if has_blocker_warning_filing(blocker_facts['warningTypes'], blocker_checks):
         return True
 
     return False
@@ -696,7 +856,7 @@ def has_blocker_filing(business: Business, is_ignore_draft_blockers: bool = Fals
     return any(blocker_filing_matches)
 
 
-def has_blocker_valid_state_filing(state_filing: Filing, blocker_checks: dict):
+def has_blocker_valid_state_filing(state_filing: tuple, blocker_checks: dict):
     """Check if there is a required state filing that business does not have."""
     if not (state_filing_types := blocker_checks.get('validStateFilings', [])):
         return False
@@ -707,7 +867,7 @@ def has_blocker_valid_state_filing(state_filing: Filing, blocker_checks: dict):
     return not has_filing_match(state_filing, state_filing_types)
 
 
-def has_blocker_invalid_state_filing(state_filing: Filing, blocker_checks: dict):
+def has_blocker_invalid_state_filing(state_filing: tuple, blocker_checks: dict):
     """Check if business has an invalid state filing."""
     if not (state_filing_types := blocker_checks.get('invalidStateFilings', [])):
         return False
@@ -718,57 +878,37 @@ def has_blocker_invalid_state_filing(state_filing: Filing, blocker_checks: dict)
     return has_filing_match(state_filing, state_filing_types)
 
 
-def has_blocker_completed_filing(business: Business, blocker_checks: dict):
-    """Check if business has an completed filing."""
-    if not (complete_filing_types := blocker_checks.get('completedFilings', [])):
-        return False
-
-    filing_type_pairs = [(parse_filing_info(x)) for x in complete_filing_types]
-    completed_filings = Filing.get_filings_by_type_pairs(business.id,
-                                                         filing_type_pairs,
-                                                         [Filing.Status.COMPLETED.value],
-                                                         True)
-
-    if len(completed_filings) == len(complete_filing_types):
+def has_blocker_completed_filing(completed_filings: set, blocker_checks: dict):
+    """Check if business is missing any of the required completed filings."""
+    if not (complete_filing_types := blocker_checks.get('completedFilings')):
         return False
 
-    return True
+    return not complete_filing_types <= completed_filings
 
 
-def has_blocker_future_effective_filing(business: Business, blocker_checks: dict):
+def has_blocker_future_effective_filing(future_effective_filings: set, blocker_checks: dict):
     """Check if business has a future effective filing."""
-    if not (fed_filing_types := blocker_checks.get('futureEffectiveFilings', [])):
+    if not (fed_filing_types := blocker_checks.get('futureEffectiveFilings')):
         return False
 
-    filing_type_pairs = [(parse_filing_info(x)) for x in fed_filing_types]
-
-    pending_filings = Filing.get_filings_by_type_pairs(business.id,
-                                                       filing_type_pairs,
-                                                       [Filing.Status.PENDING.value, Filing.Status.PAID.value],
-                                                       True)
-
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
-    is_fed = any(f.effective_date > now for f in pending_filings)
-
-    return is_fed
+    return not fed_filing_types.isdisjoint(future_effective_filings)
 
 
-def has_filing_match(filing: Filing, filing_types: list):
-    """Return if filing matches any filings provided in filing_types arg ."""
-    for filing_type in filing_types:
-        filing_type, filing_sub_type = parse_filing_info(filing_type)
+def has_filing_match(filing: tuple, filing_types: list):
+    """Return if the (filing type, filing sub-type) pair matches any of the pairs provided in filing_types arg."""
+    for filing_type, filing_sub_type in filing_types:
         if is_filing_type_match(filing, filing_type, filing_sub_type):
             return True
 
     return False
 
 
-def is_filing_type_match(filing: Filing, filing_type: str, filing_sub_type: str):
+def is_filing_type_match(filing: tuple, filing_type: str, filing_sub_type: str):
     """Return if the filing type and filing sub-type matches.  Skip matching on sub-type if value is None."""
     if not filing_sub_type:
-        return filing.filing_type == filing_type
+        return filing[0] == filing_type
 
-    return filing.filing_type == filing_type and filing.filing_sub_type == filing_sub_type
+    return filing == (filing_type, filing_sub_type)
 
 
 def parse_filing_info(filing_info: str):
@@ -779,49 +919,18 @@ def parse_filing_info(filing_info: str):
     return filing_type, filing_sub_type
 
 
-def has_blocker_warning_filing(warnings: List, blocker_checks: dict):
+def has_blocker_warning_filing(warning_types: set, blocker_checks: dict):
     """Return if business has a warning that blocks filing."""
-    if not (blocker_warning_filings := blocker_checks.get('warningTypes', [])):
+    if not (blocker_warning_filings := blocker_checks.get('warningTypes')):
         return False
 
-    warning_types = [x['warningType'] for x in warnings]
-    # update to only keep unique warning types
-    warning_types = list(set(warning_types))
-    warning_matches = any(x for x in warning_types if x in blocker_warning_filings)
-    return warning_matches
+    return not blocker_warning_filings.isdisjoint(warning_types)
 
 
 def get_allowed(state: Business.State, legal_type: str, jwt: JwtManager):
     """Get allowed type of filing types for the current user."""
-    user_role = 'general'
-    if jwt.contains_role([STAFF_ROLE, SYSTEM_ROLE, COLIN_SVC_ROLE]):
-        user_role = 'staff'
-
-    allowable_filings = get_allowable_filings_dict().get(user_role, {}).get(state, {})
-    allowable_filing_types = []
-    for allowable_filing_key, allowable_filing_value in allowable_filings.items():
-        if legal_types := allowable_filing_value.get('legalTypes', None):
-            if legal_type in legal_types:
-                allowable_filing_types.append(allowable_filing_key)
-        else:
-            sub_filing_types = [x for x in allowable_filing_value.items()
-                                if isinstance(x[1], dict) and legal_type in x[1].get('legalTypes')]
-            if sub_filing_types:
-                allowable_filing_types.append({
-                    allowable_filing_key: [sub_filing_type[0] for sub_filing_type in sub_filing_types]
-                })
-
-    return allowable_filing_types
-
-
-def add_allowable_filing_type(is_allowable: bool = False,
-                              allowable_filing_types: list = None,
-                              allowable_filing_type: dict = None):
-    """Append allowable filing type."""
-    if is_allowable:
-        allowable_filing_types.append(allowable_filing_type)
-
-    return allowable_filing_types
+    allowed = get_allowable_filings_index()['allowed'].get((get_user_role(jwt), state, legal_type), [])
+    return copy.deepcopy(allowed)
 
 
 def are_digital_credentials_allowed(business: Business, jwt: JwtManager):
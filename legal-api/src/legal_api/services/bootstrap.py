@@ -26,6 +26,7 @@ from flask_babel import _ as babel  # noqa: N813, I001, I003 casting _ to babel
 from sqlalchemy.orm.exc import FlushError  # noqa: I001
 
 from legal_api.models import RegistrationBootstrap  # noqa: D204, I003, I001;# due to babel cast above
+from legal_api.services.service_account_token import service_account_tokens
 
 
 class RegistrationBootstrapService:
@@ -102,10 +103,7 @@ class RegistrationBootstrapService:
 
 
 class AccountService:
-    """Wrapper to call Authentication Services.
-
-    @TODO Cache and refresh / retry token as needed to reduce calls.
-    """
+    """Wrapper to call Authentication Services."""
 
     BEARER: str = 'Bearer '
     CONTENT_TYPE_JSON = {'Content-Type': 'application/json'}
@@ -117,24 +115,14 @@ class AccountService:
 
     @classmethod
     def get_bearer_token(cls):
-        """Get a valid Bearer token for the service to use."""
-        token_url = current_app.config.get('ACCOUNT_SVC_AUTH_URL')
-        client_id = current_app.config.get('ACCOUNT_SVC_CLIENT_ID')
-        client_secret = current_app.config.get('ACCOUNT_SVC_CLIENT_SECRET')
-
-        data = 'grant_type=client_credentials'
-
-        # get service account token
-        res = requests.post(url=token_url,
-                            data=data,
-                            headers={'content-type': 'application/x-www-form-urlencoded'},
-                            auth=(client_id, client_secret),
-                            timeout=cls.timeout)
+        """Get a valid Bearer token for the service to use.
 
-        try:
-            return res.json().get('access_token')
-        except Exception:
-            return None
+        The token is shared by the whole process and only requested again shortly before it expires.
+        """
+        return service_account_tokens.get_token(current_app.config.get('ACCOUNT_SVC_AUTH_URL'),
+                                                current_app.config.get('ACCOUNT_SVC_CLIENT_ID'),
+                                                current_app.config.get('ACCOUNT_SVC_CLIENT_SECRET'),
+                                                cls.timeout)
 
     @classmethod
     # pylint: disable=too-many-arguments, too-many-locals disable=invalid-name;
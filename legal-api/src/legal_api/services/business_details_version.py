@@ -82,24 +82,22 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_ia_revision(filing, business) -> dict:
         """Consolidates incorporation application upto the given transaction id of a filing."""
         ia_json = {}
+        snapshot = BusinessSnapshot(filing.transaction_id, business.id,
+                                    [BusinessSnapshot.OFFICES, BusinessSnapshot.PARTIES,
+                                     BusinessSnapshot.SHARE_CLASSES, BusinessSnapshot.NAME_TRANSLATIONS])
 
         ia_json['business'] = \
             VersionedBusinessDetailsService.get_business_revision(filing.transaction_id, business)
         ia_json['incorporationApplication'] = {}
-        ia_json['incorporationApplication']['offices'] = \
-            VersionedBusinessDetailsService.get_office_revision(filing.transaction_id, business.id)
-        ia_json['incorporationApplication']['parties'] = \
-            VersionedBusinessDetailsService.get_party_role_revision(filing.transaction_id,
-                                                                    business.id, is_ia_or_after=True)
+        ia_json['incorporationApplication']['offices'] = snapshot.offices_json()
+        ia_json['incorporationApplication']['parties'] = snapshot.parties_json(is_ia_or_after=True)
         ia_json['incorporationApplication']['nameRequest'] = \
             VersionedBusinessDetailsService.get_name_request_revision(filing)
         ia_json['incorporationApplication']['contactPoint'] = \
             VersionedBusinessDetailsService.get_contact_point_revision(filing)
         ia_json['incorporationApplication']['shareStructure'] = {}
-        ia_json['incorporationApplication']['shareStructure']['shareClasses'] = \
-            VersionedBusinessDetailsService.get_share_class_revision(filing.transaction_id, business.id)
-        ia_json['incorporationApplication']['nameTranslations'] = \
-            VersionedBusinessDetailsService.get_name_translations_revision(filing.transaction_id, business.id)
+        ia_json['incorporationApplication']['shareStructure']['shareClasses'] = snapshot.share_classes_json()
+        ia_json['incorporationApplication']['nameTranslations'] = snapshot.name_translations_json()
         ia_json['incorporationApplication']['incorporationAgreement'] = \
             VersionedBusinessDetailsService.get_incorporation_agreement_json(filing)
 
@@ -163,11 +161,10 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         if 'nextARDate' in filing.json['filing']['annualReport']:
             ar_json['annualReport']['nextARDate'] = filing.json['filing']['annualReport']['nextARDate']
 
-        ar_json['annualReport']['directors'] = \
-            VersionedBusinessDetailsService.get_party_role_revision(filing.transaction_id,
-                                                                    business.id, role='director')
-        ar_json['annualReport']['offices'] = \
-            VersionedBusinessDetailsService.get_office_revision(filing.transaction_id, business.id)
+        snapshot = BusinessSnapshot(filing.transaction_id, business.id,
+                                    [BusinessSnapshot.OFFICES, BusinessSnapshot.PARTIES])
+        ar_json['annualReport']['directors'] = snapshot.parties_json(role='director')
+        ar_json['annualReport']['offices'] = snapshot.offices_json()
 
         # legal_type CP may need changeOfDirectors/changeOfAddress
         if 'changeOfDirectors' in filing.json['filing']:
@@ -195,16 +192,12 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         filing = Filing.find_by_id(filing_id)
         company_profile_json['business'] = \
             VersionedBusinessDetailsService.get_business_revision(filing.transaction_id, business)
-        company_profile_json['parties'] = \
-            VersionedBusinessDetailsService.get_party_role_revision(filing.transaction_id, business_id)
-        company_profile_json['offices'] = \
-            VersionedBusinessDetailsService.get_office_revision(filing.transaction_id, business_id)
-        company_profile_json['shareClasses'] = \
-            VersionedBusinessDetailsService.get_share_class_revision(filing.transaction_id, business_id)
-        company_profile_json['nameTranslations'] = \
-            VersionedBusinessDetailsService.get_name_translations_revision(filing.transaction_id, business_id)
-        company_profile_json['resolutions'] = \
-            VersionedBusinessDetailsService.get_resolution_dates_revision(filing.transaction_id, business_id)
+        snapshot = BusinessSnapshot(filing.transaction_id, business_id)
+        company_profile_json['parties'] = snapshot.parties_json()
+        company_profile_json['offices'] = snapshot.offices_json()
+        company_profile_json['shareClasses'] = snapshot.share_classes_json()
+        company_profile_json['nameTranslations'] = snapshot.name_translations_json()
+        company_profile_json['resolutions'] = snapshot.resolutions_json()
         return company_profile_json
 
     @staticmethod
@@ -233,6 +226,34 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
             .order_by(business_version.transaction_id).one_or_none()
         return business_revision
 
+    @staticmethod
+    def get_business_revision_legal_types(business_id, transaction_ids) -> dict:
+        """Return the legal type of a business as of each of the given transaction ids.
+
+        All versions of the business are fetched in a single query and matched in memory,
+        instead of one get_business_revision_obj query per transaction.
+        """
+        transaction_ids = {transaction_id for transaction_id in transaction_ids if transaction_id}
+        if not transaction_ids:
+            return {}
+
+        business_version = version_class(Business)
+        versions = db.session.query(business_version.transaction_id,
+                                    business_version.end_transaction_id,
+                                    business_version.legal_type) \
+            .filter(business_version.operation_type != 2) \
+            .filter(business_version.id == business_id) \
+            .order_by(business_version.transaction_id).all()
+
+        legal_types = {}
+        for transaction_id in transaction_ids:
+            for version in versions:
+                if version.transaction_id <= transaction_id and \
+                        (version.end_transaction_id is None or version.end_transaction_id > transaction_id):
+                    legal_types[transaction_id] = version.legal_type
+                    break
+        return legal_types
+
     @staticmethod
     def find_last_value_from_business_revision(transaction_id, business_id,
                                                is_dissolution_date=False,
@@ -266,79 +287,18 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     @staticmethod
     def get_office_revision(transaction_id, business_id) -> dict:
         """Consolidates all office changes upto the given transaction id."""
-        offices_json = {}
-        address_version = version_class(Address)
-        offices_version = version_class(Office)
-
-        offices = db.session.query(offices_version) \
-            .filter(offices_version.transaction_id <= transaction_id) \
-            .filter(offices_version.operation_type != 2) \
-            .filter(offices_version.business_id == business_id) \
-            .filter(or_(offices_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        offices_version.end_transaction_id > transaction_id)) \
-            .order_by(offices_version.transaction_id).all()
-
-        for office in offices:
-            offices_json[office.office_type] = {}
-            addresses_list = db.session.query(address_version) \
-                .filter(address_version.transaction_id <= transaction_id) \
-                .filter(address_version.operation_type != 2) \
-                .filter(address_version.office_id == office.id) \
-                .filter(or_(address_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                            address_version.end_transaction_id > transaction_id)) \
-                .order_by(address_version.transaction_id).all()
-            for address in addresses_list:
-                offices_json[office.office_type][f'{address.address_type}Address'] = \
-                    VersionedBusinessDetailsService.address_revision_json(address)
-
-        return offices_json
+        return BusinessSnapshot(transaction_id, business_id, [BusinessSnapshot.OFFICES]).offices_json()
 
     @staticmethod
     def get_party_role_revision(transaction_id, business_id, is_ia_or_after=False, role=None) -> dict:
         """Consolidates all party changes upto the given transaction id."""
-        party_role_version = version_class(PartyRole)
-        party_roles = db.session.query(party_role_version)\
-            .filter(party_role_version.transaction_id <= transaction_id) \
-            .filter(party_role_version.operation_type != 2) \
-            .filter(party_role_version.business_id == business_id) \
-            .filter(or_(role == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        party_role_version.role == role)) \
-            .filter(or_(party_role_version.end_transaction_id == None,   # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        party_role_version.end_transaction_id > transaction_id)) \
-            .order_by(party_role_version.transaction_id).all()
-        parties = []
-        for party_role in party_roles:
-            if party_role.cessation_date is None:
-                party_role_json = VersionedBusinessDetailsService.party_role_revision_json(transaction_id,
-                                                                                           party_role, is_ia_or_after)
-                if 'roles' in party_role_json and (party := next((x for x in parties if x['officer']['id']
-                                                                  == party_role_json['officer']['id']), None)):
-                    party['roles'].extend(party_role_json['roles'])
-                else:
-                    parties.append(party_role_json)
-
-        return parties
+        return BusinessSnapshot(transaction_id, business_id, [BusinessSnapshot.PARTIES]) \
+            .parties_json(is_ia_or_after, role)
 
     @staticmethod
     def get_share_class_revision(transaction_id, business_id) -> dict:
         """Consolidates all share classes upto the given transaction id."""
-        share_class_version = version_class(ShareClass)
-        share_classes_list = db.session.query(share_class_version) \
-            .filter(share_class_version.transaction_id <= transaction_id) \
-            .filter(share_class_version.operation_type != 2) \
-            .filter(share_class_version.business_id == business_id) \
-            .filter(or_(share_class_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        share_class_version.end_transaction_id > transaction_id)) \
-            .order_by(share_class_version.transaction_id).all()
-        share_classes = []
-        for share_class in share_classes_list:
-            share_class_json = VersionedBusinessDetailsService.share_class_revision_json(share_class)
-            share_class_json['series'] = VersionedBusinessDetailsService.get_share_series_revision(transaction_id,
-                                                                                                   share_class.id)
-            share_class_json['type'] = 'Class'
-            share_class_json['id'] = str(share_class_json['id'])
-            share_classes.append(share_class_json)
-        return share_classes
+        return BusinessSnapshot(transaction_id, business_id, [BusinessSnapshot.SHARE_CLASSES]).share_classes_json()
 
     @staticmethod
     def get_share_series_revision(transaction_id, share_class_id) -> dict:
@@ -362,20 +322,8 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     @staticmethod
     def get_name_translations_revision(transaction_id, business_id) -> dict:
         """Consolidates all name translations upto the given transaction id."""
-        name_translations_version = version_class(Alias)
-        name_translations_list = db.session.query(name_translations_version) \
-            .filter(name_translations_version.transaction_id <= transaction_id) \
-            .filter(name_translations_version.operation_type != 2) \
-            .filter(name_translations_version.business_id == business_id) \
-            .filter(name_translations_version.type == 'TRANSLATION') \
-            .filter(or_(name_translations_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        name_translations_version.end_transaction_id > transaction_id)) \
-            .order_by(name_translations_version.transaction_id).all()
-        name_translations_arr = []
-        for name_translation in name_translations_list:
-            name_translation_json = VersionedBusinessDetailsService.name_translations_json(name_translation)
-            name_translations_arr.append(name_translation_json)
-        return name_translations_arr
+        return BusinessSnapshot(transaction_id, business_id, [BusinessSnapshot.NAME_TRANSLATIONS]) \
+            .name_translations_json()
 
     @staticmethod
     def get_name_translations_before_revision(transaction_id, business_id) -> dict:
@@ -396,29 +344,22 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     @staticmethod
     def get_resolution_dates_revision(transaction_id, business_id) -> dict:
         """Consolidates all resolutions upto the given transaction id."""
-        resolution_version = version_class(Resolution)
-        resolution_list = db.session.query(resolution_version) \
-            .filter(resolution_version.transaction_id <= transaction_id) \
-            .filter(resolution_version.operation_type != 2) \
-            .filter(resolution_version.business_id == business_id) \
-            .filter(resolution_version.resolution_type == 'SPECIAL') \
-            .filter(or_(resolution_version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
-                        resolution_version.end_transaction_id > transaction_id)) \
-            .order_by(resolution_version.transaction_id).all()
-        resolutions_arr = []
-        for resolution in resolution_list:
-            resolution_json = VersionedBusinessDetailsService.resolution_json(resolution)
-            resolutions_arr.append(resolution_json)
-        return resolutions_arr
-
-    @staticmethod
-    def party_role_revision_json(transaction_id, party_role_revision, is_ia_or_after) -> dict:
-        """Return the party member as a json object."""
+        return BusinessSnapshot(transaction_id, business_id, [BusinessSnapshot.RESOLUTIONS]).resolutions_json()
+
+    @staticmethod
+    def party_role_revision_json(transaction_id, party_role_revision, is_ia_or_after,
+                                 party_revision=None, addresses: dict = None) -> dict:
+        """Return the party member as a json object.
+
+        The party and address revisions are queried unless they are given (e.g. preloaded by a BusinessSnapshot).
+        """
         cessation_date = datetime.date(party_role_revision.cessation_date).isoformat()\
             if party_role_revision.cessation_date else None
-        party_revision = VersionedBusinessDetailsService.get_party_revision(transaction_id,
-                                                                            party_role_revision.party_id)
-        party = VersionedBusinessDetailsService.party_revision_json(transaction_id, party_revision, is_ia_or_after)
+        if party_revision is None:
+            party_revision = VersionedBusinessDetailsService.get_party_revision(transaction_id,
+                                                                                party_role_revision.party_id)
+        party = VersionedBusinessDetailsService.party_revision_json(transaction_id, party_revision, is_ia_or_after,
+                                                                    addresses)
 
         if is_ia_or_after:
             party['roles'] = [{
@@ -479,12 +420,19 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         return member
 
     @staticmethod
-    def party_revision_json(transaction_id, party_revision, is_ia_or_after) -> dict:
-        """Return the party member as a json object."""
+    def party_revision_json(transaction_id, party_revision, is_ia_or_after, addresses: dict = None) -> dict:
+        """Return the party member as a json object.
+
+        The address revisions are queried unless a dict of them by id is given.
+        """
+        def get_address_revision(address_id):
+            if addresses is not None:
+                return addresses.get(address_id)
+            return VersionedBusinessDetailsService.get_address_revision(transaction_id, address_id)
+
         member = VersionedBusinessDetailsService.party_revision_type_json(party_revision, is_ia_or_after)
         if party_revision.delivery_address_id:
-            address_revision = VersionedBusinessDetailsService.get_address_revision(
-                transaction_id, party_revision.delivery_address_id)
+            address_revision = get_address_revision(party_revision.delivery_address_id)
             # This condition can be removed once we correct data in address and address_version table
             # by removing empty address entry.
             if address_revision and address_revision.postal_code:
@@ -495,8 +443,7 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
         if party_revision.mailing_address_id:
             member_mailing_address = \
                 VersionedBusinessDetailsService.address_revision_json(
-                    VersionedBusinessDetailsService.get_address_revision
-                    (transaction_id, party_revision.mailing_address_id))
+                    get_address_revision(party_revision.mailing_address_id))
             if 'addressType' in member_mailing_address:
                 del member_mailing_address['addressType']
             member['mailingAddress'] = member_mailing_address
@@ -625,3 +572,148 @@ class VersionedBusinessDetailsService:  # pylint: disable=too-many-public-method
     def get_contact_point_revision(filing):
         """Return contact point from filing json."""
         return filing.json['filing']['incorporationApplication'].get('contactPoint', {})
+
+
+class BusinessSnapshot:  # pylint: disable=too-many-instance-attributes
+    """The versioned details of a business as of a transaction id.
+
+    Each version table is read with a single query, however many offices, parties or share classes the
+    business has: the office and party addresses are fetched together, as are the series of all share classes.
+    The json methods return the same shapes as the VersionedBusinessDetailsService revision methods.
+    """
+
+    OFFICES = 'offices'
+    PARTIES = 'parties'
+    SHARE_CLASSES = 'shareClasses'
+    NAME_TRANSLATIONS = 'nameTranslations'
+    RESOLUTIONS = 'resolutions'
+    ALL = [OFFICES, PARTIES, SHARE_CLASSES, NAME_TRANSLATIONS, RESOLUTIONS]
+
+    def __init__(self, transaction_id, business_id, parts: list = None):
+        """Load the given parts (all by default) of the business as of the transaction id."""
+        self.transaction_id = transaction_id
+        self.business_id = business_id
+        self._offices = None
+        self._office_addresses = {}
+        self._party_roles = None
+        self._parties = {}
+        self._addresses = {}
+        self._share_classes = None
+        self._share_series = {}
+        self._name_translations = None
+        self._resolutions = None
+        self.load(*(parts or BusinessSnapshot.ALL))
+
+    def _query(self, model, *criteria):
+        """Return the versions of the model current as of the transaction id, in transaction order."""
+        version = version_class(model)
+        return db.session.query(version) \
+            .filter(version.transaction_id <= self.transaction_id) \
+            .filter(version.operation_type != 2) \
+            .filter(or_(version.end_transaction_id == None,  # pylint: disable=singleton-comparison # noqa: E711,E501;
+                        version.end_transaction_id > self.transaction_id)) \
+            .filter(*criteria) \
+            .order_by(version.transaction_id).all()
+
+    def load(self, *parts):
+        """Load the parts that are not loaded yet."""
+        address_version = version_class(Address)
+        address_criteria = []
+
+        if BusinessSnapshot.OFFICES in parts and self._offices is None:
+            self._offices = self._query(Office, version_class(Office).business_id == self.business_id)
+            if office_ids := [office.id for office in self._offices]:
+                address_criteria.append(address_version.office_id.in_(office_ids))
+
+        if BusinessSnapshot.PARTIES in parts and self._party_roles is None:
+            self._party_roles = self._query(PartyRole, version_class(PartyRole).business_id == self.business_id)
+            if party_ids := {party_role.party_id for party_role in self._party_roles}:
+                parties = self._query(Party, version_class(Party).id.in_(party_ids))
+                self._parties = {party.id: party for party in parties}
+            if address_ids := {address_id for party in self._parties.values()
+                               for address_id in [party.delivery_address_id, party.mailing_address_id]
+                               if address_id}:
+                address_criteria.append(address_version.id.in_(address_ids))
+
+        if address_criteria:
+            office_ids = {office.id for office in self._offices or []}
+            for address in self._query(Address, or_(*address_criteria)):
+                self._addresses[address.id] = address
+                if address.office_id in office_ids:
+                    self._office_addresses.setdefault(address.office_id, []).append(address)
+
+        if BusinessSnapshot.SHARE_CLASSES in parts and self._share_classes is None:
+            self._share_classes = self._query(ShareClass, version_class(ShareClass).business_id == self.business_id)
+            if share_class_ids := [share_class.id for share_class in self._share_classes]:
+                share_series_version = version_class(ShareSeries)
+                for share_series in self._query(ShareSeries, share_series_version.share_class_id.in_(share_class_ids)):
+                    self._share_series.setdefault(share_series.share_class_id, []).append(share_series)
+
+        if BusinessSnapshot.NAME_TRANSLATIONS in parts and self._name_translations is None:
+            alias_version = version_class(Alias)
+            self._name_translations = self._query(Alias,
+                                                  alias_version.business_id == self.business_id,
+                                                  alias_version.type == 'TRANSLATION')
+
+        if BusinessSnapshot.RESOLUTIONS in parts and self._resolutions is None:
+            resolution_version = version_class(Resolution)
+            self._resolutions = self._query(Resolution,
+                                            resolution_version.business_id == self.business_id,
+                                            resolution_version.resolution_type == 'SPECIAL')
+        return self
+
+    def offices_json(self) -> dict:
+        """Return the offices, with their addresses, keyed by office type."""
+        self.load(BusinessSnapshot.OFFICES)
+        offices_json = {}
+        for office in self._offices:
+            offices_json[office.office_type] = {}
+            for address in self._office_addresses.get(office.id, []):
+                offices_json[office.office_type][f'{address.address_type}Address'] = \
+                    VersionedBusinessDetailsService.address_revision_json(address)
+        return offices_json
+
+    def parties_json(self, is_ia_or_after=False, role=None) -> list:
+        """Return the parties with active roles, optionally only those of the given role."""
+        self.load(BusinessSnapshot.PARTIES)
+        parties = []
+        for party_role in self._party_roles:
+            if role is not None and party_role.role != role:
+                continue
+            if party_role.cessation_date is None:
+                party_role_json = VersionedBusinessDetailsService.party_role_revision_json(
+                    self.transaction_id, party_role, is_ia_or_after,
+                    self._parties.get(party_role.party_id), self._addresses)
+                if 'roles' in party_role_json and (party := next((x for x in parties if x['officer']['id']
+                                                                  == party_role_json['officer']['id']), None)):
+                    party['roles'].extend(party_role_json['roles'])
+                else:
+                    parties.append(party_role_json)
+        return parties
+
+    def share_classes_json(self) -> list:
+        """Return the share classes, with their series."""
+        self.load(BusinessSnapshot.SHARE_CLASSES)
+        share_classes = []
+        for share_class in self._share_classes:
+            share_class_json = VersionedBusinessDetailsService.share_class_revision_json(share_class)
+            share_class_json['series'] = []
+            for share_series in self._share_series.get(share_class.id, []):
+                share_series_json = VersionedBusinessDetailsService.share_series_revision_json(share_series)
+                share_series_json['type'] = 'Series'
+                share_series_json['id'] = str(share_series_json['id'])
+                share_class_json['series'].append(share_series_json)
+            share_class_json['type'] = 'Class'
+            share_class_json['id'] = str(share_class_json['id'])
+            share_classes.append(share_class_json)
+        return share_classes
+
+    def name_translations_json(self) -> list:
+        """Return the name translations."""
+        self.load(BusinessSnapshot.NAME_TRANSLATIONS)
+        return [VersionedBusinessDetailsService.name_translations_json(x) for x in self._name_translations]
+
+    def resolutions_json(self) -> list:
+        """Return the special resolutions."""
+        self.load(BusinessSnapshot.RESOLUTIONS)
+        return [VersionedBusinessDetailsService.resolution_json(x) for x in self._resolutions]
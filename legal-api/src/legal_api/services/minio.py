@@ -12,16 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This module is a wrapper for Minio."""
+import calendar
+import os
+import threading
 import uuid
 from datetime import timedelta
+from http import HTTPStatus
+from typing import Dict, Tuple
 
-from flask import current_app
+import certifi
+import urllib3
+from flask import current_app, request
 from minio import Minio
+from werkzeug.http import http_date
 
 
 class MinioService:
     """Document Storage class."""
 
+    _clients: Dict[Tuple, Minio] = {}
+    _clients_lock = threading.Lock()
+
     @staticmethod
     def create_signed_put_url(file_name: str) -> dict:
         """Return a pre-signed URL for new doc upload."""
@@ -54,9 +65,9 @@ class MinioService:
         return minio_client.stat_object(bucket, key)
 
     @staticmethod
-    def get_file(key: str):
+    def get_file(key: str, offset: int = 0, length: int = 0):
         """
-        Fetch file from Minio.
+        Fetch file from Minio, or length bytes of it from offset.
 
         Example::
             try:
@@ -68,7 +79,65 @@ class MinioService:
         """
         minio_client: Minio = MinioService._get_client()
         bucket = current_app.config['MINIO_BUCKET_BUSINESSES']
-        return minio_client.get_object(bucket, key)
+        return minio_client.get_object(bucket, key, offset=offset, length=length)
+
+    @staticmethod
+    def get_file_response(key: str, mimetype: str = 'application/pdf'):
+        """Return a response streaming the file to the client of the current request.
+
+        A request with an If-None-Match matching the file gets a 304 without the file being read, and a request
+        for a single byte Range gets just that part of the file. The file is read a chunk at a time, and the
+        connection goes back to the pool when the response is closed.
+        """
+        minio_client: Minio = MinioService._get_client()
+        bucket = current_app.config['MINIO_BUCKET_BUSINESSES']
+        file_info = minio_client.stat_object(bucket, key)
+        headers = {'ETag': f'"{file_info.etag}"', 'Accept-Ranges': 'bytes'}
+        if file_info.last_modified:
+            headers['Last-Modified'] = http_date(file_info.last_modified)
+
+        if request.if_none_match.contains_weak(file_info.etag):
+            return current_app.response_class(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        start, stop, status = 0, file_info.size, HTTPStatus.OK
+        if MinioService._is_range_requested(file_info):
+            if not (byte_range := request.range.range_for_length(file_info.size)):
+                headers['Content-Range'] = f'bytes */{file_info.size}'
+                return current_app.response_class(status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                                                  headers=headers)
+            start, stop = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+            headers['Content-Range'] = f'bytes {start}-{stop - 1}/{file_info.size}'
+        headers['Content-Length'] = str(stop - start)
+        if stop == start:
+            return current_app.response_class(status=status, headers=headers, mimetype=mimetype)
+
+        chunk_size = current_app.config.get('MINIO_STREAM_CHUNK_SIZE', 64 * 1024)
+        # If-Match makes sure the body read is the version of the file the headers describe
+        file = minio_client.get_object(bucket, key, offset=start, length=stop - start,
+                                       request_headers={'If-Match': f'"{file_info.etag}"'})
+
+        def release():
+            file.close()
+            file.release_conn()
+
+        def stream():
+            try:
+                yield from file.stream(chunk_size)
+            finally:
+                release()
+
+        response = current_app.response_class(stream(), status=status, headers=headers, mimetype=mimetype,
+                                              direct_passthrough=True)
+        response.call_on_close(release)  # the stream may be closed before it is started
+        return response
+
+    @staticmethod
+    def list_files(prefix: str) -> list:
+        """Return the keys of the files starting with prefix."""
+        minio_client: Minio = MinioService._get_client()
+        bucket = current_app.config['MINIO_BUCKET_BUSINESSES']
+        return [obj.object_name for obj in minio_client.list_objects(bucket, prefix=prefix, recursive=True)]
 
     @staticmethod
     def delete_file(key: str):
@@ -79,12 +148,42 @@ class MinioService:
 
     @staticmethod
     def _get_client() -> Minio:
-        """Return a minio client."""
+        """Return the minio client, shared by the threads of the process so they share its connection pool."""
         minio_endpoint = current_app.config['MINIO_ENDPOINT']
         minio_key = current_app.config['MINIO_ACCESS_KEY']
         minio_secret = current_app.config['MINIO_ACCESS_SECRET']
         minio_secure = current_app.config['MINIO_SECURE']
-        return Minio(minio_endpoint, access_key=minio_key, secret_key=minio_secret, secure=minio_secure)
+        client_key = (minio_endpoint, minio_key, minio_secret, minio_secure)
+        if client := MinioService._clients.get(client_key):
+            return client
+
+        with MinioService._clients_lock:
+            if not (client := MinioService._clients.get(client_key)):
+                timeout = timedelta(minutes=5).seconds
+                http_client = urllib3.PoolManager(
+                    timeout=urllib3.util.Timeout(connect=timeout, read=timeout),
+                    maxsize=current_app.config.get('MINIO_POOL_SIZE', 10),
+                    cert_reqs='CERT_REQUIRED',
+                    ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+                    retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+                )
+                client = Minio(minio_endpoint, access_key=minio_key, secret_key=minio_secret, secure=minio_secure,
+                               http_client=http_client)
+                MinioService._clients[client_key] = client
+        return client
+
+    @staticmethod
+    def _is_range_requested(file_info) -> bool:
+        """Return if the request is for a single byte range of the current version of the file."""
+        if not request.range or request.range.units != 'bytes' or len(request.range.ranges) != 1:
+            return False
+        if_range = request.if_range
+        if if_range.etag:
+            return if_range.etag == file_info.etag
+        if if_range.date:
+            return bool(file_info.last_modified) and \
+                calendar.timegm(file_info.last_modified.utctimetuple()) == calendar.timegm(if_range.date.utctimetuple())
+        return True
 
     @staticmethod
     def put_file(key: str, data: str, length: str):
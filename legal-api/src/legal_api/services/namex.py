@@ -13,15 +13,20 @@
 # limitations under the License.
 
 """This provides the service for namex-api calls."""
+import threading
+import time
 from datetime import datetime
 from enum import Enum
+from http import HTTPStatus
 
 import datedelta
 import pytz
 import requests
-from flask import current_app
+from flask import current_app, g, has_app_context
+from requests.adapters import HTTPAdapter
 
 from ..models import Filing
+from .service_account_token import service_account_tokens
 from .utils import get_str
 
 
@@ -47,55 +52,80 @@ class NameXService():
         REJECTED = 'REJECTED'
         NRO_UPDATING = 'NRO_UPDATING'
 
+    _session: requests.Session = None
+    _session_lock = threading.Lock()
+
     @staticmethod
-    def query_nr_number(identifier: str):
-        """Return a JSON object with name request information."""
-        auth_url = current_app.config.get('NAMEX_AUTH_SVC_URL')
-        username = current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME')
-        secret = current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET')
-        namex_url = current_app.config.get('NAMEX_SVC_URL')
+    def _get_session() -> requests.Session:
+        """Return the process wide namex-api session, so connections are pooled and reused."""
+        if NameXService._session is None:
+            with NameXService._session_lock:
+                if NameXService._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    NameXService._session = session
+        return NameXService._session
+
+    @staticmethod
+    def _get_token():
+        """Return the namex-api token (namex is in a different keycloak realm), cached until shortly before expiry."""
+        return service_account_tokens.get_token(current_app.config.get('NAMEX_AUTH_SVC_URL'),
+                                                current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME'),
+                                                current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET'),
+                                                current_app.config.get('NAMEX_SVC_TIMEOUT', 20))
+
+    @staticmethod
+    def _get_nr_memo() -> dict:
+        """Return the NR responses memoized for the current app context (a request, or a unit of queue work)."""
+        if not has_app_context():
+            return {}
+        if 'namex_nr_responses' not in g:
+            g.namex_nr_responses = {}
+        return g.namex_nr_responses
 
-        # Get access token for namex-api in a different keycloak realm
-        auth = requests.post(auth_url, auth=(username, secret), headers={
-            'Content-Type': 'application/x-www-form-urlencoded'}, data={'grant_type': 'client_credentials'})
+    @staticmethod
+    def query_nr_number(identifier: str):
+        """Return a JSON object with name request information.
 
-        # Return the auth response if an error occurs
-        if auth.status_code != 200:
-            return auth.json()
+        Successful responses are memoized for the current app context, for at most NAMEX_NR_CACHE_TIMEOUT
+        seconds, so the validations and processing of a single filing share one NR fetch.
+        """
+        nr_memo = NameXService._get_nr_memo()
+        if (memoized := nr_memo.get(identifier)) and memoized[1] > time.monotonic():
+            return memoized[0]
 
-        token = dict(auth.json())['access_token']
+        if not (token := NameXService._get_token()):
+            return {'error': 'Unable to get a token for namex-api.'}
 
         # Perform proxy call using the inputted identifier (e.g. NR 1234567)
-        nr_response = requests.get(namex_url + 'requests/' + identifier, headers={
+        namex_url = current_app.config.get('NAMEX_SVC_URL')
+        nr_response = NameXService._get_session().get(namex_url + 'requests/' + identifier, headers={
             'Content-Type': 'application/json',
             'Authorization': 'Bearer ' + token
-        })
+        }, timeout=current_app.config.get('NAMEX_SVC_TIMEOUT', 20))
 
+        if nr_response.status_code == HTTPStatus.OK:
+            nr_memo[identifier] = (nr_response,
+                                   time.monotonic() + current_app.config.get('NAMEX_NR_CACHE_TIMEOUT', 10))
         return nr_response
 
     @staticmethod
     def update_nr(nr_json):
         """Update name request with nr_json."""
-        auth_url = current_app.config.get('NAMEX_AUTH_SVC_URL')
-        username = current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME')
-        secret = current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET')
-        namex_url = current_app.config.get('NAMEX_SVC_URL')
+        if not (token := NameXService._get_token()):
+            return {'error': 'Unable to get a token for namex-api.'}
 
-        # Get access token for namex-api in a different keycloak realm
-        auth = requests.post(auth_url, auth=(username, secret), headers={
-            'Content-Type': 'application/x-www-form-urlencoded'}, data={'grant_type': 'client_credentials'})
-
-        # Return the auth response if an error occurs
-        if auth.status_code != 200:
-            return auth.json()
-
-        token = dict(auth.json())['access_token']
+        # the memoized response no longer reflects the name request
+        NameXService._get_nr_memo().pop(nr_json['nrNum'], None)
 
         # Perform update proxy call using nr number (e.g. NR 1234567)
-        nr_response = requests.put(namex_url + 'requests/' + nr_json['nrNum'], headers={
+        namex_url = current_app.config.get('NAMEX_SVC_URL')
+        nr_response = NameXService._get_session().put(namex_url + 'requests/' + nr_json['nrNum'], headers={
             'Content-Type': 'application/json',
             'Authorization': 'Bearer ' + token
-        }, json=nr_json)
+        }, json=nr_json, timeout=current_app.config.get('NAMEX_SVC_TIMEOUT', 20))
 
         return nr_response
 
@@ -14,9 +14,10 @@
 """This module is a wrapper for Pdf Services."""
 
 import io
-from dataclasses import dataclass
+import threading
+from dataclasses import astuple, dataclass
 from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 
 import PyPDF2
 from flask import current_app
@@ -42,37 +43,61 @@ class RegistrarStampData:
 class PdfService:
     """Pdf Services."""
 
+    _fonts_lock = threading.Lock()
+    _fonts_registered = False
+    _stamps: Dict[Tuple, bytes] = {}
+    _stamps_lock = threading.Lock()
+
     def __init__(self):
         """Create a PDF Service Instance."""
-        fonts_path = current_app.config.get('FONTS_PATH')
-        bcsans_path = f'{fonts_path}/BCSans-Regular.ttf'
-        pdfmetrics.registerFont(TTFont('BCSans', bcsans_path))
+        PdfService._register_fonts()
 
     @staticmethod
-    def stamp_pdf(input_pdf, watermark, only_first_page=True):
-        """Merge two PDFs."""
-        watermark_obj = PyPDF2.PdfFileReader(watermark)
-        watermark_page = watermark_obj.getPage(0)
-
-        pdf_reader = PyPDF2.PdfFileReader(input_pdf)
-        pdf_writer = PyPDF2.PdfFileWriter()
-
-        for page_num in range(pdf_reader.getNumPages()):
-            page = pdf_reader.getPage(page_num)
-
-            if (only_first_page and page_num == 0) or not only_first_page:
-                page.mergePage(watermark_page)
-
-            pdf_writer.addPage(page)
-
-        output = io.BytesIO()
-        pdf_writer.write(output)
-        output.seek(0)
-        return output
+    def stamp_pdf(input_pdf, watermark, only_first_page=True, output: Optional[BinaryIO] = None):
+        """Merge two PDFs.
+
+        The first page of watermark is merged into the first page of input_pdf, or all of them, and the result is
+        written to output, a new BytesIO by default.
+        """
+        watermark_page = PyPDF2.PdfFileReader(watermark).getPage(0)
+        return PdfService._merge_pages(input_pdf, watermark_page, only_first_page, output)
+
+    def certify_pdfs(self,
+                     documents: Iterable[Tuple[Union[bytes, BinaryIO], RegistrarStampData]],
+                     only_first_page=True) -> List[io.BytesIO]:
+        """Stamp each document with the registrar's stamp for its stamp data.
+
+        Each stamp is rendered and parsed once for the batch, however many documents it goes on.
+        """
+        stamp_pages = {}
+        certified_copies = []
+        for input_pdf, data in documents:
+            key = astuple(data)
+            if key not in stamp_pages:
+                stamp_pages[key] = PyPDF2.PdfFileReader(self.create_registrars_stamp(data)).getPage(0)
+            if isinstance(input_pdf, bytes):
+                input_pdf = io.BytesIO(input_pdf)
+            certified_copies.append(PdfService._merge_pages(input_pdf, stamp_pages[key], only_first_page))
+        return certified_copies
 
     @classmethod
     def create_registrars_stamp(cls, data: RegistrarStampData):
-        """Create a Registrar's stamp to certify documents."""
+        """Create a Registrar's stamp to certify documents.
+
+        The stamps are kept for the stamp data, so stamping the documents of a filing renders its stamp once.
+        """
+        key = (current_app.config.get('REPORT_TEMPLATE_PATH'),) + astuple(data)
+        if (stamp := cls._stamps.get(key)) is None:
+            stamp = cls._render_registrars_stamp(data)
+            with cls._stamps_lock:
+                cls._stamps[key] = stamp
+                while len(cls._stamps) > current_app.config.get('PDF_STAMP_CACHE_SIZE', 32):
+                    cls._stamps.pop(next(iter(cls._stamps)))
+        return io.BytesIO(stamp)
+
+    @staticmethod
+    def _render_registrars_stamp(data: RegistrarStampData) -> bytes:
+        """Render the Registrar's stamp as a single page pdf."""
         registrar_info = RegistrarInfo.get_registrar_info(data.certify_date)
         buffer = io.BytesIO()
         can = canvas.Canvas(buffer, pagesize=letter)
@@ -108,8 +133,38 @@ class PdfService:
 
         can.showPage()
         can.save()
-        buffer.seek(0)
-        return buffer
+        return buffer.getvalue()
+
+    @staticmethod
+    def _merge_pages(input_pdf, stamp_page, only_first_page: bool, output: Optional[BinaryIO] = None):
+        """Merge the stamp page into the first page of input_pdf, or all of them, writing the result to output."""
+        pdf_reader = PyPDF2.PdfFileReader(input_pdf)
+        pdf_writer = PyPDF2.PdfFileWriter()
+
+        for page_num in range(pdf_reader.getNumPages()):
+            page = pdf_reader.getPage(page_num)
+
+            if (only_first_page and page_num == 0) or not only_first_page:
+                page.mergePage(stamp_page)
+
+            pdf_writer.addPage(page)
+
+        output = output or io.BytesIO()
+        pdf_writer.write(output)
+        output.seek(0)
+        return output
+
+    @classmethod
+    def _register_fonts(cls):
+        """Register the fonts used by the stamps, once per process."""
+        if cls._fonts_registered:
+            return
+        with cls._fonts_lock:
+            if not cls._fonts_registered:
+                fonts_path = current_app.config.get('FONTS_PATH')
+                bcsans_path = f'{fonts_path}/BCSans-Regular.ttf'
+                pdfmetrics.registerFont(TTFont('BCSans', bcsans_path))
+                cls._fonts_registered = True
 
 
 def _write_text(can, text, line_height, x_margin, y_margin):
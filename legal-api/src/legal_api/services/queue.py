@@ -12,12 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""This provides the service to publish to the queue."""
+"""This provides the service to publish to the queue.
+
+Publishes from Flask (publish_json) are made by a QueuePublisher: a dedicated thread that owns an event loop
+and a long lived NATS / STAN connection. Request threads only hand messages over and wait on (or ignore) the
+future of the publish, they never drive the event loop. Jobs running their own loop keep using the async
+methods, with connections held on their app context.
+"""
 import asyncio
+import concurrent.futures
 import json
 import logging
+import os
 import random
 import string
+import threading
+from typing import Optional
 
 import nest_asyncio  # noqa: I001
 from flask import _app_ctx_stack
@@ -25,6 +35,124 @@ from nats.aio.client import Client as NATS, DEFAULT_CONNECT_TIMEOUT  # noqa N814
 from stan.aio.client import Client as STAN  # noqa N814; by convention the name is STAN
 
 
+class QueuePublisher:  # pylint: disable=too-many-instance-attributes
+    """Publish to NATS streaming from a thread that owns the event loop and the connection.
+
+    Messages waiting when the publisher picks up work are published together, up to batch_size at a time,
+    with their acks awaited concurrently.
+    """
+
+    def __init__(self, nats_options: dict, stan_options: dict, batch_size: int = 20, logger=None):
+        """Create the publisher, its thread is started by the first publish."""
+        self.nats_options = nats_options
+        self.stan_options = stan_options
+        self.batch_size = batch_size
+        self.logger = logger or logging.getLogger()
+        self.nats = None
+        self.stan = None
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def publish(self, subject: str, payload: bytes) -> concurrent.futures.Future:
+        """Queue the payload for publishing, returning the future of its ack."""
+        self._ensure_started()
+        future = concurrent.futures.Future()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (subject, payload, future))
+        return future
+
+    def stop(self, timeout: Optional[float] = None):
+        """Close the connection and stop the thread, after the queued messages have been published."""
+        with self._lock:
+            if not (self._thread and self._thread.is_alive()):
+                return
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _ensure_started(self):
+        """Start the thread, or restart it in a forked process, which does not inherit it."""
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.nats = None
+            self.stan = None
+            self._loop = asyncio.new_event_loop()
+            started = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(started,), name='queue-publisher', daemon=True)
+            self._thread.start()
+            started.wait()
+
+    def _run(self, started: threading.Event):
+        """Run the publishing loop on the publisher thread."""
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        started.set()
+        try:
+            self._loop.run_until_complete(self._publish_batches())
+        finally:
+            self._loop.close()
+
+    async def _publish_batches(self):
+        """Publish the queued messages in batches, until stopped."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            stopping = None in batch
+            batch = [message for message in batch if message]
+            if batch:
+                try:
+                    await self._connect()
+                    results = await asyncio.gather(*[self.stan.publish(subject=subject, payload=payload)
+                                                     for subject, payload, _ in batch],
+                                                   return_exceptions=True)
+                except Exception as err:  # pylint: disable=broad-except; handed to the callers via the futures
+                    results = [err] * len(batch)
+
+                for (_, _, future), result in zip(batch, results):
+                    if future.cancelled():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+            if stopping:
+                await self._close()
+                return
+
+    async def _connect(self):
+        """Connect, or reconnect once the connection has been lost."""
+        if self.nats and self.nats.is_connected:
+            return
+        await self._close()
+
+        self.nats = NATS()
+        self.stan = STAN()
+        await self.nats.connect(**{**self.nats_options, 'io_loop': self._loop})
+        # a client id of its own, as the processes forked from the app share the configured one
+        await self.stan.connect(**{**self.stan_options,
+                                   'client_id': f'{self.stan_options["client_id"]}_{os.getpid()}_publisher',
+                                   'nats': self.nats})
+
+    async def _close(self):
+        """Close the connection, if there is one."""
+        try:
+            if self.nats and self.nats.is_connected:
+                await self.stan.close()
+                await self.nats.close()
+        except Exception as err:  # pylint: disable=broad-except; a new connection is made regardless
+            self.logger.warning('Error closing the publisher connection: %s', err)
+        finally:
+            self.nats = None
+            self.stan = None
+
+
 class QueueService():
     """Provides services to use the Queue from Flask.
 
@@ -40,6 +168,8 @@ class QueueService():
         self.loop = loop
         self.nats_servers = None
         self.subject = None
+        self.publish_timeout = 10
+        self.publisher = None
 
         self.logger = logging.getLogger()
 
@@ -90,10 +220,18 @@ class QueueService():
 
         self.stan_options = {**default_stan_options, **stan_options}
 
+        self.publish_timeout = app.config.get('NATS_PUBLISH_TIMEOUT', 10)
+        self.publisher = QueuePublisher(self.nats_options,
+                                        self.stan_options,
+                                        app.config.get('NATS_PUBLISH_BATCH_SIZE', 20),
+                                        self.logger)
+
         app.teardown_appcontext(self.teardown)
 
     def teardown(self, exception):  # pylint: disable=unused-argument; flask method signature
         """Destroy all objects created by this extension."""
+        if not self.nats:
+            return  # nothing was connected on this app context, publish_json uses the publisher's connection
         try:
             this_loop = self.loop or asyncio.get_event_loop()
             this_loop.run_until_complete(self.close())
@@ -119,15 +257,28 @@ class QueueService():
             await self.stan.close()
             await self.nats.close()
 
-    def publish_json(self, payload=None, subject=None):
-        """Publish the json payload to the Queue Service."""
+    def publish_json(self, payload=None, subject=None, wait_for_ack: bool = True, timeout: float = None):
+        """Publish the json payload to the Queue Service.
+
+        By default this waits for the ack, raising any error. With wait_for_ack=False the future of the publish
+        is returned as soon as the payload is queued, and errors are only logged.
+        """
         try:
             subject = subject or self.subject
-            self.loop.run_until_complete(self.async_publish_json(payload, subject))
+            future = self.publisher.publish(subject, json.dumps(payload).encode('utf-8'))
+            if not wait_for_ack:
+                future.add_done_callback(self._log_publish_error)
+                return future
+            return future.result(timeout=timeout or self.publish_timeout)
         except Exception as err:
             self.logger.error('Error: %s', err)
             raise err
 
+    def _log_publish_error(self, future: concurrent.futures.Future):
+        """Log the error of a publish nobody waited for."""
+        if not future.cancelled() and (err := future.exception()):
+            self.logger.error('Error publishing to the queue: %s', err)
+
     async def publish_json_to_subject(self, payload=None, subject=None):
         """Publish the json payload to the specified subject."""
         try:
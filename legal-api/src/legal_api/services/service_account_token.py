@@ -0,0 +1,100 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process wide cache of service account (client credentials) tokens.
+
+Tokens are cached by (token url, client id) and refreshed ahead of their expiry. Concurrent refreshes of the
+same token are coalesced into a single request: the first caller refreshes while the others wait on the lock
+and then pick up the new token. The queue services call this synchronously from their event loop, so the
+thread lock covers both threaded and asyncio callers.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from flask import current_app
+
+
+class ServiceAccountTokenCache:
+    """Cache of client credentials tokens keyed by (token url, client id)."""
+
+    def __init__(self, refresh_margin: int = 30):
+        """Create the cache, refreshing tokens refresh_margin seconds before they expire."""
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[Tuple[str, str], Tuple[str, float, float]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def get_token(self, token_url: str, client_id: str, client_secret: str, timeout: int = None) -> Optional[str]:
+        """Return a valid token for the client, requesting a new one only when the cached one is due to refresh."""
+        key = (token_url, client_id)
+        if token := self._cached_token(key):
+            return token
+
+        with self._get_lock(key):
+            # another caller may have refreshed the token while this one waited for the lock
+            if token := self._cached_token(key):
+                return token
+
+            token, expires_in = self._request_token(token_url, client_id, client_secret, timeout)
+            if token and expires_in:
+                now = time.monotonic()
+                refresh_margin = min(self.refresh_margin, expires_in / 2)
+                self._tokens[key] = (token, now + expires_in - refresh_margin, now + expires_in)
+                return token
+
+            # the refresh failed, keep using the cached token until it actually expires
+            return token or self._cached_token(key, refresh_ahead=False)
+
+    def invalidate(self, token_url: str, client_id: str):
+        """Drop the cached token, e.g. after it has been rejected."""
+        self._tokens.pop((token_url, client_id), None)
+
+    def clear(self):
+        """Drop all of the cached tokens."""
+        self._tokens.clear()
+
+    def _cached_token(self, key: Tuple[str, str], refresh_ahead: bool = True) -> Optional[str]:
+        """Return the cached token if it is not yet due for refresh (or, if not refresh_ahead, not expired)."""
+        if not (cached := self._tokens.get(key)):
+            return None
+
+        token, refresh_at, expires_at = cached
+        if time.monotonic() < (refresh_at if refresh_ahead else expires_at):
+            return token
+        return None
+
+    def _get_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        """Return the lock that serializes refreshes of the given token."""
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _request_token(token_url: str, client_id: str, client_secret: str, timeout: int = None):
+        """Return the (access token, expires in seconds) of a client credentials grant."""
+        try:
+            res = requests.post(url=token_url,
+                                data='grant_type=client_credentials',
+                                headers={'content-type': 'application/x-www-form-urlencoded'},
+                                auth=(client_id, client_secret),
+                                timeout=timeout)
+            token_json = res.json()
+            return token_json.get('access_token'), token_json.get('expires_in')
+        except Exception:  # pylint: disable=broad-except
+            current_app.logger.error(f'Failed to get a service account token for {client_id}')
+            return None, None
+
+
+service_account_tokens = ServiceAccountTokenCache()  # pylint: disable=invalid-name; shared process wide
@@ -0,0 +1,112 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark certifying coop rules and memorandum pdfs with the registrar's stamp.
+
+Compares the way the filer certified a document before the stamping pipeline (copy the pdf through PyPDF2,
+register the font, render the stamp and stamp the copy, for each document) with PdfService.certify_pdfs.
+
+Run from legal-api, with the requirements installed:
+
+    python tests/performance/pdf_stamping_benchmark.py --pages 300 --documents 2 --rounds 5
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+
+import PyPDF2
+from flask import Flask, current_app
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from legal_api.services.pdf_service import PdfService, RegistrarStampData
+from legal_api.utils.legislation_datetime import LegislationDatetime
+
+
+LEGAL_API_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def create_document(pages: int) -> bytes:
+    """Return a text heavy pdf of pages pages, like the rules of a coop."""
+    buffer = io.BytesIO()
+    can = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        can.setFont('Helvetica', 9)
+        for line in range(60):
+            can.drawString(54, letter[1] - 54 - line * 11,
+                           f'{page + 1}.{line + 1} The members of the association may, by special resolution, ...')
+        can.showPage()
+    can.save()
+    return buffer.getvalue()
+
+
+def certify_previous(documents, data: RegistrarStampData):
+    """Certify each document the way the filer did before the stamping pipeline."""
+    certified_copies = []
+    for document in documents:
+        pdf_writer = PyPDF2.PdfFileWriter()
+        pdf_writer.appendPagesFromReader(PyPDF2.PdfFileReader(io.BytesIO(document)))
+        copy = io.BytesIO()
+        pdf_writer.write(copy)
+        copy.seek(0)
+        pdfmetrics.registerFont(TTFont('BCSans', f"{current_app.config['FONTS_PATH']}/BCSans-Regular.ttf"))
+        stamp = io.BytesIO(PdfService._render_registrars_stamp(data))  # pylint: disable=protected-access
+        certified_copies.append(PdfService.stamp_pdf(copy, stamp, only_first_page=True))
+    return certified_copies
+
+
+def certify_current(documents, data: RegistrarStampData):
+    """Certify the documents in one batch."""
+    return PdfService().certify_pdfs([(document, data) for document in documents], only_first_page=True)
+
+
+def run(pages: int, document_count: int, rounds: int):
+    """Time both ways of certifying the documents and print the cpu time of each."""
+    documents = [create_document(pages) for _ in range(document_count)]
+    print(f'{document_count} documents of {pages} pages, {sum(len(d) for d in documents) / 1024:.0f} KiB')
+
+    for name, certify in (('previous', certify_previous), ('current', certify_current)):
+        timings = []
+        for round_number in range(rounds):
+            # a new filing each round, so a new stamp
+            data = RegistrarStampData(LegislationDatetime.now(), f'CP{round_number:07}', 'rules.pdf')
+            start = time.process_time()
+            certified_copies = certify(documents, data)
+            timings.append(time.process_time() - start)
+        assert all(PyPDF2.PdfFileReader(c).getNumPages() == pages for c in certified_copies)
+        print(f'{name:>8}: median {statistics.median(timings):.3f}s cpu, min {min(timings):.3f}s '
+              f'over {rounds} rounds')
+
+
+def main():
+    """Parse the arguments and run the benchmark in an app context."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=300, help='pages in each document')
+    parser.add_argument('--documents', type=int, default=2, help='documents certified per filing')
+    parser.add_argument('--rounds', type=int, default=5, help='filings certified')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config['FONTS_PATH'] = os.path.join(LEGAL_API_PATH, 'fonts')
+    app.config['REPORT_TEMPLATE_PATH'] = os.path.join(LEGAL_API_PATH, 'report-templates')
+    app.config['LEGISLATIVE_TIMEZONE'] = 'America/Vancouver'
+    with app.app_context():
+        run(args.pages, args.documents, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,10 +14,12 @@
 
 """Tests to assure the Filing Domain is working as expected."""
 import copy
+from contextlib import contextmanager
 
 import datedelta
 import pytest
 from registry_schemas.example_data import FILING_TEMPLATE
+from sqlalchemy import event
 
 from legal_api.core import Filing as CoreFiling
 from legal_api.models import Business, Comment, Filing, UserRoles
@@ -85,6 +87,55 @@ def test_simple_ledger_search(session):
     # assert alteration['filingLink']
 
 
+@contextmanager
+def count_queries(connection):
+    """Collect the statements executed on the connection."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(connection, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_ledger_query_count(session):
+    """Assert that the number of queries to build the ledger doesn't grow with the ledger size."""
+    identifier = 'BC1234567'
+    founding_date = datetime.utcnow() - datedelta.datedelta(months=len(Filing.FILINGS.keys()))
+    business = factory_business(identifier=identifier, founding_date=founding_date, last_ar_date=None,
+                                entity_type=Business.LegalTypes.BCOMP.value)
+    user = factory_user('idir/staff-person')
+
+    def add_filings(count: int, offset: int):
+        for i in range(count):
+            filing = copy.deepcopy(FILING_TEMPLATE)
+            filing['filing']['header']['name'] = 'changeOfAddress'
+            f = factory_completed_filing(business, filing,
+                                         filing_date=founding_date + datedelta.datedelta(days=offset + i))
+            f.submitter_id = user.id
+            comment = Comment()
+            comment.comment = f'comment {i}'
+            f.comments.append(comment)
+            f.save()
+
+    add_filings(2, 0)
+    with count_queries(session.get_bind()) as small_ledger_statements:
+        small_ledger = CoreFiling.ledger(business.id)
+
+    add_filings(10, 2)
+    with count_queries(session.get_bind()) as large_ledger_statements:
+        large_ledger = CoreFiling.ledger(business.id)
+
+    assert len(small_ledger) == 2
+    assert len(large_ledger) == 12
+    assert all(f['commentsCount'] == 1 for f in large_ledger)
+    assert len(large_ledger_statements) == len(small_ledger_statements)
+
+
 def test_common_ledger_items(session):
     """Assert that common ledger items works as expected."""
     identifier = 'BC1234567'
@@ -27,7 +27,7 @@ from sqlalchemy_continuum import versioning_manager
 from registry_schemas.example_data import FILING_HEADER, RESTORATION, TRANSITION_FILING_TEMPLATE
 
 from legal_api.exceptions import BusinessException
-from legal_api.models import AmalgamatingBusiness, Amalgamation, Batch, BatchProcessing, Business, Filing, Party, PartyRole, db
+from legal_api.models import Alias, AmalgamatingBusiness, Amalgamation, Batch, BatchProcessing, Business, BusinessProjection, Filing, Party, PartyRole, db
 from legal_api.services import flags
 from legal_api.utils.legislation_datetime import LegislationDatetime
 from tests import EPOCH_DATETIME, TIMEZONE_OFFSET
@@ -619,11 +619,45 @@ def test_business_alternate_names(session, test_name, businesses_info, alternate
 
         with patch.object(flags, 'is_on', return_value=True):
             business_json = business.json()
+            projected_business_json = business.json(projection=BusinessProjection.load(business))
         assert 'alternateNames' in business_json
         assert business_json['alternateNames'] == expected_alternate_names
+        assert projected_business_json == business_json
         session.rollback()
 
 
+def test_business_alternate_names_aliases(session):
+    """Assert that the projection gives the same alternate names as the business, for a business with aliases."""
+    business = factory_business()
+    business.save()
+    translation = Alias(alias='ABC Ltee', type=Alias.AliasType.TRANSLATION.value, business_id=business.id)
+    renamed_date = datetime(2024, 1, 2, 20, tzinfo=EPOCH_DATETIME.tzinfo)
+
+    # the translation is added by one filing and renamed by another, leaving an ended version behind
+    for alias, effective_date in [('ABC Ltee', EPOCH_DATETIME), ('ABC Ltée', renamed_date)]:
+        filing = Filing()
+        filing._filing_type = 'changeOfName'
+        filing.save()
+
+        uow = versioning_manager.unit_of_work(db.session)
+        transaction = uow.create_transaction(db.session)
+        translation.alias = alias
+        db.session.add(translation)
+        db.session.commit()
+
+        filing.transaction_id = transaction.id
+        filing.business_id = business.id
+        filing.effective_date = effective_date
+        filing.save()
+
+    with patch.object(flags, 'is_on', return_value=True):
+        business_json = business.json()
+        projected_business_json = business.json(projection=BusinessProjection.load(business))
+
+    assert projected_business_json['alternateNames'] == business_json['alternateNames']
+    assert projected_business_json == business_json
+
+
 def test_business_relationships_json(session):
     """Assert that the business model is saved correctly."""
     from legal_api.models import Address, Office
@@ -747,6 +781,7 @@ def test_amalgamated_into_business_json(session, test_name, existing_business_st
         filing.save()
 
     business_json = existing_business.json()
+    assert existing_business.json(projection=BusinessProjection.load(existing_business)) == business_json
 
     if test_name == 'EXIST':
         assert not 'stateFiling' in business_json
@@ -820,6 +855,7 @@ def test_firm_business_json(session, test_name, legal_type):
     business.save()
 
     business_json = business.json()
+    assert business.json(projection=BusinessProjection.load(business)) == business_json
     if legal_type in [
         Business.LegalTypes.SOLE_PROP.value,
         Business.LegalTypes.PARTNERSHIP.value
@@ -866,6 +902,7 @@ def test_in_dissolution(session, test_name, is_testing_business_id, batch_status
         )
         batch_processing.save()
         assert business_not_in_dissolution.in_dissolution is False
+        assert BusinessProjection.load(business_not_in_dissolution).in_dissolution is False
     else:
         business_identifier = 'BC1234567'
         business = factory_business(business_identifier)
@@ -887,3 +924,4 @@ def test_in_dissolution(session, test_name, is_testing_business_id, batch_status
         )
         batch_processing.save()
         assert business.in_dissolution is expected
+        assert BusinessProjection.load(business).in_dissolution is expected
@@ -0,0 +1,128 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the OutboxMessage Model.
+
+Test-Suite to ensure that the OutboxMessage Model is working as expected.
+"""
+from datetime import timedelta
+
+from registry_schemas.example_data import ANNUAL_REPORT
+
+from legal_api.models import OutboxMessage
+from legal_api.utils.datetime import datetime
+from tests.unit.models import factory_business, factory_filing
+
+
+def create_message(subject='entity.events', destination=OutboxMessage.Destination.NATS, filing_id=None, hold=0):
+    """Return a saved outbox message."""
+    message = OutboxMessage(destination=destination, subject=subject, payload={'filing': {'id': 1}},
+                            filing_id=filing_id, next_attempt_date=datetime.utcnow() + timedelta(seconds=hold))
+    message.save()
+    return message
+
+
+def test_outbox_message_save(session):
+    """Assert that a valid outbox message can be saved, pending from now."""
+    message = create_message()
+
+    assert message.id
+    assert message.attempts == 0
+    assert message.delivered_date is None
+    assert message.next_attempt_date <= datetime.utcnow()
+
+
+def test_outbox_message_claim_pending(session):
+    """Assert that pending messages are claimed in order, and put off while they are leased."""
+    first = create_message()
+    second = create_message(subject='business-event', destination=OutboxMessage.Destination.GCP)
+    delivered = create_message()
+    OutboxMessage.mark_delivered([delivered.id])
+
+    claimed = OutboxMessage.claim_pending(limit=10, lease=60)
+
+    assert [message['id'] for message in claimed] == [first.id, second.id]
+    assert claimed[1]['destination'] == 'GCP'
+    assert claimed[1]['subject'] == 'business-event'
+    assert claimed[0]['payload'] == {'filing': {'id': 1}}
+    # leased, so not claimed again
+    assert OutboxMessage.claim_pending(limit=10, lease=60) == []
+
+
+def test_outbox_message_mark_failed(session):
+    """Assert that a failed message records the attempt and comes up again after the retry delay."""
+    message = create_message()
+    OutboxMessage.claim_pending(limit=10, lease=60)
+
+    OutboxMessage.mark_failed(message.id, 'nats is down', retry_in=0)
+    session.expire_all()
+
+    assert message.attempts == 1
+    assert message.last_error == 'nats is down'
+    assert [claimed['id'] for claimed in OutboxMessage.claim_pending(limit=10, lease=60)] == [message.id]
+
+    OutboxMessage.mark_failed(message.id, 'nats is down', retry_in=600)
+    session.expire_all()
+
+    assert message.attempts == 2
+    assert message.next_attempt_date > datetime.utcnow() + timedelta(seconds=500)
+    assert OutboxMessage.claim_pending(limit=10, lease=60) == []
+
+
+def test_outbox_message_release(session):
+    """Assert that the held messages of a filing are claimed once the filing releases them."""
+    filing = factory_filing(factory_business('CP1234567'), ANNUAL_REPORT)
+    held = create_message(filing_id=filing.id, hold=300)
+    other = create_message(hold=300)
+
+    assert OutboxMessage.claim_pending(limit=10, lease=60) == []
+
+    OutboxMessage.release(filing.id)
+
+    assert [message['id'] for message in OutboxMessage.claim_pending(limit=10, lease=60)] == [held.id]
+    session.expire_all()
+    assert other.next_attempt_date > datetime.utcnow()
+
+
+def test_outbox_message_claim_pending_in_order(session):
+    """Assert that a message is not claimed while an earlier message of its business is not due."""
+    business = factory_business('CP1234567')
+    first_filing = factory_filing(business, ANNUAL_REPORT)
+    second_filing = factory_filing(business, ANNUAL_REPORT)
+    other_filing = factory_filing(factory_business('CP7654321'), ANNUAL_REPORT)
+    failed = create_message(filing_id=first_filing.id)
+    waiting = create_message(filing_id=second_filing.id)
+    other = create_message(filing_id=other_filing.id)
+    OutboxMessage.mark_failed(failed.id, 'nats is down', retry_in=600)
+
+    claimed = OutboxMessage.claim_pending(limit=10, lease=60)
+
+    assert [(message['id'], message['businessId']) for message in claimed] == [(other.id, other_filing.business_id)]
+
+    OutboxMessage.mark_delivered([failed.id])
+    OutboxMessage.release_messages([other.id])
+
+    assert [message['id'] for message in OutboxMessage.claim_pending(limit=10, lease=60)] == [waiting.id, other.id]
+
+
+def test_outbox_message_delete_delivered(session):
+    """Assert that only the messages delivered before the given date are deleted."""
+    delivered = create_message()
+    pending = create_message()
+    OutboxMessage.mark_delivered([delivered.id])
+
+    assert OutboxMessage.delete_delivered(datetime.utcnow() - timedelta(days=1), limit=10) == 0
+    assert OutboxMessage.delete_delivered(datetime.utcnow() + timedelta(seconds=1), limit=10) == 1
+
+    assert [message.id for message in session.query(OutboxMessage).all()] == [pending.id]
@@ -0,0 +1,71 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Test-Suite to ensure that the report cache is working as expected."""
+import copy
+import hashlib
+
+from flask import current_app
+from registry_schemas.example_data import ANNUAL_REPORT, CORRECTION_AR
+
+from legal_api.reports.report_cache import ReportCache
+from legal_api.services import MinioService
+from tests.unit.models import factory_business, factory_completed_filing
+
+
+TEMPLATE = '<html>{{ business.legalName }}</html>'
+TEMPLATE_DIGEST = hashlib.sha256(TEMPLATE.encode('utf-8')).hexdigest()
+
+
+def test_is_cacheable(session):
+    """Assert only completed filings with a template not printing the retrieved date are cacheable."""
+    business = factory_business('CP1234567')
+    filing = factory_completed_filing(business, ANNUAL_REPORT)
+
+    current_app.config['REPORT_CACHE_ENABLED'] = True
+    try:
+        assert ReportCache.is_cacheable(filing, TEMPLATE)
+        assert not ReportCache.is_cacheable(filing, TEMPLATE + '{{ report_date_time }}')
+    finally:
+        current_app.config['REPORT_CACHE_ENABLED'] = False
+    assert not ReportCache.is_cacheable(filing, TEMPLATE)
+
+
+def test_get_key(session):
+    """Assert the key changes with the template digest and when the filing is corrected."""
+    business = factory_business('CP1234567')
+    filing = factory_completed_filing(business, ANNUAL_REPORT)
+
+    key = ReportCache.get_key(filing, 'annualReport', TEMPLATE_DIGEST, business)
+    assert key.startswith(f'reports/{filing.id}/annualReport/')
+    assert key == ReportCache.get_key(filing, 'annualReport', TEMPLATE_DIGEST, business)
+    assert key != ReportCache.get_key(filing, 'annualReport', 'changed', business)
+
+    correction = copy.deepcopy(CORRECTION_AR)
+    correction['filing']['correction']['correctedFilingId'] = filing.id
+    filing.parent_filing = factory_completed_filing(business, correction)
+    assert key != ReportCache.get_key(filing, 'annualReport', TEMPLATE_DIGEST, business)
+
+
+def test_put_and_get(session, minio_server):  # pylint:disable=unused-argument
+    """Assert a cached pdf is returned and replaces the earlier versions of the report."""
+    business = factory_business('CP1234567')
+    filing = factory_completed_filing(business, ANNUAL_REPORT)
+    key = ReportCache.get_key(filing, 'annualReport', TEMPLATE_DIGEST, business)
+    new_key = ReportCache.get_key(filing, 'annualReport', 'changed', business)
+
+    assert ReportCache.get(key) is None
+
+    ReportCache.put(key, b'pdf')
+    assert ReportCache.get(key) == b'pdf'
+
+    ReportCache.put(new_key, b'new pdf')
+    assert ReportCache.get(new_key) == b'new pdf'
+    assert MinioService.list_files(f'reports/{filing.id}/annualReport/') == [new_key]
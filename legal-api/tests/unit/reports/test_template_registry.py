@@ -0,0 +1,66 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Test-Suite to ensure that the report template registry is working as expected."""
+import base64
+import os
+
+import pytest
+
+from legal_api.reports.template_registry import template_registry
+
+
+@pytest.fixture()
+def template_path(app, tmp_path):
+    """Point the app at a template folder holding a template and its template parts."""
+    (tmp_path / 'template-parts' / 'common').mkdir(parents=True)
+    (tmp_path / 'template-parts' / 'common' / 'style.html').write_text('<style/>')
+    (tmp_path / 'template-parts' / 'footer.html').write_text('<footer/>')
+    (tmp_path / 'test.html').write_text('[[common/style.html]]<p>{{ name }}</p>[[footer.html]]')
+
+    original_path = app.config.get('REPORT_TEMPLATE_PATH')
+    original_reload = app.config.get('REPORT_TEMPLATE_AUTO_RELOAD')
+    app.config['REPORT_TEMPLATE_PATH'] = str(tmp_path)
+    template_registry.clear()
+    yield tmp_path
+    app.config['REPORT_TEMPLATE_PATH'] = original_path
+    app.config['REPORT_TEMPLATE_AUTO_RELOAD'] = original_reload
+    template_registry.clear()
+
+
+def test_get(app, template_path):
+    """Assert the template is assembled once, with its base64 form and digest."""
+    with app.app_context():
+        template = template_registry.get('test.html', ['common/style', 'footer'])
+        assert template.code == '<style/><p>{{ name }}</p><footer/>'
+        assert base64.b64decode(template.encoded).decode() == template.code
+        assert template.digest
+        assert template.jinja_template.render(name='<b>') == '<style/><p>&lt;b&gt;</p><footer/>'
+        assert template_registry.get('test.html', ['common/style', 'footer']) is template
+
+
+@pytest.mark.parametrize('auto_reload, expected', [
+    (False, '<style/><p>{{ name }}</p><footer/>'),
+    (True, '<new-style/><p>{{ name }}</p><footer/>'),
+])
+def test_get_reload(app, template_path, auto_reload, expected):
+    """Assert a changed template part is picked up only when auto reload is on."""
+    app.config['REPORT_TEMPLATE_AUTO_RELOAD'] = auto_reload
+    with app.app_context():
+        template = template_registry.get('test.html', ['common/style', 'footer'])
+
+        style = template_path / 'template-parts' / 'common' / 'style.html'
+        style.write_text('<new-style/>')
+        mtime = os.path.getmtime(style) + 10
+        os.utime(style, (mtime, mtime))
+
+        reloaded = template_registry.get('test.html', ['common/style', 'footer'])
+        assert reloaded.code == expected
+        assert (reloaded.digest == template.digest) != auto_reload
@@ -408,3 +408,42 @@ def test_future_filing_coa(session, client, jwt):
     assert paid_filings[0]['filing']['header']['filingId'] == filing.id
     assert paid_filings[0]['filing']['header']['paymentToken']
     assert paid_filings[0]['filing']['header']['effectiveDate']
+
+
+def test_get_due_future_effective_filings(session, client, jwt):
+    """Assert that only the ids of the PAID filings that are due are returned, a page at a time."""
+    import pytz
+    from tests.unit.models import factory_pending_filing
+    # setup
+    identifier = 'CP7654322'
+    b = factory_business(identifier, (datetime.utcnow() - datedelta.YEAR), None, Business.LegalTypes.BCOMP.value)
+    factory_business_mailing_address(b)
+    coa = copy.deepcopy(FILING_HEADER)
+    coa['filing']['header']['name'] = 'changeOfAddress'
+    coa['filing']['changeOfAddress'] = CHANGE_OF_ADDRESS
+    coa['filing']['business']['identifier'] = identifier
+
+    filings = []
+    for effective_date in [datetime.utcnow() - datedelta.DAY,
+                           datetime.utcnow() + datedelta.DAY,
+                           datetime.utcnow() - datedelta.DAY]:
+        filing = factory_pending_filing(b, coa)
+        filing.payment_completion_date = pytz.utc.localize(datetime.utcnow())
+        filing.save()
+        filing.effective_date = pytz.utc.localize(effective_date)
+        filing.save()
+        assert filing.status == Filing.Status.PAID.value
+        filings.append(filing)
+    due_ids = [filings[0].id, filings[2].id]
+
+    rv = client.get('/api/v1/businesses/internal/filings/future_effective')
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.json['filingIds'] == due_ids
+
+    rv = client.get('/api/v1/businesses/internal/filings/future_effective?limit=1')
+    assert rv.json['filingIds'] == due_ids[:1]
+    rv = client.get(f'/api/v1/businesses/internal/filings/future_effective?limit=1&afterId={due_ids[0]}')
+    assert rv.json['filingIds'] == due_ids[1:]
+
+    rv = client.get('/api/v1/businesses/internal/filings/future_effective?limit=many')
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
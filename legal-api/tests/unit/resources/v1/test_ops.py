@@ -42,3 +42,11 @@ def test_ops_readyz(client):
 
     assert rv.status_code == 200
     assert rv.json == {'message': 'api is ready'}
+
+
+def test_ops_authz_cache(client):
+    """Asserts that the authorizations cache stats are reported."""
+    rv = client.get('/ops/authz-cache')
+
+    assert rv.status_code == 200
+    assert set(rv.json.keys()) == {'hits', 'misses', 'hitRate'}
@@ -463,6 +463,13 @@ def test_post_affiliated_businesses(session, client, jwt):
     assert len(rv.json['businessEntities']) == len(businesses)
     assert len(rv.json['draftEntities']) == len(draft_businesses) - len(old_draft_businesses)
 
+    # alternate names are returned for every entity type
+    for business_entity in rv.json['businessEntities']:
+        business = Business.find_by_identifier(business_entity['identifier'])
+        assert business_entity['alternateNames'] == business.get_alternate_names()
+        assert business_entity['goodStanding'] == business.good_standing
+        assert business_entity['legalName'] == business.business_legal_name
+
     # verify 'legalName' for each draft entity
     for draft_entity in rv.json['draftEntities']:
         identifier = draft_entity['identifier']
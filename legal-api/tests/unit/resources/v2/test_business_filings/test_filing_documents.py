@@ -17,8 +17,10 @@
 Test-Suite to ensure that the /businesses/_id_/filings LEDGER SEARCH endpoint is working as expected.
 """
 import copy
+import io
 import json
 import re
+import zipfile
 from datetime import date, datetime
 from http import HTTPStatus
 from typing import Final, Tuple
@@ -56,6 +58,7 @@ from registry_schemas.example_data.schema_data import ALTERATION, INCORPORATION,
 
 from legal_api.core import Filing, FilingMeta, FILINGS
 from legal_api.models import Business, Comment, Filing as FilingStorage, RegistrationBootstrap, UserRoles
+from legal_api.models.document import Document, DocumentType
 from legal_api.resources.v2.business.business_filings.business_filings import ListFilingResource
 from legal_api.services.authz import BASIC_USER, STAFF_ROLE
 from legal_api.utils.legislation_datetime import LegislationDatetime
@@ -1515,3 +1518,98 @@ def test_get_receipt_request_mock(session, client, jwt, requests_mock):
 
     assert rv.status_code == HTTPStatus.CREATED
     assert requests_mock.called_once
+
+
+def test_get_documents_bundle(session, client, jwt, requests_mock):
+    """Assert that the documents of a filing are returned in one zip, with the render time of each."""
+    identifier = 'CP7654321'
+    business = factory_business(identifier)
+    filing_name = 'incorporationApplication'
+    payment_id = '12345'
+
+    filing_json = copy.deepcopy(FILING_HEADER)
+    filing_json['filing']['header']['name'] = filing_name
+    filing_json['filing'][filing_name] = INCORPORATION
+    filing_json['filing'].pop('business')
+
+    filing = factory_filing(business, filing_json, filing_date=datetime.utcnow())
+    filing.skip_status_listener = True
+    filing._status = 'PAID'
+    filing._payment_token = payment_id
+    filing.payment_completion_date = datetime.utcnow()
+    filing.save()
+
+    requests_mock.post(f"{current_app.config.get('PAYMENT_SVC_URL')}/{payment_id}/receipts",
+                       content=b'receipt pdf',
+                       status_code=HTTPStatus.CREATED)
+    requests_mock.post(current_app.config.get('REPORT_SVC_URL'), content=b'filing pdf')
+
+    rv = client.get(f'/api/v2/businesses/{identifier}/filings/{filing.id}/documents/bundle',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.mimetype == 'application/zip'
+    assert 'receipt;dur=' in rv.headers['Server-Timing']
+    assert f'{filing_name};dur=' in rv.headers['Server-Timing']
+    assert 'X-Document-Errors' not in rv.headers
+    with zipfile.ZipFile(io.BytesIO(rv.data)) as bundle:
+        assert bundle.read('receipt.pdf') == b'receipt pdf'
+        assert bundle.read(f'{filing_name}.pdf') == b'filing pdf'
+
+
+def test_get_documents_bundle_static_documents(session, mocker, client, jwt, requests_mock):
+    """Assert that the streamed static documents of a coop incorporation are in the bundle, and their files closed."""
+    identifier = 'CP7654321'
+    business = factory_business(identifier, entity_type=Business.LegalTypes.COOP.value)
+    filing_name = 'incorporationApplication'
+    payment_id = '12345'
+
+    filing_json = copy.deepcopy(FILING_HEADER)
+    filing_json['filing']['header']['name'] = filing_name
+    filing_json['filing']['business']['legalType'] = Business.LegalTypes.COOP.value
+    filing_json['filing'][filing_name] = copy.deepcopy(INCORPORATION)
+    filing_json['filing'][filing_name]['nameRequest']['legalType'] = Business.LegalTypes.COOP.value
+
+    filing = factory_filing(business, filing_json, filing_date=datetime.utcnow())
+    filing.skip_status_listener = True
+    filing._status = Filing.Status.COMPLETED.value
+    filing._payment_token = payment_id
+    filing.payment_completion_date = datetime.utcnow()
+    filing._meta_data = {'legalFilings': [filing_name]}
+    filing.save()
+
+    static_files = {DocumentType.COOP_RULES.value: b'rules pdf', DocumentType.COOP_MEMORANDUM.value: b'memorandum pdf'}
+    for document_type in static_files:
+        document = Document()
+        document.type = document_type
+        document.file_key = f'{document_type}.pdf'
+        document.content_type = 'pdf'
+        document.business_id = business.id
+        document.filing_id = filing.id
+        document.save()
+
+    closed = []
+
+    def get_file_response(key, mimetype='application/pdf'):
+        response = current_app.response_class(iter([static_files[key[:-len('.pdf')]]]), mimetype=mimetype,
+                                              direct_passthrough=True)
+        response.call_on_close(lambda: closed.append(key))
+        return response
+
+    mocker.patch('legal_api.core.filing.has_roles', return_value=True)
+    mocker.patch('legal_api.reports.report.MinioService.get_file_response', side_effect=get_file_response)
+    requests_mock.post(f"{current_app.config.get('PAYMENT_SVC_URL')}/{payment_id}/receipts",
+                       content=b'receipt pdf',
+                       status_code=HTTPStatus.CREATED)
+    requests_mock.post(current_app.config.get('REPORT_SVC_URL'), content=b'filing pdf')
+
+    rv = client.get(f'/api/v2/businesses/{identifier}/filings/{filing.id}/documents/bundle',
+                    headers=create_header(jwt, [STAFF_ROLE], identifier))
+
+    assert rv.status_code == HTTPStatus.OK
+    assert 'X-Document-Errors' not in rv.headers
+    with zipfile.ZipFile(io.BytesIO(rv.data)) as bundle:
+        assert bundle.read('certifiedRules.pdf') == b'rules pdf'
+        assert bundle.read('certifiedMemorandum.pdf') == b'memorandum pdf'
+        assert bundle.read(f'{filing_name}.pdf') == b'filing pdf'
+    assert sorted(closed) == sorted(f'{document_type}.pdf' for document_type in static_files)
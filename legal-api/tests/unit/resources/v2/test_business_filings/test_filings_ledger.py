@@ -140,6 +140,44 @@ def test_ledger_search(session, client, jwt):
     # assert alteration['filingLink']
 
 
+def test_ledger_search_cursor(session, client, jwt):
+    """Assert that the ledger can be paged through with a cursor."""
+    # setup
+    identifier = 'BC1234567'
+    founding_date = datetime.utcnow() - datedelta.datedelta(months=len(FILINGS.keys()))
+    business = factory_business(identifier=identifier, founding_date=founding_date, last_ar_date=None, entity_type=Business.LegalTypes.BCOMP.value)
+    num_of_files = load_ledger(business, founding_date)
+    page_size = 5
+
+    # test
+    filing_ids = []
+    cursor = ''
+    while cursor is not None:
+        rv = client.get(f'/api/v2/businesses/{identifier}/filings?size={page_size}&cursor={cursor}&total=true',
+                        headers=create_header(jwt, [UserRoles.system], identifier))
+        assert rv.status_code == HTTPStatus.OK
+        assert rv.json['total'] == num_of_files
+        assert len(rv.json['filings']) <= page_size
+        filing_ids.extend(f['filingId'] for f in rv.json['filings'])
+        cursor = rv.json['nextCursor']
+
+    # validate, every filing is returned once, newest first
+    rv = client.get(f'/api/v2/businesses/{identifier}/filings',
+                    headers=create_header(jwt, [UserRoles.system], identifier))
+    assert filing_ids == [f['filingId'] for f in rv.json['filings']]
+
+
+def test_ledger_search_invalid_cursor(session, client, jwt):
+    """Assert that an invalid cursor is rejected."""
+    identifier = 'BC1234567'
+    factory_business(identifier=identifier, entity_type=Business.LegalTypes.BCOMP.value)
+
+    rv = client.get(f'/api/v2/businesses/{identifier}/filings?cursor=not-a-cursor',
+                    headers=create_header(jwt, [UserRoles.system], identifier))
+
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
+
+
 ###
 #  Check elements of the ledger search
 ###
@@ -35,8 +35,9 @@ from legal_api.models import Address, Filing, AmalgamatingBusiness
 from legal_api.models.business import Business, PartyRole, User
 
 from legal_api.services.authz import BASIC_USER, COLIN_SVC_ROLE, STAFF_ROLE, PUBLIC_USER, \
-    are_digital_credentials_allowed, authorized, is_allowed, is_self_registered_owner_operator, \
-    get_allowed, get_allowed_filings, get_allowable_actions
+    are_digital_credentials_allowed, authorized, cache, is_allowed, is_self_registered_owner_operator, \
+    get_allowed, get_allowed_filings, get_allowable_actions, get_allowable_filings_index, \
+    get_authorizations_cache_stats, get_blocker_facts, get_entity_authorizations
 from legal_api.services.warnings.business.business_checks import WarningType
 from tests import integration_authorization, not_github_ci
 from tests.unit.models import factory_business, factory_filing, factory_incomplete_statuses, factory_completed_filing, \
@@ -513,6 +514,30 @@ def test_authorized_invalid_roles(monkeypatch, app, jwt):
     assert not rv
 
 
+def test_entity_authorizations_cached(app, jwt, requests_mock):
+    """Assert that entity authorizations are fetched once per token and identifier while cached."""
+    identifier = 'CP1234567'
+    token = helper_create_jwt(jwt, roles=[BASIC_USER], username='cached-user')
+
+    with app.app_context():
+        app.config['AUTHORIZATIONS_CACHE_TIMEOUT'] = 60
+        auth_mock = requests_mock.get(f"{app.config['AUTH_SVC_URL']}/entities/{identifier}/authorizations",
+                                      json={'roles': ['view']})
+        try:
+            stats = get_authorizations_cache_stats()
+
+            assert get_entity_authorizations(identifier, token) == ['view']
+            assert get_entity_authorizations(identifier, token) == ['view']
+
+            assert auth_mock.call_count == 1
+            cached_stats = get_authorizations_cache_stats()
+            assert cached_stats['hits'] == stats['hits'] + 1
+            assert cached_stats['misses'] == stats['misses'] + 1
+        finally:
+            app.config['AUTHORIZATIONS_CACHE_TIMEOUT'] = 0
+            cache.clear()
+
+
 @pytest.mark.parametrize(
     'test_name,state,legal_types,username,roles,expected',
     [
@@ -3046,6 +3071,40 @@ def test_is_self_registered_owner_operator_true(app, session):
     assert is_self_registered_owner_operator(business, user) is True
 
 
+def test_allowable_filings_index(app):
+    """Assert that the allowable filing rules are compiled once and returned as copies."""
+    with app.app_context():
+        index = get_allowable_filings_index()
+        assert get_allowable_filings_index() is index
+
+        rules = index['filings'][('staff', Business.State.ACTIVE, 'BC')]
+        names = [rule['filingType']['name'] for rule in rules]
+        assert 'alteration' in names
+        assert 'changeOfRegistration' not in names
+        assert all(rule['filingType']['displayName'] for rule in rules)
+
+        jwt_mock = MagicMock()
+        jwt_mock.contains_role.return_value = True
+        allowed = get_allowed(Business.State.ACTIVE, 'BC', jwt_mock)
+        allowed.append('mutated')
+        assert 'mutated' not in get_allowed(Business.State.ACTIVE, 'BC', jwt_mock)
+
+
+def test_get_blocker_facts(app, session):
+    """Assert that the blocker facts of a business are gathered from its filings."""
+    business = create_business('BC', Business.State.ACTIVE)
+    filing = factory_completed_filing(business, ALTERATION_FILING_TEMPLATE, filing_type='alteration')
+    business.state_filing_id = filing.id
+    business.warnings = [{'warningType': WarningType.MISSING_REQUIRED_BUSINESS_INFO}]
+    business.save()
+
+    blocker_facts = get_blocker_facts(business)
+
+    assert blocker_facts['stateFiling'] == ('alteration', None)
+    assert not blocker_facts['futureEffectiveFilings']
+    assert blocker_facts['warningTypes'] == {WarningType.MISSING_REQUIRED_BUSINESS_INFO}
+
+
 def create_business(legal_type, state):
     """Create a business."""
     identifier = (f'BC{random.SystemRandom().getrandbits(0x58)}')[:9]
@@ -0,0 +1,101 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the versioned business details are built as expected."""
+import datetime
+from contextlib import contextmanager
+
+from sqlalchemy import event, func
+from sqlalchemy_continuum import version_class
+
+from legal_api.models import Address, PartyRole, db
+from legal_api.services import VersionedBusinessDetailsService
+from legal_api.services.business_details_version import BusinessSnapshot
+from tests.unit.models import factory_business, factory_business_mailing_address, factory_party_role
+
+
+@contextmanager
+def count_queries(connection):
+    """Collect the statements executed on the connection."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(connection, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, 'before_cursor_execute', before_cursor_execute)
+
+
+def add_directors(business, count: int):
+    """Add directors, each with their own delivery and mailing addresses."""
+    for i in range(count):
+        officer = {
+            'firstName': f'Director{i}',
+            'lastName': 'Test',
+            'middleInitial': '',
+            'partyType': 'person',
+            'organizationName': ''
+        }
+        addresses = [Address(city='Test City', street=f'{i} Test Street', postal_code='T3S3T3', country='CA',
+                             region='BC', address_type=address_type)
+                     for address_type in [Address.DELIVERY, Address.MAILING]]
+        business.party_roles.append(factory_party_role(addresses[0], addresses[1], officer,
+                                                       datetime.datetime(2017, 5, 17), None,
+                                                       PartyRole.RoleTypes.DIRECTOR))
+    business.save()
+
+
+def last_transaction_id():
+    """Return the id of the latest versioned transaction."""
+    return db.session.query(func.max(version_class(PartyRole).transaction_id)).scalar()
+
+
+def test_snapshot_query_count(session):
+    """Assert that the queries to build the revision don't grow with the number of directors."""
+    statement_counts = []
+    for identifier, directors in [('BC1234561', 2), ('BC1234562', 8)]:
+        business = factory_business(identifier)
+        factory_business_mailing_address(business)
+        add_directors(business, directors)
+        transaction_id = last_transaction_id()
+
+        with count_queries(session.get_bind()) as statements:
+            snapshot = BusinessSnapshot(transaction_id, business.id)
+            parties = snapshot.parties_json(is_ia_or_after=True)
+            offices = snapshot.offices_json()
+        statement_counts.append(len(statements))
+
+        assert len(parties) == directors
+        assert offices['registeredOffice']['mailingAddress']['postalCode'] == 'T3S3T3'
+
+    assert statement_counts[0] == statement_counts[1]
+
+
+def test_snapshot_matches_revision_json(session):
+    """Assert that the snapshot returns the same parties as the per party revision queries."""
+    business = factory_business('BC1234563')
+    add_directors(business, 3)
+    transaction_id = last_transaction_id()
+
+    party_role_version = version_class(PartyRole)
+    party_roles = db.session.query(party_role_version) \
+        .filter(party_role_version.business_id == business.id) \
+        .order_by(party_role_version.transaction_id).all()
+    expected = [VersionedBusinessDetailsService.party_role_revision_json(transaction_id, party_role, False)
+                for party_role in party_roles]
+
+    assert VersionedBusinessDetailsService.get_party_role_revision(transaction_id, business.id) == expected
+    assert all(party['deliveryAddress']['streetAddress'] for party in expected)
@@ -16,6 +16,7 @@
 Test suite to ensure that the Minio service routines are working as expected.
 """
 import os
+from http import HTTPStatus
 
 import requests
 from minio.error import S3Error
@@ -97,3 +98,35 @@ def test_put_file(session, minio_server, tmpdir):  # pylint:disable=unused-argum
         assert file.data == pdf_file.read()
     except S3Error as ex:
         assert ex.code == 'NoSuchKey'
+
+
+def test_get_file_response(app, session, minio_server):  # pylint:disable=unused-argument
+    """Assert the file is streamed, in part for a range request and not at all when the client has it."""
+    pdf_file = _create_pdf_file()
+    content = pdf_file.getvalue()
+    key = 'test-stream.pdf'
+    MinioService.put_file(key, pdf_file, len(content))
+
+    with app.test_request_context():
+        response = MinioService.get_file_response(key)
+        assert response.status_code == HTTPStatus.OK
+        # streamed in direct passthrough, so the body is read from the iterable
+        assert b''.join(response.response) == content
+        etag = response.headers['ETag']
+        response.close()
+
+    with app.test_request_context(headers={'Range': 'bytes=0-9'}):
+        response = MinioService.get_file_response(key)
+        assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+        assert response.headers['Content-Range'] == f'bytes 0-9/{len(content)}'
+        assert b''.join(response.response) == content[:10]
+        response.close()
+
+    with app.test_request_context(headers={'Range': f'bytes={len(content)}-'}):
+        response = MinioService.get_file_response(key)
+        assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+    with app.test_request_context(headers={'If-None-Match': etag}):
+        response = MinioService.get_file_response(key)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not response.get_data()
@@ -0,0 +1,50 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the NameX service is working as expected."""
+from http import HTTPStatus
+
+from legal_api.services import NameXService
+from legal_api.services.service_account_token import service_account_tokens
+
+
+NR_NUMBER = 'NR 1234567'
+
+
+def test_query_nr_number_memoized(app, requests_mock):
+    """Assert that an NR is fetched, and a namex token requested, once per app context."""
+    service_account_tokens.clear()
+    auth_mock = requests_mock.post(app.config['NAMEX_AUTH_SVC_URL'],
+                                   json={'access_token': 'token', 'expires_in': 300})
+    nr_mock = requests_mock.get(f"{app.config['NAMEX_SVC_URL']}requests/{NR_NUMBER}",
+                                json={'nrNum': NR_NUMBER, 'state': 'APPROVED'})
+    requests_mock.put(f"{app.config['NAMEX_SVC_URL']}requests/{NR_NUMBER}", json={'nrNum': NR_NUMBER})
+
+    with app.app_context():
+        for _ in range(3):
+            nr_response = NameXService.query_nr_number(NR_NUMBER)
+            assert nr_response.status_code == HTTPStatus.OK
+            assert nr_response.json()['state'] == 'APPROVED'
+        assert nr_mock.call_count == 1
+
+        # an update drops the memoized response
+        NameXService.update_nr({'nrNum': NR_NUMBER})
+        NameXService.query_nr_number(NR_NUMBER)
+        assert nr_mock.call_count == 2
+
+    with app.app_context():
+        NameXService.query_nr_number(NR_NUMBER)
+        assert nr_mock.call_count == 3
+
+    assert auth_mock.call_count == 1
+    service_account_tokens.clear()
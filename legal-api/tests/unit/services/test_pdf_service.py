@@ -15,6 +15,7 @@
 
 """
 import io
+from unittest.mock import patch
 
 import PyPDF2
 from reportlab.lib.pagesizes import letter
@@ -53,6 +54,28 @@ def test_stamp(app):  # pylint:disable=unused-argument
         # f.close()
 
 
+def test_certify_pdfs(app):  # pylint:disable=unused-argument
+    """Assert that a batch of documents is stamped, rendering each stamp once."""
+    with app.app_context():
+        pdf_service = PdfService()
+        incorp_date = LegislationDatetime.now()
+        rules_stamp_data = RegistrarStampData(incorp_date, 'CP00000001', file_name='rules.pdf')
+        memorandum_stamp_data = RegistrarStampData(incorp_date, 'CP00000001', file_name='memorandum.pdf')
+
+        with patch.object(PdfService, '_render_registrars_stamp',
+                          wraps=PdfService._render_registrars_stamp) as render:
+            certified_copies = pdf_service.certify_pdfs([(_create_pdf_file().getvalue(), rules_stamp_data),
+                                                        (_create_pdf_file(), memorandum_stamp_data),
+                                                        (_create_pdf_file(), rules_stamp_data)])
+            assert render.call_count == 2
+
+        for certified_copy, file_name in zip(certified_copies, ['rules.pdf', 'memorandum.pdf', 'rules.pdf']):
+            certified_copy_obj = PyPDF2.PdfFileReader(certified_copy)
+            assert certified_copy_obj.getNumPages() == 3
+            assert f'File Name: {file_name}' in certified_copy_obj.getPage(0).extractText()
+            assert 'Filed on' not in certified_copy_obj.getPage(1).extractText()
+
+
 def _create_pdf_file():
     buffer = io.BytesIO()
     can = canvas.Canvas(buffer, pagesize=letter)
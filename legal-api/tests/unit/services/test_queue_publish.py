@@ -17,8 +17,10 @@
 Test-Suite to ensure that the Queue Publication Service is working as expected.
 """
 import asyncio
+import concurrent.futures
 import json
 import logging
+import threading
 
 import dpath.util
 import pytest
@@ -252,3 +254,70 @@ def test_publish_colin_filing_managed(app_ctx, stan_server):
         assert 'colinFiling' in m.data.decode('utf-8')
         assert 1234 + i == dpath.util.get(json.loads(m.data.decode('utf-8')),
                                           'colinFiling/id')
+
+
+class FakeNats:
+    """A NATS client that connects without a server."""
+
+    def __init__(self):
+        """Start disconnected."""
+        self.is_connected = False
+        self.connect_options = None
+
+    async def connect(self, **options):
+        """Connect."""
+        self.connect_options = options
+        self.is_connected = True
+
+    async def close(self):
+        """Close."""
+        self.is_connected = False
+
+
+class FakeStan:
+    """A STAN client that records the publishes and the thread they are made on."""
+
+    published = []
+
+    async def connect(self, **options):
+        """Connect."""
+
+    async def publish(self, subject, payload):
+        """Record the publish, failing the ones for the error subject."""
+        if subject == 'error':
+            raise Exception('publish failed')
+        await asyncio.sleep(0)
+        FakeStan.published.append((subject, json.loads(payload), threading.current_thread().name))
+        return 'guid'
+
+    async def close(self):
+        """Close."""
+
+
+def test_publish_json_publisher_thread(app, mocker):
+    """Assert that publish_json publishes from the publisher thread, waiting for the ack or not."""
+    mocker.patch('legal_api.services.queue.NATS', FakeNats)
+    mocker.patch('legal_api.services.queue.STAN', FakeStan)
+    FakeStan.published = []
+    queue = QueueService()
+    queue.init_app(app)
+
+    try:
+        # wait for the ack
+        assert queue.publish_json({'filing': {'id': 1}}, 'entity.filing.filer') == 'guid'
+        # fire and forget, a burst of messages
+        futures = [queue.publish_json({'email': {'filingId': i}}, 'entity.email', wait_for_ack=False)
+                   for i in range(5)]
+        concurrent.futures.wait(futures, timeout=5)
+        assert all(future.result() == 'guid' for future in futures)
+
+        with pytest.raises(Exception):
+            queue.publish_json({'filing': {'id': 2}}, 'error')
+
+        assert FakeStan.published[0] == ('entity.filing.filer', {'filing': {'id': 1}}, 'queue-publisher')
+        assert [payload['email']['filingId'] for _, payload, _ in FakeStan.published[1:]] == list(range(5))
+        assert all(thread == 'queue-publisher' for _, _, thread in FakeStan.published)
+        # one long lived connection, made on the publisher's loop
+        assert queue.publisher.nats.connect_options['io_loop'] is not queue.loop
+    finally:
+        queue.publisher.stop(timeout=5)
@@ -0,0 +1,124 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the service account token cache is working as expected."""
+import threading
+
+from legal_api.services import ServiceAccountTokenCache, service_account_token
+
+
+TOKEN_URL = 'http://test-token-url/token'
+
+
+def test_token_cached_until_refresh(app, requests_mock):
+    """Assert that a token is requested once and reused until it is due for refresh."""
+    token_mock = requests_mock.post(TOKEN_URL, json={'access_token': 'token-1', 'expires_in': 300})
+    token_cache = ServiceAccountTokenCache(refresh_margin=30)
+
+    with app.app_context():
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') == 'token-1'
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') == 'token-1'
+        assert token_mock.call_count == 1
+
+        # a different client gets its own token
+        token_cache.get_token(TOKEN_URL, 'other-client', 'secret')
+        assert token_mock.call_count == 2
+
+
+def test_token_refreshed_ahead_of_expiry(app, requests_mock, monkeypatch):
+    """Assert that a token is reused until the refresh margin before its expiry, and requested again inside it."""
+    clock = [1000.0]
+    monkeypatch.setattr(service_account_token.time, 'monotonic', lambda: clock[0])
+    token_mock = requests_mock.post(TOKEN_URL, [{'json': {'access_token': 'token-1', 'expires_in': 300}},
+                                                {'json': {'access_token': 'token-2', 'expires_in': 300}},
+                                                {'status_code': 500, 'text': 'error'}])
+    token_cache = ServiceAccountTokenCache(refresh_margin=30)
+
+    with app.app_context():
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') == 'token-1'
+
+        clock[0] += 269  # just before the refresh margin
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') == 'token-1'
+        assert token_mock.call_count == 1
+
+        clock[0] += 2  # inside the refresh margin, ahead of the expiry
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') == 'token-2'
+        assert token_mock.call_count == 2
+
+        # a failed refresh inside the margin keeps the cached token until it actually expires
+        clock[0] += 271
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') == 'token-2'
+        assert token_mock.call_count == 3
+        clock[0] += 30
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') is None
+
+
+def test_token_refresh_margin_capped(app, requests_mock, monkeypatch):
+    """Assert that the refresh margin is capped at half of a short lived token's lifetime."""
+    clock = [1000.0]
+    monkeypatch.setattr(service_account_token.time, 'monotonic', lambda: clock[0])
+    token_mock = requests_mock.post(TOKEN_URL, json={'access_token': 'token-1', 'expires_in': 20})
+    token_cache = ServiceAccountTokenCache(refresh_margin=30)
+
+    with app.app_context():
+        token_cache.get_token(TOKEN_URL, 'client', 'secret')
+        clock[0] += 9
+        token_cache.get_token(TOKEN_URL, 'client', 'secret')
+        assert token_mock.call_count == 1
+
+        clock[0] += 2
+        token_cache.get_token(TOKEN_URL, 'client', 'secret')
+        assert token_mock.call_count == 2
+
+
+def test_token_invalidated(app, requests_mock):
+    """Assert that an invalidated token is requested again."""
+    token_mock = requests_mock.post(TOKEN_URL, json={'access_token': 'token-1', 'expires_in': 300})
+    token_cache = ServiceAccountTokenCache()
+
+    with app.app_context():
+        token_cache.get_token(TOKEN_URL, 'client', 'secret')
+        token_cache.invalidate(TOKEN_URL, 'client')
+        token_cache.get_token(TOKEN_URL, 'client', 'secret')
+        assert token_mock.call_count == 2
+
+
+def test_token_failed_refresh(app, requests_mock):
+    """Assert that a failed token request is not cached."""
+    token_mock = requests_mock.post(TOKEN_URL, status_code=500, text='error')
+    token_cache = ServiceAccountTokenCache()
+
+    with app.app_context():
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') is None
+        assert token_cache.get_token(TOKEN_URL, 'client', 'secret') is None
+        assert token_mock.call_count == 2
+
+
+def test_token_concurrent_refresh_coalesced(app, requests_mock):
+    """Assert that concurrent callers share a single token request."""
+    token_mock = requests_mock.post(TOKEN_URL, json={'access_token': 'token-1', 'expires_in': 300})
+    token_cache = ServiceAccountTokenCache()
+    tokens = []
+
+    def get_token():
+        with app.app_context():
+            tokens.append(token_cache.get_token(TOKEN_URL, 'client', 'secret'))
+
+    threads = [threading.Thread(target=get_token) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ['token-1'] * 10
+    assert token_mock.call_count == 1
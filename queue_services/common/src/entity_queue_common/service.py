@@ -166,9 +166,16 @@ class ServiceWorker:
             logger.debug('error when closing the streams: %s', err, stack_info=True)
 
     async def publish(self, subject: str, msg: Dict):
-        """Publish the msg as a JSON struct to the subject, using the streaming NATS connection."""
-        await self.sc.publish(subject=subject,
-                              payload=json.dumps(msg).encode('utf-8'))
+        """Publish the msg as a JSON struct to the subject, using the streaming NATS connection.
+
+        The connection belongs to the service loop, publishes from a worker thread's loop are handed over to it.
+        """
+        publish = self.sc.publish(subject=subject,
+                                  payload=json.dumps(msg).encode('utf-8'))
+        if self._loop and self._loop is not asyncio.get_running_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(publish, self._loop))
+            return
+        await publish
 
 
 class QueueServiceManager:
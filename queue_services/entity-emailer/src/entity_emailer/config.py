@@ -80,6 +80,15 @@ class _Config():  # pylint: disable=too-few-public-methods
     # variables
     LEGISLATIVE_TIMEZONE = os.getenv('LEGISLATIVE_TIMEZONE', 'America/Vancouver')
     TEMPLATE_PATH = os.getenv('TEMPLATE_PATH', None)
+    # compiled templates, TEMPLATE_AUTO_RELOAD reloads the ones changed on disk
+    TEMPLATE_AUTO_RELOAD = os.getenv('TEMPLATE_AUTO_RELOAD', 'False').lower() == 'true'
+    TEMPLATE_BYTECODE_CACHE = os.getenv('TEMPLATE_BYTECODE_CACHE', 'True').lower() == 'true'
+    TEMPLATE_BYTECODE_CACHE_DIR = os.getenv('TEMPLATE_BYTECODE_CACHE_DIR', None)
+
+    # pdf attachments, fetched concurrently up to the limit per email and across the service
+    EMAILER_ATTACHMENT_CONCURRENCY = int(os.getenv('EMAILER_ATTACHMENT_CONCURRENCY', '8'))
+    EMAILER_ATTACHMENT_CONCURRENCY_PER_MESSAGE = int(os.getenv('EMAILER_ATTACHMENT_CONCURRENCY_PER_MESSAGE', '4'))
+    EMAILER_ATTACHMENT_TIMEOUT = float(os.getenv('EMAILER_ATTACHMENT_TIMEOUT', '120'))
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
@@ -153,6 +162,7 @@ class DevConfig(_Config):  # pylint: disable=too-few-public-methods
 
     TESTING = False
     DEBUG = True
+    TEMPLATE_AUTO_RELOAD = os.getenv('TEMPLATE_AUTO_RELOAD', 'True').lower() == 'true'
 
 
 class TestConfig(_Config):  # pylint: disable=too-few-public-methods
@@ -19,7 +19,6 @@ from __future__ import annotations
 
 from datetime import datetime
 from http import HTTPStatus
-from pathlib import Path
 from typing import Tuple
 
 import requests
@@ -29,6 +28,28 @@ from legal_api.models import Business, Filing
 from legal_api.utils.legislation_datetime import LegislationDatetime
 
 
+# template parts, marked up by [[partname.html]] in the templates
+TEMPLATE_PARTS = [
+    'business-dashboard-link',
+    'business-dashboard-link-alt',
+    'business-info',
+    'business-information',
+    'reg-business-info',
+    'cra-notice',
+    'nr-footer',
+    'footer',
+    'header',
+    'initiative-notice',
+    'logo',
+    'pdf-notice',
+    'style',
+    'divider',
+    '20px',
+    'whitespace-16px',
+    'whitespace-24px'
+]
+
+
 def get_filing_info(filing_id: str) -> Tuple[Filing, dict, dict, str, str]:
     """Get filing info for the email."""
     filing = Filing.find_by_id(filing_id)
@@ -159,44 +180,6 @@ def get_entity_dashboard_url(identifier, token: str) -> str:
     return entity_dashboard_url
 
 
-def substitute_template_parts(template_code: str) -> str:
-    """Substitute template parts in main template.
-
-    Template parts are marked by [[partname.html]] in templates.
-
-    This functionality is restricted by:
-    - markup must be exactly [[partname.html]] and have no extra spaces around file name
-    - template parts can only be one level deep, ie: this rudimentary framework does not handle nested template
-    parts. There is no recursive search and replace.
-    """
-    template_parts = [
-        'business-dashboard-link',
-        'business-dashboard-link-alt',
-        'business-info',
-        'business-information',
-        'reg-business-info',
-        'cra-notice',
-        'nr-footer',
-        'footer',
-        'header',
-        'initiative-notice',
-        'logo',
-        'pdf-notice',
-        'style',
-        'divider',
-        '20px',
-        'whitespace-16px',
-        'whitespace-24px'
-    ]
-
-    # substitute template parts - marked up by [[filename]]
-    for template_part in template_parts:
-        template_part_code = Path(f'{current_app.config.get("TEMPLATE_PATH")}/common/{template_part}.html').read_text()
-        template_code = template_code.replace('[[{}.html]]'.format(template_part), template_part_code)
-
-    return template_code
-
-
 def get_jurisdictions(identifier: str, token: str) -> dict:
     """Get jurisdictions call."""
     headers = {
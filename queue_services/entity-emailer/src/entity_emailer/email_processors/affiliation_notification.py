@@ -15,13 +15,12 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
 
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import get_filing_info, get_recipients
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -35,10 +34,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     status = filing.status
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-ALT-DRAFT.html').read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template('BC-ALT-DRAFT.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
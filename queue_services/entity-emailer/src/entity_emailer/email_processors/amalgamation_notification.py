@@ -14,23 +14,20 @@
 """Email processing rules and actions for Amalgamation notifications."""
 from __future__ import annotations
 
-import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import AmalgamatingBusiness, Amalgamation, Business, Filing
 
 from entity_emailer.email_processors import (
     get_entity_dashboard_url,
     get_filing_info,
     get_recipients,
-    substitute_template_parts,
 )
+from entity_emailer.email_processors.attachment_fetcher import Attachment, fetch_pdfs
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def _get_pdfs(
@@ -41,38 +38,20 @@ def _get_pdfs(
         filing_date_time: str,
         effective_date: str,
         amalgamation_application_name: str) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
+    # pylint: disable=too-many-arguments
     """Get the outputs for the amalgamation notification."""
-    pdfs = []
-    attach_order = 1
-    headers = {
-        'Accept': 'application/pdf',
-        'Authorization': f'Bearer {token}'
-    }
+    attachments = []
+    filing_url = f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
 
     if status == Filing.Status.PAID.value:
         # add filing pdf
-        filing_pdf = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-            headers=headers
-        )
-        if filing_pdf.status_code != HTTPStatus.OK:
-            logger.error('Failed to get pdf for filing: %s', filing.id)
-        else:
-            filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-            pdfs.append(
-                {
-                    'fileName': f'{amalgamation_application_name}.pdf',
-                    'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+        attachments.append(Attachment(f'{amalgamation_application_name}.pdf', filing_url, description='filing'))
 
         corp_name = business.get('legalName')
-        receipt = requests.post(
+        attachments.append(Attachment(
+            'Receipt.pdf',
             f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+            method='POST',
             json={
                 'corpName': corp_name,
                 'filingDateTime': filing_date_time,
@@ -80,61 +59,18 @@ def _get_pdfs(
                 'filingIdentifier': str(filing.id),
                 'businessNumber': business.get('taxId', '')
             },
-            headers=headers
-        )
-        if receipt.status_code != HTTPStatus.CREATED:
-            logger.error('Failed to get receipt pdf for filing: %s', filing.id)
-        else:
-            receipt_encoded = base64.b64encode(receipt.content)
-            pdfs.append(
-                {
-                    'fileName': 'Receipt.pdf',
-                    'fileBytes': receipt_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+            expected_status=HTTPStatus.CREATED,
+            description='receipt'
+        ))
     elif status == Filing.Status.COMPLETED.value:
         # add certificate of amalgamation
-        certificate = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-            '?type=certificateOfAmalgamation',
-            headers=headers
-        )
-        if certificate.status_code != HTTPStatus.OK:
-            logger.error('Failed to get corrected registration statement pdf for filing: %s', filing.id)
-        else:
-            certificate_encoded = base64.b64encode(certificate.content)
-            pdfs.append(
-                {
-                    'fileName': 'Certificate Of Amalgamation.pdf',
-                    'fileBytes': certificate_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+        attachments.append(Attachment('Certificate Of Amalgamation.pdf',
+                                      f'{filing_url}?type=certificateOfAmalgamation',
+                                      description='certificateOfAmalgamation'))
         # add notice of articles
-        noa = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-            '?type=noticeOfArticles',
-            headers=headers
-        )
-        if noa.status_code != HTTPStatus.OK:
-            logger.error('Failed to get noa pdf for filing: %s', filing.id)
-        else:
-            noa_encoded = base64.b64encode(noa.content)
-            pdfs.append(
-                {
-                    'fileName': 'Notice of Articles.pdf',
-                    'fileBytes': noa_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
-    return pdfs
+        attachments.append(Attachment('Notice of Articles.pdf', f'{filing_url}?type=noticeOfArticles',
+                                      description='noa'))
+    return fetch_pdfs(attachments, token, filing.id)
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -165,12 +101,10 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
 
     amalgamation_application_name = amalgamation_application_names[filing.filing_sub_type]
 
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/AMALGA-{status}.html').read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
     legal_type = business.get('legalType')
     numbered_description = Business.BUSINESSES.get(legal_type, {}).get('numberedDescription')
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'AMALGA-{status}.html')
 
     html_out = jnja_template.render(
         business=business,
@@ -14,14 +14,12 @@
 """Email processing actions for annual report reminder notification."""
 from __future__ import annotations
 
-from pathlib import Path
-
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, CorpType
 
-from entity_emailer.email_processors import get_recipient_from_auth, substitute_template_parts
+from entity_emailer.email_processors import get_recipient_from_auth
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def process(email_msg: dict, token: str, flag_on: bool) -> dict:
@@ -29,14 +27,11 @@ def process(email_msg: dict, token: str, flag_on: bool) -> dict:
     logger.debug('ar_reminder_notification: %s', email_msg)
     ar_fee = email_msg['arFee']
     ar_year = email_msg['arYear']
-    # get template and fill in parts
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/AR-REMINDER.html').read_text()
-    filled_template = substitute_template_parts(template)
     business = Business.find_by_internal_id(email_msg['businessId'])
     corp_type = CorpType.find_by_id(business.legal_type)
 
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template('AR-REMINDER.html')
     html_out = jnja_template.render(
         business=business.json(),
         ar_fee=ar_fee,
@@ -0,0 +1,144 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fetch the pdf attachments of an email concurrently.
+
+The pdfs of an email come from independent calls to the legal api and pay api, so they are fetched on a small
+thread pool rather than one after the other. The number of fetches of a single email and the number of fetches
+across the whole process are both bounded by config, so a burst of emails can't flood the report services.
+
+Each pdf is streamed and base64 encoded as it arrives, instead of holding both the raw and encoded copies.
+"""
+from __future__ import annotations
+
+import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import List, Optional
+
+import requests
+from entity_queue_common.service_utils import logger
+from flask import current_app
+
+
+CHUNK_SIZE = 3 * 16 * 1024  # a multiple of 3, so the encoded chunks join without padding
+
+_global_limit = None  # pylint: disable=invalid-name
+_global_limit_lock = threading.Lock()
+
+
+@dataclass
+class Attachment:  # pylint: disable=too-many-instance-attributes
+    """A pdf to fetch and attach to an email."""
+
+    file_name: str
+    url: str
+    method: str = 'GET'
+    params: Optional[dict] = None
+    json: Optional[dict] = None
+    expected_status: HTTPStatus = HTTPStatus.OK
+    description: str = ''
+    headers: dict = field(default_factory=dict)
+
+
+def fetch_pdfs(attachments: List[Attachment], token: str, filing_id) -> list:
+    """Fetch the attachments concurrently, returning the pdfs in the order given.
+
+    Attachments that fail to fetch are logged and left out, the attach order counts only the attached pdfs.
+    """
+    if not attachments:
+        return []
+
+    headers = {
+        'Accept': 'application/pdf',
+        'Authorization': f'Bearer {token}'
+    }
+    per_message = max(1, current_app.config.get('EMAILER_ATTACHMENT_CONCURRENCY_PER_MESSAGE', 4))
+    timeout = current_app.config.get('EMAILER_ATTACHMENT_TIMEOUT')
+    limit = _get_global_limit(current_app.config.get('EMAILER_ATTACHMENT_CONCURRENCY', 8))
+
+    workers = min(len(attachments), per_message)
+    if workers == 1:
+        encoded = [_fetch(attachment, headers, timeout, limit, filing_id) for attachment in attachments]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pdf-fetch') as executor:
+            futures = [executor.submit(_fetch, attachment, headers, timeout, limit, filing_id)
+                       for attachment in attachments]
+            encoded = [future.result() for future in futures]
+
+    pdfs = []
+    for attachment, file_bytes in zip(attachments, encoded):
+        if file_bytes is None:
+            continue
+        pdfs.append(
+            {
+                'fileName': attachment.file_name,
+                'fileBytes': file_bytes,
+                'fileUrl': '',
+                'attachOrder': str(len(pdfs) + 1)
+            }
+        )
+    return pdfs
+
+
+def encode_stream(chunks) -> str:
+    """Base64 encode the chunks as they arrive, giving the same result as encoding them joined."""
+    encoded = []
+    pending = b''
+    for chunk in chunks:
+        pending += chunk
+        aligned = len(pending) - len(pending) % 3
+        if aligned:
+            encoded.append(base64.b64encode(pending[:aligned]))
+            pending = pending[aligned:]
+    if pending:
+        encoded.append(base64.b64encode(pending))
+    return b''.join(encoded).decode('utf-8')
+
+
+def _get_global_limit(size: int) -> threading.BoundedSemaphore:
+    """Return the semaphore bounding the fetches of the process, creating it on first use."""
+    global _global_limit  # pylint: disable=global-statement,invalid-name
+    with _global_limit_lock:
+        if _global_limit is None:
+            _global_limit = threading.BoundedSemaphore(max(1, size))
+        return _global_limit
+
+
+def _fetch(attachment: Attachment,  # pylint: disable=too-many-arguments
+           headers: dict,
+           timeout: Optional[float],
+           limit: threading.BoundedSemaphore,
+           filing_id) -> Optional[str]:
+    """Fetch the attachment, returning it base64 encoded, or None if the service did not return it."""
+    description = attachment.description or attachment.file_name
+    with limit:
+        start = time.perf_counter()
+        with requests.request(attachment.method,
+                              attachment.url,
+                              params=attachment.params,
+                              json=attachment.json,
+                              headers={**headers, **attachment.headers},
+                              timeout=timeout,
+                              stream=True) as response:
+            if response.status_code != attachment.expected_status:
+                logger.error('Failed to get %s pdf for filing: %s', description, filing_id)
+                return None
+            encoded = encode_stream(response.iter_content(chunk_size=CHUNK_SIZE))
+        elapsed = (time.perf_counter() - start) * 1000
+    logger.info('Fetched %s pdf for filing: %s in %.0fms (%s bytes encoded)',
+                description, filing_id, elapsed, len(encoded))
+    return encoded
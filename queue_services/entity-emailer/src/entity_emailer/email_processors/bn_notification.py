@@ -14,24 +14,17 @@
 """Email processing rules and actions for business number notification."""
 from __future__ import annotations
 
-from pathlib import Path
-
 from entity_queue_common.service_utils import logger
-from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, CorpType, Filing, PartyRole
 
-from entity_emailer.email_processors import get_recipient_from_auth, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import get_recipient_from_auth, get_recipients
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def process(email_msg: dict) -> dict:
     """Build the email for Business Number notification."""
     logger.debug('bn notification: %s', email_msg)
 
-    # get template and fill in parts
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-BN.html').read_text()
-    filled_template = substitute_template_parts(template)
-
     # get filing and business json
     business = Business.find_by_identifier(email_msg['identifier'])
     filing_type = 'incorporationApplication'
@@ -41,7 +34,7 @@ def process(email_msg: dict) -> dict:
     corp_type = CorpType.find_by_id(business.legal_type)
 
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template('BC-BN.html')
     html_out = jnja_template.render(
         business=business.json(),
         entityDescription=corp_type.full_desc if corp_type else ''
@@ -64,16 +57,12 @@ def process_bn_move(email_msg: dict, token: str) -> dict:
     """Build the email for Business Number move notification."""
     logger.debug('bn move notification: %s', email_msg)
 
-    # get template and fill in parts
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BN-MOVE.html').read_text()
-    filled_template = substitute_template_parts(template)
-
     # get filing and business json
     business = Business.find_by_identifier(email_msg['identifier'])
     corp_type = CorpType.find_by_id(business.legal_type)
 
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template('BN-MOVE.html')
     html_out = jnja_template.render(
         business=business.json(),
         entityDescription=corp_type.full_desc if corp_type else '',
@@ -17,15 +17,14 @@ from __future__ import annotations
 import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Filing, UserRoles
 
-from entity_emailer.email_processors import get_filing_info, get_user_email_from_auth, substitute_template_parts
+from entity_emailer.email_processors import get_filing_info, get_user_email_from_auth
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def _get_pdfs(
@@ -123,12 +122,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(email_info['filingId'])
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/CHGREG-{status}.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'CHGREG-{status}.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
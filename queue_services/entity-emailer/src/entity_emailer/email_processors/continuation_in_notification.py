@@ -14,23 +14,20 @@
 """Email processing rules and actions for Continuation In notifications."""
 from __future__ import annotations
 
-import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Filing
 
 from entity_emailer.email_processors import (
     get_entity_dashboard_url,
     get_filing_info,
     get_recipients,
-    substitute_template_parts,
 )
+from entity_emailer.email_processors.attachment_fetcher import Attachment, fetch_pdfs
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def _get_pdfs(
@@ -40,38 +37,20 @@ def _get_pdfs(
         filing: Filing,
         filing_date_time: str,
         effective_date: str) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
+    # pylint: disable=too-many-arguments
     """Get the outputs for the Continuation In notification."""
-    pdfs = []
-    attach_order = 1
-    headers = {
-        'Accept': 'application/pdf',
-        'Authorization': f'Bearer {token}'
-    }
+    attachments = []
+    filing_url = f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
 
     if status == Filing.Status.PAID.value:
         # add filing pdf
-        filing_pdf = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-            headers=headers
-        )
-        if filing_pdf.status_code != HTTPStatus.OK:
-            logger.error('Failed to get pdf for filing: %s', filing.id)
-        else:
-            filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-            pdfs.append(
-                {
-                    'fileName': 'Continuation Application.pdf',
-                    'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+        attachments.append(Attachment('Continuation Application.pdf', filing_url, description='filing'))
 
         corp_name = business.get('legalName')
-        receipt = requests.post(
+        attachments.append(Attachment(
+            'Receipt.pdf',
             f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+            method='POST',
             json={
                 'corpName': corp_name,
                 'filingDateTime': filing_date_time,
@@ -79,61 +58,18 @@ def _get_pdfs(
                 'filingIdentifier': str(filing.id),
                 'businessNumber': business.get('taxId', '')
             },
-            headers=headers
-        )
-        if receipt.status_code != HTTPStatus.CREATED:
-            logger.error('Failed to get receipt pdf for filing: %s', filing.id)
-        else:
-            receipt_encoded = base64.b64encode(receipt.content)
-            pdfs.append(
-                {
-                    'fileName': 'Receipt.pdf',
-                    'fileBytes': receipt_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+            expected_status=HTTPStatus.CREATED,
+            description='receipt'
+        ))
     elif status == Filing.Status.COMPLETED.value:
         # add certificate of continuation
-        certificate = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-            '?type=certificateOfContinuation',
-            headers=headers
-        )
-        if certificate.status_code != HTTPStatus.OK:
-            logger.error('Failed to get certificate of continuation for filing: %s', filing.id)
-        else:
-            certificate_encoded = base64.b64encode(certificate.content)
-            pdfs.append(
-                {
-                    'fileName': 'Certificate of Continuation.pdf',
-                    'fileBytes': certificate_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+        attachments.append(Attachment('Certificate of Continuation.pdf',
+                                      f'{filing_url}?type=certificateOfContinuation',
+                                      description='certificate of continuation'))
         # add notice of articles
-        noa = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-            '?type=noticeOfArticles',
-            headers=headers
-        )
-        if noa.status_code != HTTPStatus.OK:
-            logger.error('Failed to get noa pdf for filing: %s', filing.id)
-        else:
-            noa_encoded = base64.b64encode(noa.content)
-            pdfs.append(
-                {
-                    'fileName': 'Notice of Articles.pdf',
-                    'fileBytes': noa_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
-    return pdfs
+        attachments.append(Attachment('Notice of Articles.pdf', f'{filing_url}?type=noticeOfArticles',
+                                      description='noa'))
+    return fetch_pdfs(attachments, token, filing.id)
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -149,12 +85,10 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
         business = filing_data['nameRequest']
         business['identifier'] = filing.temp_reg
 
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/CONT-IN-{status}.html').read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
     legal_type = business.get('legalType')
     numbered_description = Business.BUSINESSES.get(legal_type, {}).get('numberedDescription')
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'CONT-IN-{status}.html')
 
     html_out = jnja_template.render(
         business=business,
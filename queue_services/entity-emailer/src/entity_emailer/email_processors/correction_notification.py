@@ -17,18 +17,17 @@ from __future__ import annotations
 import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 from typing import Optional
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.core.filing_helper import is_special_resolution_correction_by_filing_json
 from legal_api.models import Filing
 
-from entity_emailer.email_processors import get_filing_info, substitute_template_parts
+from entity_emailer.email_processors import get_filing_info
 from entity_emailer.email_processors.special_resolution_helper import get_completed_pdfs
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def _get_pdfs(
@@ -153,12 +152,8 @@ def _get_template(prefix: str, status: str, filing_type: str, filing: Filing,  #
     """Return rendered template."""
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/{prefix}-CRCTN-{status}.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'{prefix}-CRCTN-{status}.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
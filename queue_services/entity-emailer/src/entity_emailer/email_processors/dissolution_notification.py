@@ -14,23 +14,20 @@
 """Email processing rules and actions for Dissolution Application notifications."""
 from __future__ import annotations
 
-import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Filing, UserRoles
 
 from entity_emailer.email_processors import (
     get_filing_info,
     get_recipient_from_auth,
     get_user_email_from_auth,
-    substitute_template_parts,
 )
+from entity_emailer.email_processors.attachment_fetcher import Attachment, fetch_pdfs
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def _get_pdfs(
@@ -40,41 +37,23 @@ def _get_pdfs(
         filing: Filing,
         filing_date_time: str,
         effective_date: str) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
+    # pylint: disable=too-many-arguments
     """Get the pdfs for the dissolution output."""
-    pdfs = []
-    attach_order = 1
-    headers = {
-        'Accept': 'application/pdf',
-        'Authorization': f'Bearer {token}'
-    }
+    attachments = []
     legal_type = business.get('legalType', None)
+    filing_url = f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
 
     if status == Filing.Status.PAID.value:
         # add filing pdf
         if legal_type not in ['SP', 'GP']:
-            filing_pdf = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-                headers=headers
-            )
-            if filing_pdf.status_code != HTTPStatus.OK:
-                logger.error('Failed to get pdf for filing: %s', filing.id)
-            else:
-                filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-                pdfs.append(
-                    {
-                        'fileName': 'Voluntary Dissolution Application.pdf',
-                        'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': str(attach_order)
-                    }
-                )
-                attach_order += 1
+            attachments.append(Attachment('Voluntary Dissolution Application.pdf', filing_url, description='filing'))
 
         corp_name = business.get('legalName')
         business_data = Business.find_by_internal_id(filing.business_id)
-        receipt = requests.post(
+        attachments.append(Attachment(
+            'Receipt.pdf',
             f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+            method='POST',
             json={
                 'corpName': corp_name,
                 'filingDateTime': filing_date_time,
@@ -82,104 +61,28 @@ def _get_pdfs(
                 'filingIdentifier': str(filing.id),
                 'businessNumber': business_data.tax_id if business_data and business_data.tax_id else ''
             },
-            headers=headers
-        )
-        if receipt.status_code != HTTPStatus.CREATED:
-            logger.error('Failed to get receipt pdf for filing: %s', filing.id)
-        else:
-            receipt_encoded = base64.b64encode(receipt.content)
-            pdfs.append(
-                {
-                    'fileName': 'Receipt.pdf',
-                    'fileBytes': receipt_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+            expected_status=HTTPStatus.CREATED,
+            description='receipt'
+        ))
     elif status == Filing.Status.COMPLETED.value:
         if legal_type in ['SP', 'GP']:
-            filing_pdf = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-                headers=headers
-            )
-            if filing_pdf.status_code != HTTPStatus.OK:
-                logger.error('Failed to get pdf for filing: %s', filing.id)
-            else:
-                filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-                pdfs.append(
-                    {
-                        'fileName': 'Statement of Dissolution.pdf',
-                        'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': str(attach_order)
-                    }
-                )
-                attach_order += 1
+            attachments.append(Attachment('Statement of Dissolution.pdf', filing_url, description='filing'))
         else:
             if filing.filing_sub_type != 'administrative':
                 # add certificateOfDissolution, suppress certificate of dissolution for admin dissolution
-                certificate = requests.get(
-                    f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                    '?type=certificateOfDissolution',
-                    headers=headers
-                )
-                if certificate.status_code != HTTPStatus.OK:
-                    logger.error('Failed to get certificateOfDissolution pdf for filing: %s', filing.id)
-                else:
-                    certificate_encoded = base64.b64encode(certificate.content)
-                    pdfs.append(
-                        {
-                            'fileName': 'Certificate of Dissolution.pdf',
-                            'fileBytes': certificate_encoded.decode('utf-8'),
-                            'fileUrl': '',
-                            'attachOrder': str(attach_order)
-                        }
-                    )
-                    attach_order += 1
+                attachments.append(Attachment('Certificate of Dissolution.pdf',
+                                              f'{filing_url}?type=certificateOfDissolution',
+                                              description='certificateOfDissolution'))
 
             if legal_type == Business.LegalTypes.COOP.value:
                 # certifiedAffidavit
-                certified_affidavit = requests.get(
-                    f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                    '?type=affidavit',
-                    headers=headers
-                )
-                if certified_affidavit.status_code != HTTPStatus.OK:
-                    logger.error('Failed to get affidavit pdf for filing: %s', filing.id)
-                else:
-                    certificate_encoded = base64.b64encode(certified_affidavit.content)
-                    pdfs.append(
-                        {
-                            'fileName': 'Certified Affidavit.pdf',
-                            'fileBytes': certificate_encoded.decode('utf-8'),
-                            'fileUrl': '',
-                            'attachOrder': str(attach_order)
-                        }
-                    )
-                    attach_order += 1
-
+                attachments.append(Attachment('Certified Affidavit.pdf', f'{filing_url}?type=affidavit',
+                                              description='affidavit'))
                 # specialResolution
-                special_resolution = requests.get(
-                    f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                    '?type=specialResolution',
-                    headers=headers
-                )
-                if special_resolution.status_code != HTTPStatus.OK:
-                    logger.error('Failed to get specialResolution pdf for filing: %s', filing.id)
-                else:
-                    certificate_encoded = base64.b64encode(special_resolution.content)
-                    pdfs.append(
-                        {
-                            'fileName': 'Certified Special Resolution.pdf',
-                            'fileBytes': certificate_encoded.decode('utf-8'),
-                            'fileUrl': '',
-                            'attachOrder': str(attach_order)
-                        }
-                    )
-                    attach_order += 1
-
-    return pdfs
+                attachments.append(Attachment('Certified Special Resolution.pdf',
+                                              f'{filing_url}?type=specialResolution',
+                                              description='specialResolution'))
+    return fetch_pdfs(attachments, token, filing.id)
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -192,12 +95,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
     legal_type = business.get('legalType', None)
 
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/DIS-{status}.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'DIS-{status}.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
@@ -14,15 +14,11 @@
 """Email processing rules and actions for Incorporation Application notifications."""
 from __future__ import annotations
 
-import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Filing, UserRoles
 
 from entity_emailer.email_processors import (
@@ -30,8 +26,9 @@ from entity_emailer.email_processors import (
     get_filing_info,
     get_recipients,
     get_user_email_from_auth,
-    substitute_template_parts,
 )
+from entity_emailer.email_processors.attachment_fetcher import Attachment, fetch_pdfs
+from entity_emailer.email_processors.template_registry import get_template
 
 
 FILING_TYPE_CONVERTER = {
@@ -50,40 +47,20 @@ def _get_pdfs(
         filing: Filing,
         filing_date_time: str,
         effective_date: str) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
+    # pylint: disable=too-many-arguments
     """Get the pdfs for the incorporation output."""
-    pdfs = []
-    attach_order = 1
-    headers = {
-        'Accept': 'application/pdf',
-        'Authorization': f'Bearer {token}'
-    }
+    attachments = []
     legal_type = business.get('legalType', None)
+    filing_url = f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
 
     if status == Filing.Status.PAID.value:
         # add filing pdf
-        filing_pdf = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-            headers=headers
-        )
-        if filing_pdf.status_code != HTTPStatus.OK:
-            logger.error('Failed to get pdf for filing: %s', filing.id)
-        else:
-            filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-            file_name = filing.filing_type[0].upper() + \
-                ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
-            if ar_date := filing.filing_json['filing'].get('annualReport', {}).get('annualReportDate'):
-                file_name = f'{ar_date[:4]} {file_name}'
+        file_name = filing.filing_type[0].upper() + \
+            ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
+        if ar_date := filing.filing_json['filing'].get('annualReport', {}).get('annualReportDate'):
+            file_name = f'{ar_date[:4]} {file_name}'
+        attachments.append(Attachment(f'{file_name}.pdf', filing_url, description='filing'))
 
-            pdfs.append(
-                {
-                    'fileName': f'{file_name}.pdf',
-                    'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
         # add receipt pdf
         if filing.filing_type == 'incorporationApplication':
             corp_name = filing.filing_json['filing']['incorporationApplication']['nameRequest'].get(
@@ -91,8 +68,10 @@ def _get_pdfs(
         else:
             corp_name = business.get('legalName')
 
-        receipt = requests.post(
+        attachments.append(Attachment(
+            'Receipt.pdf',
             f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+            method='POST',
             json={
                 'corpName': corp_name,
                 'filingDateTime': filing_date_time,
@@ -100,129 +79,35 @@ def _get_pdfs(
                 'filingIdentifier': str(filing.id),
                 'businessNumber': business.get('taxId', '')
             },
-            headers=headers
-        )
-        if receipt.status_code != HTTPStatus.CREATED:
-            logger.error('Failed to get receipt pdf for filing: %s', filing.id)
-        else:
-            receipt_encoded = base64.b64encode(receipt.content)
-            pdfs.append(
-                {
-                    'fileName': 'Receipt.pdf',
-                    'fileBytes': receipt_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': str(attach_order)
-                }
-            )
-            attach_order += 1
+            expected_status=HTTPStatus.CREATED,
+            description='receipt'
+        ))
     if status == Filing.Status.COMPLETED.value:
         if legal_type != Business.LegalTypes.COOP.value:
             # add notice of articles
-            noa = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=noticeOfArticles',
-                headers=headers
-            )
-            if noa.status_code != HTTPStatus.OK:
-                logger.error('Failed to get noa pdf for filing: %s', filing.id)
-            else:
-                noa_encoded = base64.b64encode(noa.content)
-                pdfs.append(
-                    {
-                        'fileName': 'Notice of Articles.pdf',
-                        'fileBytes': noa_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': str(attach_order)
-                    }
-                )
-                attach_order += 1
+            attachments.append(Attachment('Notice of Articles.pdf', f'{filing_url}?type=noticeOfArticles',
+                                          description='noa'))
 
         if filing.filing_type == 'incorporationApplication':
             # add certificate
-            certificate = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=certificate',
-                headers=headers
-            )
-            if certificate.status_code != HTTPStatus.OK:
-                logger.error('Failed to get certificate pdf for filing: %s', filing.id)
-            else:
-                certificate_encoded = base64.b64encode(certificate.content)
-                file_name = 'Incorporation Certificate.pdf'
-                pdfs.append(
-                    {
-                        'fileName': file_name,
-                        'fileBytes': certificate_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': str(attach_order)
-                    }
-                )
-                attach_order += 1
+            attachments.append(Attachment('Incorporation Certificate.pdf', f'{filing_url}?type=certificate',
+                                          description='certificate'))
 
             if legal_type == Business.LegalTypes.COOP.value:
                 # Add rules
-                rules = requests.get(
-                    f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                    '?type=certifiedRules',
-                    headers=headers
-                )
-                if rules.status_code != HTTPStatus.OK:
-                    logger.error('Failed to get certifiedRules pdf for filing: %s', filing.id)
-                else:
-                    certified_rules_encoded = base64.b64encode(rules.content)
-                    pdfs.append(
-                        {
-                            'fileName': 'Certified Rules.pdf',
-                            'fileBytes': certified_rules_encoded.decode('utf-8'),
-                            'fileUrl': '',
-                            'attachOrder': str(attach_order)
-                        }
-                    )
-                    attach_order += 1
-
+                attachments.append(Attachment('Certified Rules.pdf', f'{filing_url}?type=certifiedRules',
+                                              description='certifiedRules'))
                 # Add memorandum
-                memorandum = requests.get(
-                    f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                    '?type=certifiedMemorandum',
-                    headers=headers
-                )
-                if memorandum.status_code != HTTPStatus.OK:
-                    logger.error('Failed to get certifiedMemorandum pdf for filing: %s', filing.id)
-                else:
-                    certified_memorandum_encoded = base64.b64encode(memorandum.content)
-                    pdfs.append(
-                        {
-                            'fileName': 'Certified Memorandum.pdf',
-                            'fileBytes': certified_memorandum_encoded.decode('utf-8'),
-                            'fileUrl': '',
-                            'attachOrder': str(attach_order)
-                        }
-                    )
-                    attach_order += 1
+                attachments.append(Attachment('Certified Memorandum.pdf', f'{filing_url}?type=certifiedMemorandum',
+                                              description='certifiedMemorandum'))
 
         if filing.filing_type == 'alteration' and get_additional_info(filing).get('nameChange', False):
             # add certificate of name change
-            certificate = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=certificateOfNameChange',
-                headers=headers
-            )
-            if certificate.status_code != HTTPStatus.OK:
-                logger.error('Failed to get certificateOfNameChange pdf for filing: %s', filing.id)
-            else:
-                certificate_encoded = base64.b64encode(certificate.content)
-                file_name = 'Certificate of Name Change.pdf'
-                pdfs.append(
-                    {
-                        'fileName': file_name,
-                        'fileBytes': certificate_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': str(attach_order)
-                    }
-                )
-                attach_order += 1
+            attachments.append(Attachment('Certificate of Name Change.pdf',
+                                          f'{filing_url}?type=certificateOfNameChange',
+                                          description='certificateOfNameChange'))
 
-    return pdfs
+    return fetch_pdfs(attachments, token, filing.id)
 
 
 def process(  # pylint: disable=too-many-locals, too-many-statements, too-many-branches
@@ -240,13 +125,9 @@ def process(  # pylint: disable=too-many-locals, too-many-statements, too-many-b
     legal_type = business.get('legalType')
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/BC-{FILING_TYPE_CONVERTER[filing_type]}-{status}.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
     numbered_description = Business.BUSINESSES.get(legal_type, {}).get('numberedDescription')
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'BC-{FILING_TYPE_CONVERTER[filing_type]}-{status}.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
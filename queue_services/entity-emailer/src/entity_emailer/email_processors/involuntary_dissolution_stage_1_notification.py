@@ -17,15 +17,14 @@ from __future__ import annotations
 import base64
 from datetime import datetime
 from http import HTTPStatus
-from pathlib import Path
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Furnishing
 
-from entity_emailer.email_processors import get_entity_dashboard_url, get_jurisdictions, substitute_template_parts
+from entity_emailer.email_processors import get_entity_dashboard_url, get_jurisdictions
+from entity_emailer.email_processors.template_registry import get_template
 
 
 PROCESSABLE_FURNISHING_NAMES = [
@@ -45,12 +44,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     business = furnishing.business
     business_identifier = business.identifier
     # get template
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/INVOL-DIS-STAGE-1.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template('INVOL-DIS-STAGE-1.html')
     # get response from get jurisdictions
     jurisdictions_response = get_jurisdictions(business_identifier, token)
     # get extra provincials array
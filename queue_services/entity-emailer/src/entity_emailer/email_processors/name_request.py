@@ -16,15 +16,14 @@ from __future__ import annotations
 
 import base64
 from http import HTTPStatus
-from pathlib import Path
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.services import NameXService
+from legal_api.services.service_account_token import service_account_tokens
 
-from entity_emailer.email_processors import substitute_template_parts
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def process(email_info: dict) -> dict:
@@ -32,10 +31,8 @@ def process(email_info: dict) -> dict:
     logger.debug('NR_notification: %s', email_info)
     nr_number = email_info['identifier']
     payment_token = email_info.get('data', {}).get('request', {}).get('paymentToken', '')
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/NR-PAID.html').read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    mail_template = Template(filled_template, autoescape=True)
+    mail_template = get_template('NR-PAID.html')
     html_out = mail_template.render(
         identifier=nr_number
     )
@@ -126,19 +123,10 @@ def _get_pdfs(nr_id: str, payment_token: str) -> list:
 
 
 def get_nr_bearer_token():
-    """Get a valid Bearer token for the Name Request Service."""
-    token_url = current_app.config.get('NAMEX_AUTH_SVC_URL')
-    client_id = current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME')
-    client_secret = current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET')
-
-    data = 'grant_type=client_credentials'
-    # get service account token
-    res = requests.post(url=token_url,
-                        data=data,
-                        headers={'content-type': 'application/x-www-form-urlencoded'},
-                        auth=(client_id, client_secret))
-    try:
-        return res.json().get('access_token')
-    except Exception:  # noqa B902; pylint: disable=W0703;
+    """Get a valid Bearer token for the Name Request Service, shared with the rest of the process until it expires."""
+    token = service_account_tokens.get_token(current_app.config.get('NAMEX_AUTH_SVC_URL'),
+                                             current_app.config.get('NAMEX_SERVICE_CLIENT_USERNAME'),
+                                             current_app.config.get('NAMEX_SERVICE_CLIENT_SECRET'))
+    if not token:
         logger.error('Failed to get nr token')
-        return None
+    return token
@@ -17,15 +17,13 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 from http import HTTPStatus
-from pathlib import Path
 
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.services import NameXService
 from legal_api.utils.legislation_datetime import LegislationDatetime
 
-from entity_emailer.email_processors import substitute_template_parts
+from entity_emailer.email_processors.template_registry import get_template
 
 
 class Option(Enum):
@@ -110,11 +108,8 @@ def process(email_info: dict, option) -> dict:  # pylint: disable-msg=too-many-l
                 instruction_group = '-' + group
                 file_name_suffix += instruction_group.upper()
 
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/NR-{file_name_suffix}.html').read_text()
-    filled_template = substitute_template_parts(template)
-
     # render template with vars
-    mail_template = Template(filled_template, autoescape=True)
+    mail_template = get_template(f'NR-{file_name_suffix}.html')
     html_out = mail_template.render(
         nr_number=nr_number,
         expiration_date=expiration_date,
@@ -17,15 +17,14 @@ from __future__ import annotations
 import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, CorpType, Filing
 
-from entity_emailer.email_processors import get_entity_dashboard_url, get_filing_info, substitute_template_parts
+from entity_emailer.email_processors import get_entity_dashboard_url, get_filing_info
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def _get_pdfs(
@@ -107,12 +106,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     name_request = filing.json['filing']['registration']['nameRequest']
     corp_type = CorpType.find_by_id(name_request.get('legalType'))
 
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/REG-{status}.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'REG-{status}.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     html_out = jnja_template.render(
         business=business,
@@ -14,72 +14,32 @@
 """Email processing rules and actions for Restoration Application notifications."""
 from __future__ import annotations
 
-import base64
 import re
 from http import HTTPStatus
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Environment, FileSystemLoader
 from legal_api.models import Business, CorpType, Filing
 
 from entity_emailer.email_processors import get_filing_info
+from entity_emailer.email_processors.attachment_fetcher import Attachment, fetch_pdfs
+from entity_emailer.email_processors.template_registry import template_registry
 
 
 def _get_completed_pdfs(
         token: str,
         business: dict,
         filing: Filing) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
     """Get the pdfs for the restoration output."""
-    pdfs = []
-    attach_order = 1
-    headers = {
-        'Accept': 'application/pdf',
-        'Authorization': f'Bearer {token}'
-    }
-
-    # add notice of articles
-    noa = requests.get(
-        f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-        params={'type': 'noticeOfArticles'},
-        headers=headers
-    )
-    if noa.status_code != HTTPStatus.OK:
-        logger.error('Failed to get noa pdf for filing: %s', filing.id)
-    else:
-        noa_encoded = base64.b64encode(noa.content)
-        pdfs.append(
-            {
-                'fileName': 'Notice of Articles.pdf',
-                'fileBytes': noa_encoded.decode('utf-8'),
-                'fileUrl': '',
-                'attachOrder': str(attach_order)
-            }
-        )
-        attach_order += 1
-    # add certificate of restoration
-    certificate = requests.get(
-        f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-        '?type=certificateOfRestoration',
-        headers=headers
-    )
-    if certificate.status_code != HTTPStatus.OK:
-        logger.error('Failed to get certificate pdf for filing: %s', filing.id)
-    else:
-        certificate_encoded = base64.b64encode(certificate.content)
-        pdfs.append(
-            {
-                'fileName': 'Certificate of Restoration.pdf',
-                'fileBytes': certificate_encoded.decode('utf-8'),
-                'fileUrl': '',
-                'attachOrder': str(attach_order)
-            }
-        )
-        attach_order += 1
-
-    return pdfs
+    filing_url = f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
+    attachments = [
+        # add notice of articles
+        Attachment('Notice of Articles.pdf', filing_url, params={'type': 'noticeOfArticles'}, description='noa'),
+        # add certificate of restoration
+        Attachment('Certificate of Restoration.pdf', f'{filing_url}?type=certificateOfRestoration',
+                   description='certificate')
+    ]
+    return fetch_pdfs(attachments, token, filing.id)
 
 
 def _get_paid_pdfs(
@@ -88,61 +48,31 @@ def _get_paid_pdfs(
         filing: Filing,
         filing_date_time: str,
         effective_date: str) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
     """Get the pdfs for the restoration output."""
-    pdfs = []
-    attach_order = 1
-    headers = {
-        'Accept': 'application/pdf',
-        'Authorization': f'Bearer {token}'
-    }
-
-    filing_pdf = requests.get(
-        f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-        headers=headers
-    )
-    if filing_pdf.status_code != HTTPStatus.OK:
-        logger.error('Failed to get pdf for filing: %s', filing.id)
-    else:
-        filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-        pdfs.append(
-            {
-                'fileName': 'Restoration Application.pdf',
-                'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                'fileUrl': '',
-                'attachOrder': str(attach_order)
-            }
-        )
-        attach_order += 1
     name_request = filing.json['filing']['restoration']['nameRequest']
     corp_name = name_request.get('legalName')
     business_data = Business.find_by_internal_id(filing.business_id)
-    receipt = requests.post(
-        f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
-        json={
-            'corpName': corp_name,
-            'filingDateTime': filing_date_time,
-            'effectiveDateTime': effective_date if effective_date != filing_date_time else '',
-            'filingIdentifier': str(filing.id),
-            'businessNumber': business_data.tax_id if business_data and business_data.tax_id else ''
-        },
-        headers=headers
-    )
-    if receipt.status_code != HTTPStatus.CREATED:
-        logger.error('Failed to get receipt pdf for filing: %s', filing.id)
-    else:
-        receipt_encoded = base64.b64encode(receipt.content)
-        pdfs.append(
-            {
-                'fileName': 'Receipt.pdf',
-                'fileBytes': receipt_encoded.decode('utf-8'),
-                'fileUrl': '',
-                'attachOrder': str(attach_order)
-            }
+    attachments = [
+        Attachment('Restoration Application.pdf',
+                   f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}'
+                   f'/filings/{filing.id}',
+                   description='filing'),
+        Attachment(
+            'Receipt.pdf',
+            f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+            method='POST',
+            json={
+                'corpName': corp_name,
+                'filingDateTime': filing_date_time,
+                'effectiveDateTime': effective_date if effective_date != filing_date_time else '',
+                'filingIdentifier': str(filing.id),
+                'businessNumber': business_data.tax_id if business_data and business_data.tax_id else ''
+            },
+            expected_status=HTTPStatus.CREATED,
+            description='receipt'
         )
-        attach_order += 1
-
-    return pdfs
+    ]
+    return fetch_pdfs(attachments, token, filing.id)
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -159,14 +89,9 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     corp_type = CorpType.find_by_id(filing_business.get('legalType'))
     restoration_type = filing.json['filing']['restoration']['type']
 
-    # create the jinja environment
-    jinja_env = Environment(
-        loader=FileSystemLoader(current_app.config.get('TEMPLATE_PATH')),
-        autoescape=True
-    )
     # look for a template in this format RES-fullRestoration-PAID.html
     # if the template doesn't exists use RES-PAID.html
-    template = jinja_env.select_template([
+    template = template_registry.select_template([
         f'RES-{restoration_type}-{status}.jinja2',
         f'RES-{status}.jinja2'
     ])
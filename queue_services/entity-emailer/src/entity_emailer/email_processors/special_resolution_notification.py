@@ -15,20 +15,18 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
 
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Filing, UserRoles
 
 from entity_emailer.email_processors import (
     get_filing_info,
     get_recipient_from_auth,
     get_user_email_from_auth,
-    substitute_template_parts,
 )
 from entity_emailer.email_processors.special_resolution_helper import get_completed_pdfs, get_paid_pdfs
+from entity_emailer.email_processors.template_registry import get_template
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, too-many-branches
@@ -40,12 +38,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(email_info['filingId'])
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
-    template = Path(
-        f'{current_app.config.get("TEMPLATE_PATH")}/SR-CP-{status}.html'
-    ).read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
+    jnja_template = get_template(f'SR-CP-{status}.html')
     filing_data = (filing.json)['filing'][f'{filing_type}']
     name_changed = filing.filing_json['filing'].get('changeOfName')
     rules_changed = bool(filing.filing_json['filing'].get('alteration', {}).get('rulesFileKey'))
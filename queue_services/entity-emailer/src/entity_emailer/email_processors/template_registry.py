@@ -0,0 +1,134 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Registry of the compiled email templates.
+
+The templates are loaded from TEMPLATE_PATH through one shared jinja environment, with the [[partname.html]]
+template parts inlined as they are loaded. Each template is compiled once per process and kept by the environment,
+so building an email only renders it. The compiled code is also kept in a bytecode cache, which spares the compile
+on a restart.
+
+With TEMPLATE_AUTO_RELOAD set (on in development), a template is reloaded when it or any of the parts change.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, List, Tuple
+
+from flask import current_app
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from entity_emailer.email_processors import TEMPLATE_PARTS
+
+
+class PartsLoader(FileSystemLoader):
+    """Load templates from the template path, with the template parts substituted in."""
+
+    def __init__(self, template_path: str):
+        """Create the loader for the templates in template_path."""
+        super().__init__(template_path)
+        self.parts_path = os.path.join(template_path, 'common')
+        self._parts: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get_source(self, environment, template):
+        """Return the source of the template, with the template parts inlined."""
+        source, filename, uptodate = super().get_source(environment, template)
+        parts_mtime = self._parts_mtime()
+        for part, part_source in self._get_parts().items():
+            source = source.replace(f'[[{part}.html]]', part_source)
+
+        def parts_uptodate():
+            return uptodate() and self._parts_mtime() == parts_mtime
+
+        return source, filename, parts_uptodate
+
+    def _get_parts(self) -> Dict[str, str]:
+        """Return the source of the template parts, reading the ones that changed since they were last read."""
+        with self._lock:
+            parts = {}
+            for part in TEMPLATE_PARTS:
+                path = os.path.join(self.parts_path, f'{part}.html')
+                mtime = os.path.getmtime(path)
+                cached = self._parts.get(part)
+                if not cached or cached[0] != mtime:
+                    with open(path, encoding='utf-8') as part_file:
+                        cached = (mtime, part_file.read())
+                    self._parts[part] = cached
+                parts[part] = cached[1]
+            return parts
+
+    def _parts_mtime(self) -> float:
+        """Return the time the template parts were last changed."""
+        return max(os.path.getmtime(os.path.join(self.parts_path, f'{part}.html')) for part in TEMPLATE_PARTS)
+
+
+class TemplateRegistry:
+    """Hand out the compiled email templates, from an environment built on first use."""
+
+    def __init__(self):
+        """Create the registry, the environment is built from the app config on first use."""
+        self._environment = None
+        self._template_path = None
+        self._lock = threading.Lock()
+
+    @property
+    def environment(self) -> Environment:
+        """Return the shared environment for the configured template path."""
+        template_path = current_app.config.get('TEMPLATE_PATH')
+        with self._lock:
+            if self._environment is None or self._template_path != template_path:
+                self._environment = self._create_environment(template_path)
+                self._template_path = template_path
+            return self._environment
+
+    def get_template(self, name: str) -> Template:
+        """Return the compiled template."""
+        return self.environment.get_template(name)
+
+    def select_template(self, names: List[str]) -> Template:
+        """Return the first of the compiled templates that exists."""
+        return self.environment.select_template(names)
+
+    def clear(self):
+        """Drop the environment and the templates compiled by it."""
+        with self._lock:
+            self._environment = None
+            self._template_path = None
+
+    @staticmethod
+    def _create_environment(template_path: str) -> Environment:
+        """Create the environment for the templates in template_path."""
+        bytecode_cache = None
+        if current_app.config.get('TEMPLATE_BYTECODE_CACHE', True):
+            cache_dir = current_app.config.get('TEMPLATE_BYTECODE_CACHE_DIR')
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+        return Environment(
+            loader=PartsLoader(template_path),
+            autoescape=True,
+            auto_reload=current_app.config.get('TEMPLATE_AUTO_RELOAD', False),
+            cache_size=-1,
+            bytecode_cache=bytecode_cache
+        )
+
+
+template_registry = TemplateRegistry()  # pylint: disable=invalid-name
+
+
+def get_template(name: str) -> Template:
+    """Return the compiled email template."""
+    return template_registry.get_template(name)
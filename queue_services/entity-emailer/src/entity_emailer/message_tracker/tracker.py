@@ -19,7 +19,6 @@ import nats
 from flask import current_app
 
 from entity_emailer.email_processors import filing_notification, involuntary_dissolution_stage_1_notification
-from tracker.models import MessageProcessing
 from tracker.services import MessageProcessingService
 
 
@@ -142,117 +141,48 @@ def create_message_context_properties(message_type, message_id, source, identifi
     }
 
 
-def is_processable_message(message_context_properties: dict):
-    """Determine if message needs to be processed."""
-    msg = None
+def claim_message(message_context_properties: dict, email_msg: dict):
+    """Claim the message for processing, returning whether to process it and the tracked message.
+
+    The message is claimed, created or moved from FAILED to PROCESSING, in a single statement, so when several
+    emailers receive the same message only one of them processes it.
+    """
     is_cloud_event_format = message_context_properties.get('is_cloud_event_format')
     source = message_context_properties.get('source')
     message_id = message_context_properties.get('message_id')
 
-    if is_cloud_event_format:
-        if source is None or message_id is None:
-            return False, None
-        msg: MessageProcessing = \
-            MessageProcessingService.find_message_by_source_and_message_id(source, message_id)
-    else:
-        if message_id is None:
-            return False, None
-        msg: MessageProcessing = \
-            MessageProcessingService.find_message_by_message_id(message_id)
+    if message_id is None or (is_cloud_event_format and source is None):
+        return False, None
 
     # limit total number of retries to 1 + msg_retry_num
-    msg_retry_num = current_app.config.get('MSG_RETRY_NUM')
-    if msg and msg.message_seen_count > msg_retry_num:
-        return False, msg
-
-    if msg is None or msg.status == MessageProcessing.Status.FAILED.value:
-        return True, msg
-
-    return False, msg
-
-
-def start_tracking_message(message_context_properties: dict, email_msg: dict, existing_tracker_msg: MessageProcessing):
-    """Create a new message with PROCESSING status or update an existing message to PROCESSING status."""
-    if existing_tracker_msg:
-        return update_message_status_to_processing(existing_tracker_msg)
-
-    return create_processing_message(message_context_properties, email_msg)
+    tracker_msg = MessageProcessingService.claim_message(
+        message_id=message_id,
+        source=source,
+        identifier=message_context_properties.get('identifier'),
+        message_type=message_context_properties.get('type'),
+        message_json=email_msg,
+        retry_limit=current_app.config.get('MSG_RETRY_NUM')
+    )
+    return tracker_msg is not None, tracker_msg
 
 
-def complete_tracking_message(tracker_msg: MessageProcessing):
-    """Update existing message state to COMPLETED."""
-    update_message_status_to_complete(tracker_msg)
+def complete_tracking_message(tracker_msg):
+    """Update the claimed message state to COMPLETE."""
+    MessageProcessingService.complete_message(tracker_msg.message_id)
 
 
 def mark_tracking_message_as_failed(message_context_properties: dict,
                                     email_msg: dict,
-                                    existing_tracker_msg: MessageProcessing,
                                     error_details: str):
     """Create a new message with FAILED status or update an existing message to FAILED status."""
     if error_details and len(error_details) > 1000:
         error_details = error_details[:1000]
 
-    if existing_tracker_msg \
-            and existing_tracker_msg.status == MessageProcessing.Status.PROCESSING.value:
-        return update_message_status_to_failed(existing_tracker_msg, error_details)
-
-    if existing_tracker_msg \
-            and existing_tracker_msg.status == MessageProcessing.Status.FAILED.value:
-        return update_failed_message(existing_tracker_msg, error_details)
-
-    return create_failed_message(message_context_properties, email_msg, error_details)
-
-
-def create_message(message_context_properties: dict,
-                   msg: str,
-                   status: MessageProcessing.Status,
-                   error_details: None):
-    """Create MessageProcessing record."""
-    message_id = message_context_properties.get('message_id')
-    source = message_context_properties.get('source')
-    identifier = message_context_properties.get('identifier')
-    message_type = message_context_properties.get('type')
-    new_status = status
-    message_json = msg
-
-    result = MessageProcessingService.create_message(
-        message_id=message_id,
-        source=source,
-        identifier=identifier,
-        message_type=message_type,
-        status=new_status,
-        message_json=message_json,
-        last_error=error_details,
-        seen_count=1
+    return MessageProcessingService.fail_message(
+        message_id=message_context_properties.get('message_id'),
+        source=message_context_properties.get('source'),
+        identifier=message_context_properties.get('identifier'),
+        message_type=message_context_properties.get('type'),
+        message_json=email_msg,
+        last_error=error_details
     )
-    return result
-
-
-def create_processing_message(message_context_properties: dict, msg: str):
-    """Create message with status of PROCESSING."""
-    return create_message(message_context_properties, msg, MessageProcessing.Status.PROCESSING, None)
-
-
-def create_failed_message(message_context_properties: dict, msg: str, error_details: str):
-    """Create message with status of FAILED."""
-    return create_message(message_context_properties, msg, MessageProcessing.Status.FAILED, error_details)
-
-
-def update_message_status_to_processing(msg: MessageProcessing):
-    """Update existing message status to PROCESSING."""
-    return MessageProcessingService.update_message_status(msg, MessageProcessing.Status.PROCESSING, None, True)
-
-
-def update_message_status_to_complete(tracker_msg: MessageProcessing):
-    """Update existing message status to COMPLETE."""
-    MessageProcessingService.update_message_status(tracker_msg, MessageProcessing.Status.COMPLETE, None, False)
-
-
-def update_message_status_to_failed(msg: MessageProcessing, error_details: str):
-    """Update existing message status to FAILED."""
-    return MessageProcessingService.update_message_status(msg, MessageProcessing.Status.FAILED, error_details, False)
-
-
-def update_failed_message(msg: MessageProcessing, error_details: str):
-    """Update error message for existing failed message."""
-    return MessageProcessingService.update_message_last_error(msg, error_details, False)
@@ -233,9 +233,8 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
             email_msg = json.loads(msg.data.decode('utf-8'))
             logger.debug('Extracted email msg: %s', email_msg)
             message_context_properties = tracker_util.get_message_context_properties(msg)
-            process_message, tracker_msg = tracker_util.is_processable_message(message_context_properties)
+            process_message, tracker_msg = tracker_util.claim_message(message_context_properties, email_msg)
             if process_message:
-                tracker_msg = tracker_util.start_tracking_message(message_context_properties, email_msg, tracker_msg)
                 process_email(email_msg, FLASK_APP)
                 tracker_util.complete_tracking_message(tracker_msg)
             else:
@@ -247,7 +246,6 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
             error_details = f'OperationalError - {str(err)}'
             tracker_util.mark_tracking_message_as_failed(message_context_properties,
                                                          email_msg,
-                                                         tracker_msg,
                                                          error_details)
             raise err  # We don't want to handle the error, as a DB down would drain the queue
         except EmailException as err:
@@ -257,7 +255,6 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
             error_details = f'EmailException - {str(err)}'
             tracker_util.mark_tracking_message_as_failed(message_context_properties,
                                                          email_msg,
-                                                         tracker_msg,
                                                          error_details)
             raise err  # we don't want to handle the error, so that the message gets put back on the queue
         except (QueueException, Exception) as err:  # noqa B902; pylint: disable=W0703;
@@ -266,5 +263,4 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
             error_details = f'QueueException, Exception - {str(err)}'
             tracker_util.mark_tracking_message_as_failed(message_context_properties,
                                                          email_msg,
-                                                         tracker_msg,
                                                          error_details)
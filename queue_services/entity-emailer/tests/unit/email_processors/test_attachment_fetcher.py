@@ -0,0 +1,67 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Unit Tests for the pdf attachment fetcher."""
+import base64
+from http import HTTPStatus
+
+import pytest
+import requests_mock
+
+from entity_emailer.email_processors.attachment_fetcher import Attachment, encode_stream, fetch_pdfs
+
+
+@pytest.mark.parametrize('chunks', [
+    [],
+    [b'a'],
+    [b'ab', b'c', b'defg'],
+    [b'pdf_content_' * 100, b'x', b'yz' * 7],
+])
+def test_encode_stream(chunks):
+    """Assert the streamed encoding matches encoding the whole content."""
+    assert encode_stream(iter(chunks)) == base64.b64encode(b''.join(chunks)).decode('utf-8')
+
+
+def test_fetch_pdfs(app):
+    """Assert the pdfs are returned in order, without the failed ones, and numbered in order."""
+    attachments = [
+        Attachment('Filing.pdf', 'https://legal-api-url/filings/1', description='filing'),
+        Attachment('Missing.pdf', 'https://legal-api-url/filings/1?type=missing', description='missing'),
+        Attachment('Notice of Articles.pdf', 'https://legal-api-url/filings/1',
+                   params={'type': 'noticeOfArticles'}, description='noa'),
+        Attachment('Receipt.pdf', 'https://pay-api-url/token/receipts', method='POST', json={'corpName': 'name'},
+                   expected_status=HTTPStatus.CREATED, description='receipt')
+    ]
+    with app.app_context():
+        with requests_mock.Mocker() as m:
+            m.get('https://legal-api-url/filings/1', content=b'filing_content')
+            m.get('https://legal-api-url/filings/1?type=missing', status_code=HTTPStatus.NOT_FOUND)
+            m.get('https://legal-api-url/filings/1?type=noticeOfArticles', content=b'noa_content')
+            m.post('https://pay-api-url/token/receipts', content=b'receipt_content', status_code=HTTPStatus.CREATED)
+
+            pdfs = fetch_pdfs(attachments, 'token', 1)
+
+            assert all(request.headers['Authorization'] == 'Bearer token' for request in m.request_history)
+            assert next(request for request in m.request_history
+                        if request.method == 'POST').json() == {'corpName': 'name'}
+
+    assert [pdf['fileName'] for pdf in pdfs] == ['Filing.pdf', 'Notice of Articles.pdf', 'Receipt.pdf']
+    assert [pdf['attachOrder'] for pdf in pdfs] == ['1', '2', '3']
+    assert [base64.b64decode(pdf['fileBytes']) for pdf in pdfs] == \
+        [b'filing_content', b'noa_content', b'receipt_content']
+
+
+def test_fetch_pdfs_none(app):
+    """Assert no attachments gives no pdfs."""
+    with app.app_context():
+        assert fetch_pdfs([], 'token', 1) == []
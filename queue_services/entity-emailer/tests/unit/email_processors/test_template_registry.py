@@ -0,0 +1,67 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Unit Tests for the email template registry."""
+import os
+
+import pytest
+
+from entity_emailer.email_processors import TEMPLATE_PARTS
+from entity_emailer.email_processors.template_registry import get_template, template_registry
+
+
+@pytest.fixture()
+def template_path(app, tmp_path):
+    """Point the app at a template folder holding a template and the template parts."""
+    (tmp_path / 'common').mkdir()
+    for part in TEMPLATE_PARTS:
+        (tmp_path / 'common' / f'{part}.html').write_text(f'<{part}/>')
+    (tmp_path / 'TEST.html').write_text('[[header.html]]<p>{{ name }}</p>[[footer.html]]')
+
+    original_path = app.config.get('TEMPLATE_PATH')
+    original_reload = app.config.get('TEMPLATE_AUTO_RELOAD')
+    app.config['TEMPLATE_PATH'] = str(tmp_path)
+    app.config['TEMPLATE_BYTECODE_CACHE_DIR'] = str(tmp_path / 'cache')
+    template_registry.clear()
+    yield tmp_path
+    app.config['TEMPLATE_PATH'] = original_path
+    app.config['TEMPLATE_AUTO_RELOAD'] = original_reload
+    app.config.pop('TEMPLATE_BYTECODE_CACHE_DIR')
+    template_registry.clear()
+
+
+def test_get_template(app, template_path):
+    """Assert the template has the parts inlined, is escaped and is compiled once."""
+    with app.app_context():
+        template = get_template('TEST.html')
+        assert template.render(name='<b>') == '<header/><p>&lt;b&gt;</p><footer/>'
+        assert get_template('TEST.html') is template
+        assert os.listdir(template_path / 'cache')
+
+
+@pytest.mark.parametrize('auto_reload, expected', [
+    (False, '<header/><p>name</p><footer/>'),
+    (True, '<new-header/><p>name</p><footer/>'),
+])
+def test_get_template_reload(app, template_path, auto_reload, expected):
+    """Assert a changed template part is picked up only when auto reload is on."""
+    app.config['TEMPLATE_AUTO_RELOAD'] = auto_reload
+    with app.app_context():
+        assert get_template('TEST.html').render(name='name') == '<header/><p>name</p><footer/>'
+
+        header = template_path / 'common' / 'header.html'
+        header.write_text('<new-header/>')
+        mtime = os.path.getmtime(header) + 10
+        os.utime(header, (mtime, mtime))
+
+        assert get_template('TEST.html').render(name='name') == expected
@@ -19,6 +19,7 @@ from entity_queue_common.service_utils import EmailException, QueueException  #
 from sqlalchemy.exc import OperationalError
 
 from entity_emailer import worker
+from entity_emailer.message_tracker import tracker as tracker_util
 from tracker.models import MessageProcessing
 
 from . import create_mock_message  # noqa: I003
@@ -555,3 +556,39 @@ async def test_should_correctly_track_retries_for_failed_processing(tracker_app,
     # check email retries not exceed the max retry limit
     assert result.message_seen_count == 6
     assert expected_last_error in result.last_error
+
+
+def test_should_claim_message_once(tracker_app, tracker_db, session):
+    """Assert that a message being processed can't be claimed again until it has failed."""
+    message_context_properties = {
+        'type': 'bc.registry.names.request',
+        'message_id': '16fd2111-8baf-433b-82eb-8c7fada84fff',
+        'source': 'nr_pay',
+        'identifier': '781020202',
+        'is_cloud_event_format': True
+    }
+    email_msg = {'id': message_context_properties['message_id']}
+
+    with worker.FLASK_APP.app_context():
+        claimed, tracker_msg = tracker_util.claim_message(message_context_properties, email_msg)
+        assert claimed
+        assert tracker_msg.status == 'PROCESSING'
+        assert tracker_msg.message_seen_count == 1
+
+        # another emailer receiving the same message doesn't get it
+        claimed, tracker_msg = tracker_util.claim_message(message_context_properties, email_msg)
+        assert not claimed
+        assert tracker_msg is None
+
+        tracker_util.mark_tracking_message_as_failed(message_context_properties, email_msg, 'error')
+        claimed, tracker_msg = tracker_util.claim_message(message_context_properties, email_msg)
+        assert claimed
+        assert tracker_msg.message_seen_count == 2
+        assert tracker_msg.last_error == 'error'
+
+        tracker_util.complete_tracking_message(tracker_msg)
+        # a completed message stays completed
+        assert tracker_util.mark_tracking_message_as_failed(message_context_properties, email_msg, 'late') is None
+        result = MessageProcessing.find_message_by_message_id(message_id=message_context_properties['message_id'])
+        assert result.status == 'COMPLETE'
+        assert result.last_error == 'error'
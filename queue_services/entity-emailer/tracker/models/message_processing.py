@@ -19,7 +19,8 @@ The MessageProcessing class and Schema are held in this module.
 
 from datetime import datetime
 from enum import Enum
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import JSONB, insert
 
 from . import db
 
@@ -78,3 +79,30 @@ class MessageProcessing(db.Model):
                        message_id=message_id)
         result = q.one_or_none()
         return result
+
+    @staticmethod
+    def upsert(values: dict, update: dict, where):
+        """Insert the message, or apply update to the existing one if it meets the where clause.
+
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement, returning the row written or
+        None if the existing message did not meet the where clause.
+        """
+        table = MessageProcessing.__table__
+        stmt = insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(index_elements=[table.c.message_id], set_=update, where=where)
+        stmt = stmt.returning(*table.c)
+        row = db.session.execute(stmt, mapper=MessageProcessing.__mapper__).first()
+        db.session.commit()
+        return row
+
+    @staticmethod
+    def update_status(message_id: str, update: dict, where):
+        """Apply update to the message if it meets the where clause, returning the row written or None."""
+        table = MessageProcessing.__table__
+        stmt = table.update(). \
+            where(and_(table.c.message_id == message_id, where)). \
+            values(**update). \
+            returning(*table.c)
+        row = db.session.execute(stmt, mapper=MessageProcessing.__mapper__).first()
+        db.session.commit()
+        return row
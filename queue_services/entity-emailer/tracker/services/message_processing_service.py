@@ -19,6 +19,8 @@
 from legal_api.utils import datetime  # noqa: I001
 from typing import Optional
 
+from sqlalchemy import and_
+
 from tracker.models import MessageProcessing
 
 
@@ -107,3 +109,86 @@ class MessageProcessingService:  # pylint: disable=too-many-public-methods
         msg = MessageProcessing.find_message_by_source_and_message_id(source=source, message_id=message_id)
 
         return msg
+
+    @staticmethod
+    def claim_message(message_id: str,
+                      source: str,
+                      identifier: str,
+                      message_type: str,
+                      message_json: dict,
+                      retry_limit: int):
+        """Claim the message for processing, returning the claimed row or None if it is not processable.
+
+        A new message is created as PROCESSING. An existing message is only claimed if it FAILED and has been
+        seen no more than retry_limit times, its seen count is then incremented. The check and the claim are one
+        statement, so only one of the workers racing for a message gets it.
+        """
+        table = MessageProcessing.__table__
+        dt_now = datetime.datetime.utcnow()
+        return MessageProcessing.upsert(
+            values={
+                'message_id': message_id,
+                'source': source,
+                'identifier': identifier,
+                'message_type': message_type,
+                'status': MessageProcessing.Status.PROCESSING.value,
+                'message_json': message_json,
+                'message_seen_count': 1,
+                'create_date': dt_now,
+                'last_update': dt_now
+            },
+            update={
+                'status': MessageProcessing.Status.PROCESSING.value,
+                'message_seen_count': table.c.message_seen_count + 1,
+                'last_update': dt_now
+            },
+            where=and_(table.c.status == MessageProcessing.Status.FAILED.value,
+                       table.c.message_seen_count <= retry_limit)
+        )
+
+    @staticmethod
+    def complete_message(message_id: str):
+        """Move the message from PROCESSING to COMPLETE, returning the row or None if it was not PROCESSING."""
+        table = MessageProcessing.__table__
+        return MessageProcessing.update_status(
+            message_id,
+            update={
+                'status': MessageProcessing.Status.COMPLETE.value,
+                'last_update': datetime.datetime.utcnow()
+            },
+            where=table.c.status == MessageProcessing.Status.PROCESSING.value
+        )
+
+    @staticmethod
+    def fail_message(message_id: str,
+                     source: str,
+                     identifier: str,
+                     message_type: str,
+                     message_json: dict,
+                     last_error: str):
+        """Record the message as FAILED, creating it if it is not tracked yet.
+
+        A COMPLETE message is left as it is, and None returned.
+        """
+        table = MessageProcessing.__table__
+        dt_now = datetime.datetime.utcnow()
+        return MessageProcessing.upsert(
+            values={
+                'message_id': message_id,
+                'source': source,
+                'identifier': identifier,
+                'message_type': message_type,
+                'status': MessageProcessing.Status.FAILED.value,
+                'message_json': message_json,
+                'message_seen_count': 1,
+                'last_error': last_error,
+                'create_date': dt_now,
+                'last_update': dt_now
+            },
+            update={
+                'status': MessageProcessing.Status.FAILED.value,
+                'last_error': last_error,
+                'last_update': dt_now
+            },
+            where=table.c.status != MessageProcessing.Status.COMPLETE.value
+        )
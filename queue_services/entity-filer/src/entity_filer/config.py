@@ -99,6 +99,68 @@ class _Config():  # pylint: disable=too-few-public-methods
         'durable_name': os.getenv('NATS_QUEUE', 'error') + '_durable',
     }
 
+    # number of filings processed concurrently, filings for the same business are always processed in order.
+    # 1 keeps the original one message at a time processing on the event loop.
+    try:
+        FILER_MAX_IN_FLIGHT = max(int(os.getenv('FILER_MAX_IN_FLIGHT', '1')), 1)
+    except (TypeError, ValueError):
+        FILER_MAX_IN_FLIGHT = 1
+    if FILER_MAX_IN_FLIGHT > 1:
+        # messages are acked once their filing has been processed, not when the callback returns
+        SUBSCRIPTION_OPTIONS['manual_acks'] = True
+        SUBSCRIPTION_OPTIONS['max_inflight'] = FILER_MAX_IN_FLIGHT * 2
+        # every in flight filing holds its own db session / connection
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': max(FILER_MAX_IN_FLIGHT, 5)}
+
+    # calls to auth / namex made once a filing is committed, that the emails don't depend on, run on a thread pool
+    POST_COMMIT_IN_BACKGROUND = True
+    try:
+        POST_COMMIT_POOL_SIZE = int(os.getenv('POST_COMMIT_POOL_SIZE', '4'))
+    except (TypeError, ValueError):
+        POST_COMMIT_POOL_SIZE = 4
+    # the profile calls the emails depend on are awaited, each bounded by a timeout and retried when it fails
+    try:
+        POST_COMMIT_RETRIES = int(os.getenv('POST_COMMIT_RETRIES', '2'))
+    except (TypeError, ValueError):
+        POST_COMMIT_RETRIES = 2
+    try:
+        POST_COMMIT_RETRY_BACKOFF = float(os.getenv('POST_COMMIT_RETRY_BACKOFF', '0.5'))
+    except (TypeError, ValueError):
+        POST_COMMIT_RETRY_BACKOFF = 0.5
+    try:
+        POST_COMMIT_TIMEOUT = float(os.getenv('POST_COMMIT_TIMEOUT', '30'))
+    except (TypeError, ValueError):
+        POST_COMMIT_TIMEOUT = 30
+
+    # events and emails are written to the outbox with the filing and published by the outbox relay
+    OUTBOX_ENABLED = os.getenv('OUTBOX_ENABLED', 'True').lower() == 'true'
+    try:
+        OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '50'))
+    except (TypeError, ValueError):
+        OUTBOX_BATCH_SIZE = 50
+    try:
+        OUTBOX_INTERVAL = int(os.getenv('OUTBOX_INTERVAL', '5'))
+    except (TypeError, ValueError):
+        OUTBOX_INTERVAL = 5
+    try:
+        # how long the messages of a filing wait for the filer to release them, if it stops before it does
+        OUTBOX_HOLD = int(os.getenv('OUTBOX_HOLD', '300'))
+    except (TypeError, ValueError):
+        OUTBOX_HOLD = 300
+    try:
+        OUTBOX_RETRY_BACKOFF = int(os.getenv('OUTBOX_RETRY_BACKOFF', '5'))
+    except (TypeError, ValueError):
+        OUTBOX_RETRY_BACKOFF = 5
+    try:
+        OUTBOX_MAX_RETRY_BACKOFF = int(os.getenv('OUTBOX_MAX_RETRY_BACKOFF', '600'))
+    except (TypeError, ValueError):
+        OUTBOX_MAX_RETRY_BACKOFF = 600
+    try:
+        # delivered messages are kept this long, to look into what was published
+        OUTBOX_RETENTION_DAYS = int(os.getenv('OUTBOX_RETENTION_DAYS', '7'))
+    except (TypeError, ValueError):
+        OUTBOX_RETENTION_DAYS = 7
+
     ENTITY_EVENT_PUBLISH_OPTIONS = {
         'subject': os.getenv('NATS_ENTITY_EVENT_SUBJECT', 'entity.events'),
     }
@@ -180,6 +242,12 @@ class TestConfig(_Config):  # pylint: disable=too-few-public-methods
 
     NAICS_API_URL = 'https://NAICS_API_URL/api/v2/naics'
 
+    # make the post commit calls inline, so the tests see them once the filing is processed
+    POST_COMMIT_IN_BACKGROUND = False
+    POST_COMMIT_RETRY_BACKOFF = 0
+    # publish the events and emails directly, the outbox tests turn it on
+    OUTBOX_ENABLED = False
+
 
 class ProdConfig(_Config):  # pylint: disable=too-few-public-methods
     """Production environment configuration."""
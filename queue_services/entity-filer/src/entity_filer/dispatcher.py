@@ -0,0 +1,122 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Key partitioned work queue used to process filings concurrently.
+
+Work submitted with the same key runs strictly in submission order, work with different keys runs concurrently,
+up to max_in_flight items at a time. A work item can carry several keys (e.g. an amalgamation and each of the
+amalgamating businesses), in which case it waits for the earlier work on all of its keys and holds back the
+later work on any of them.
+
+Work that has to run again (e.g. a filing left unacked, so it is redelivered) raises RedeliverError. Its keys are
+then held: the later work on them is skipped, and has to be submitted again too, until the held work has run again.
+Work is ordered by its position in the stream (the message sequence), so the redelivered work runs in its original
+order and new work waits behind it.
+
+All of the bookkeeping happens on the event loop, so submissions need no locking.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Set
+
+from entity_queue_common.service_utils import logger
+
+
+class RedeliverError(Exception):
+    """Raised by work that is left to be submitted again, holding back the later work on its keys until it has."""
+
+
+class KeyedDispatcher:
+    """Run work concurrently across keys and sequentially within a key."""
+
+    def __init__(self, max_in_flight: int):
+        """Create the dispatcher, running at most max_in_flight work items at a time."""
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._held: Dict[str, Set[int]] = {}
+        self._tasks = set()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of submitted work items that have not finished."""
+        return len(self._tasks)
+
+    async def submit(self, keys: Iterable[str], work: Callable[[], Awaitable], sequence: int) -> asyncio.Task:
+        """Schedule work after all earlier work sharing one of its keys.
+
+        sequence is the position of the work in the stream, it orders the work that is submitted again.
+        Waits for a free slot before scheduling, so a caller feeding the dispatcher is held back once
+        max_in_flight work items are pending.
+        """
+        await self._slots.acquire()
+
+        keys = set(keys)
+        predecessors = {self._tails[key] for key in keys if key in self._tails}
+        task = asyncio.ensure_future(self._run(predecessors, keys, sequence, work))
+        for key in keys:
+            self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._done(done, keys))
+        return task
+
+    async def join(self):
+        """Wait for all of the submitted work to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, predecessors, keys, sequence, work):
+        """Run the work once its predecessors are done, whatever their outcome, unless one of its keys is held."""
+        try:
+            if predecessors:
+                await asyncio.wait(predecessors)
+
+            if any(sequence > min(self._held[key]) for key in keys if key in self._held):
+                # earlier work on the key is to run again first, so this has to be submitted again after it
+                self._hold(keys, sequence)
+                logger.info('Skipped work %s, held behind earlier work on its keys', sequence)
+                return None
+
+            try:
+                result = await work()
+            except RedeliverError:
+                self._hold(keys, sequence)
+                return None
+            self._release(keys, sequence)
+            return result
+        except Exception:
+            self._release(keys, sequence)
+            raise
+        finally:
+            self._slots.release()
+
+    def _hold(self, keys, sequence):
+        """Hold the later work on the keys until the work at sequence has run again."""
+        for key in keys:
+            self._held.setdefault(key, set()).add(sequence)
+
+    def _release(self, keys, sequence):
+        """Stop holding the keys for the work at sequence, which has run."""
+        for key in keys:
+            if (held := self._held.get(key)) is not None:
+                held.discard(sequence)
+                if not held:
+                    del self._held[key]
+
+    def _done(self, task: asyncio.Task, keys):
+        """Forget the finished task, dropping the keys it is still the last work item for."""
+        self._tasks.discard(task)
+        for key in keys:
+            if self._tails.get(key) is task:
+                del self._tails[key]
+        if not task.cancelled() and (err := task.exception()):
+            logger.error('Dispatched work failed: %s', err, exc_info=err)
@@ -27,11 +27,13 @@ from legal_api.services.bootstrap import AccountService
 from entity_filer.filing_processors.filing_components import business_info
 
 
-def update_business_profile(business: Business, filing: Filing, filing_type: str = None):
-    """Update business profile."""
+def update_business_profile(business: Business, filing: Filing, filing_type: str = None, raise_error: bool = False):
+    """Update business profile, raising a QueueException on an error if raise_error is set."""
     filing_type = filing_type if filing_type else filing.filing_type
     if contact_point := filing.filing_json['filing'][filing_type].get('contactPoint'):
         if err := _update_business_profile(business, contact_point):
+            if raise_error:
+                raise QueueException(f'Update Business for filing:{filing.id}, error:{err}')
             sentry_sdk.capture_message(
                 f'Queue Error: Update Business for filing:{filing.id}, error:{err}',
                 level='error')
@@ -92,8 +94,13 @@ def _update_business_profile(business: Business, profile_info: Dict) -> Dict:
     return error
 
 
-def update_affiliation(business: Business, filing: Filing):
-    """Create an affiliation for the business and remove the bootstrap."""
+def update_affiliation(business: Business, filing: Filing, raise_error: bool = False):
+    """Create an affiliation for the business and remove the bootstrap.
+
+    If raise_error is set, an error before the affiliation is created is raised rather than noted out, so the
+    caller can make the call again.
+    """
+    affiliated = False
     try:
         bootstrap = RegistrationBootstrap.find_by_identifier(filing.temp_reg)
 
@@ -122,11 +129,13 @@ def update_affiliation(business: Business, filing: Filing):
 
         if rv not in (HTTPStatus.OK, HTTPStatus.CREATED):
             deaffiliation = AccountService.delete_affiliation(bootstrap.account, business.identifier)
-            sentry_sdk.capture_message(
-                f'Queue Error: Unable to affiliate business:{business.identifier} for filing:{filing.id}',
-                level='error'
-            )
+            if not raise_error:
+                sentry_sdk.capture_message(
+                    f'Queue Error: Unable to affiliate business:{business.identifier} for filing:{filing.id}',
+                    level='error'
+                )
         else:
+            affiliated = True
             # update the bootstrap to use the new business identifier for the name
             bootstrap_update = AccountService.update_entity(
                 business_registration=bootstrap.identifier,
@@ -140,6 +149,8 @@ def update_affiliation(business: Business, filing: Filing):
                 or ('bootstrap_update' in locals() and bootstrap_update != HTTPStatus.OK)):
             raise QueueException
     except Exception as err:  # pylint: disable=broad-except; note out any exception, but don't fail the call
+        if raise_error and not affiliated:
+            raise
         sentry_sdk.capture_message(
             f'Queue Error: Affiliation error for filing:{filing.id}, with err:{err}',
             level='error'
@@ -25,17 +25,21 @@ from entity_filer.filing_meta import FilingMeta
 from entity_filer.filing_processors.filing_components import aliases, business_info, filings, shares
 from entity_filer.filing_processors.filing_components.offices import update_offices
 from entity_filer.filing_processors.filing_components.parties import update_parties
-from entity_filer.utils import replace_file_with_certified_copy
+from entity_filer.utils import replace_files_with_certified_copies
 
 
 def _update_cooperative(incorp_filing: Dict, business: Business, filing: Filing):
     cooperative_obj = incorp_filing.get('cooperative', None)
     if cooperative_obj:
-        # create certified copy for rules document
+        # create certified copies for the rules and memorandum documents, stamped the same
         rules_file_key = cooperative_obj.get('rulesFileKey')
+        memorandum_file_key = cooperative_obj.get('memorandumFileKey')
         rules_file = MinioService.get_file(rules_file_key)
+        memorandum_file = MinioService.get_file(memorandum_file_key)
         registrar_stamp_data = RegistrarStampData(business.founding_date, business.identifier)
-        replace_file_with_certified_copy(rules_file.data, rules_file_key, registrar_stamp_data)
+        replace_files_with_certified_copies([(rules_file.data, rules_file_key),
+                                             (memorandum_file.data, memorandum_file_key)],
+                                            registrar_stamp_data)
 
         business.association_type = cooperative_obj.get('cooperativeAssociationType')
         document = Document()
@@ -45,12 +49,6 @@ def _update_cooperative(incorp_filing: Dict, business: Business, filing: Filing)
         document.filing_id = filing.id
         business.documents.append(document)
 
-        # create certified copy for memorandum document
-        memorandum_file_key = cooperative_obj.get('memorandumFileKey')
-        memorandum_file = MinioService.get_file(memorandum_file_key)
-        registrar_stamp_data = RegistrarStampData(business.founding_date, business.identifier)
-        replace_file_with_certified_copy(memorandum_file.data, memorandum_file_key, registrar_stamp_data)
-
         document = Document()
         document.type = DocumentType.COOP_MEMORANDUM.value
         document.file_key = memorandum_file_key
@@ -0,0 +1,193 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Relay of the outbox messages written by the filer to NATS and the GCP queue.
+
+The filer writes its events and email messages to the outbox in the transaction that completes the filing.
+The relay runs on the service loop: it claims batches of pending messages, publishes them, marks the published
+ones delivered and backs the failed ones off for a retry. The messages of a business are published one at a time,
+in order, and a failure stops the business' later messages until it has been published; the messages of
+different businesses are published concurrently. Delivered messages are deleted once past their retention.
+"""
+import asyncio
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+from entity_queue_common.service import QueueServiceManager
+from entity_queue_common.service_utils import logger
+from flask import Flask
+from gcp_queue import GcpQueue, SimpleCloudEvent, to_queue_message
+from legal_api import db
+from legal_api.models import OutboxMessage
+from legal_api.utils.datetime import datetime
+from sentry_sdk import capture_message
+
+
+class OutboxRelay:  # pylint: disable=too-many-instance-attributes
+    """Publish the pending outbox messages in batches."""
+
+    def __init__(self):
+        """Create the relay, it is configured by init_app."""
+        self.app = None
+        self.qsm = None
+        self.gcp_queue = None
+        self.batch_size = 50
+        self.interval = 5
+        self.lease = 60
+        self.retry_backoff = 5
+        self.max_retry_backoff = 600
+        self.alert_attempts = 5
+        self.retention_days = 7
+        self.purge_interval = 3600
+        self.purge_batch_size = 1000
+        self._purged_at = None
+        self._loop = None
+        self._wakeup = None
+
+    def init_app(self, app: Flask, qsm: QueueServiceManager, gcp_queue: GcpQueue):
+        """Configure the relay from the app config."""
+        self.app = app
+        self.qsm = qsm
+        self.gcp_queue = gcp_queue
+        self.batch_size = app.config.get('OUTBOX_BATCH_SIZE', 50)
+        self.interval = app.config.get('OUTBOX_INTERVAL', 5)
+        self.lease = app.config.get('OUTBOX_LEASE', 60)
+        self.retry_backoff = app.config.get('OUTBOX_RETRY_BACKOFF', 5)
+        self.max_retry_backoff = app.config.get('OUTBOX_MAX_RETRY_BACKOFF', 600)
+        self.alert_attempts = app.config.get('OUTBOX_ALERT_ATTEMPTS', 5)
+        self.retention_days = app.config.get('OUTBOX_RETENTION_DAYS', 7)
+        self.purge_interval = app.config.get('OUTBOX_PURGE_INTERVAL', 3600)
+
+    def release(self, filing_id: int):
+        """Make the held messages of the filing due now, and have the relay publish them."""
+        OutboxMessage.release(filing_id)
+        self.wake()
+
+    def wake(self):
+        """Have the relay look for messages now, rather than at its next interval. Safe to call from any thread."""
+        if self._loop and self._wakeup:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self):
+        """Relay the pending messages until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                while await self.relay_batch() == self.batch_size:
+                    pass  # there may be more waiting
+                await self.purge_delivered()
+            except asyncio.CancelledError:  # pylint: disable=try-except-raise
+                raise
+            except Exception:  # pylint: disable=broad-except; keep relaying, the messages stay pending
+                logger.error('Outbox relay error', exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def relay_batch(self) -> int:
+        """Publish a batch of pending messages, returning the number of messages claimed."""
+        loop = asyncio.get_running_loop()
+        messages = await loop.run_in_executor(None, self._in_context, OutboxMessage.claim_pending,
+                                              self.batch_size, self.lease)
+        if not messages:
+            return 0
+
+        # the claimed messages are in order, so each business' messages are too
+        businesses: Dict[str, List[Dict]] = {}
+        for message in messages:
+            key = message['businessId'] or f'filing:{message["filingId"] or message["id"]}'
+            businesses.setdefault(key, []).append(message)
+        results = await asyncio.gather(*[self._publish_in_order(business_messages)
+                                         for business_messages in businesses.values()])
+
+        delivered = [message_id for business_delivered, _ in results for message_id in business_delivered]
+        not_published = [message_id for _, business_not_published in results for message_id in business_not_published]
+        await loop.run_in_executor(None, self._in_context, OutboxMessage.mark_delivered, delivered)
+        # due again, they follow the failed message once it has been published
+        await loop.run_in_executor(None, self._in_context, OutboxMessage.release_messages, not_published)
+        return len(messages)
+
+    async def purge_delivered(self):
+        """Delete the messages delivered more than the retention ago, at most once per purge interval."""
+        if self._purged_at is not None and time.monotonic() - self._purged_at < self.purge_interval:
+            return
+        self._purged_at = time.monotonic()
+        before = datetime.utcnow() - timedelta(days=self.retention_days)
+        loop = asyncio.get_running_loop()
+        while await loop.run_in_executor(None, self._in_context, OutboxMessage.delete_delivered,
+                                         before, self.purge_batch_size) == self.purge_batch_size:
+            pass  # there may be more to delete
+
+    async def _publish_in_order(self, messages: List[Dict]):
+        """Publish the messages one at a time, stopping at the first failure.
+
+        Return the ids of the published messages and of the ones after the failure, which were not published.
+        """
+        for index, message in enumerate(messages):
+            try:
+                await self._publish(message)
+            except Exception as err:  # pylint: disable=broad-except; retried later, in order
+                await asyncio.get_running_loop().run_in_executor(None, self._failed, message, err)
+                return ([published['id'] for published in messages[:index]],
+                        [later['id'] for later in messages[index + 1:]])
+        return [message['id'] for message in messages], []
+
+    async def _publish(self, message: Dict):
+        """Publish the message to its destination."""
+        if message['destination'] == OutboxMessage.Destination.NATS.name:
+            await self.qsm.service.publish(message['subject'], message['payload'])
+        else:
+            cloud_event = SimpleCloudEvent(**{**message['payload'],
+                                              'time': datetime.fromisoformat(message['payload']['time'])})
+            await asyncio.get_running_loop().run_in_executor(None, self._in_context, self.gcp_queue.publish,
+                                                             message['subject'], to_queue_message(cloud_event))
+
+    def _failed(self, message: Dict, err: Exception):
+        """Back the message off for a retry, alerting once it keeps failing."""
+        attempts = message['attempts'] + 1
+        retry_in = min(self.retry_backoff * 2 ** (attempts - 1), self.max_retry_backoff)
+        logger.error('Outbox message %s failed (attempt %s), retry in %ss: %s', message['id'], attempts, retry_in, err)
+        if attempts == self.alert_attempts:
+            capture_message(f'Queue Error: Outbox message:{message["id"]} for filing:{message["filingId"]} '
+                            f'failed {attempts} times, with err:{err}', level='error')
+        self._in_context(OutboxMessage.mark_failed, message['id'], str(err), retry_in)
+
+    def _in_context(self, func, *args):
+        """Call func in an app context, for the calls made on the executor threads."""
+        with self.app.app_context():
+            return func(*args)
+
+
+def queue_outbox_message(destination: OutboxMessage.Destination,  # pylint: disable=too-many-arguments
+                         subject: str, payload: Dict, filing_id: int,
+                         transaction_id: int = None, hold: int = 0) -> OutboxMessage:
+    """Add the message to the current session, so it is written in the transaction being built.
+
+    A message held for hold seconds is only relayed once it is released or the hold runs out.
+    """
+    message = OutboxMessage(destination=destination,
+                            subject=subject,
+                            payload=payload,
+                            filing_id=filing_id,
+                            transaction_id=transaction_id,
+                            next_attempt_date=datetime.utcnow() + timedelta(seconds=hold))
+    db.session.add(message)
+    return message
+
+
+outbox_relay = OutboxRelay()  # pylint: disable=invalid-name
@@ -0,0 +1,194 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Post commit calls to the other registry services (auth, namex).
+
+The calls nothing downstream depends on (consuming the name request, updating the entity name and state in auth)
+only tell other services about a completed filing, so rather than holding up the filing with synchronous
+requests, they run on a bounded thread pool once the filing is committed. The affiliation and business profile
+calls are awaited instead: the emailer reads the business contact from auth, so the filer makes them before the
+emails are published. They still run off the event loop, each bounded by a timeout and retried when it fails.
+
+The calls of a filing are grouped into chains: the calls of a chain run in order, the chains run concurrently.
+The chains of a later filing for the same business wait for those of the earlier filings.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from entity_queue_common.service_utils import logger
+from flask import Flask
+from legal_api.models import Business, Filing
+from sentry_sdk import capture_message
+
+
+PostCommitCall = Callable[[Business, Filing], Any]
+
+
+class PostCommitCalls:
+    """Run the post commit calls of filings on a bounded thread pool."""
+
+    def __init__(self, app: Flask = None):
+        """Create the runner, configured from the app if one is given."""
+        self.app = None
+        self.in_background = True
+        self.pool_size = 4
+        self.retries = 2
+        self.retry_backoff = 0.5
+        self.timeout = 30
+        self._executor = None
+        self._awaited_executor = None
+        self._tails: Dict[str, List[Future]] = {}
+        self._lock = threading.Lock()
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        """Configure the runner from the app config."""
+        self.app = app
+        self.in_background = app.config.get('POST_COMMIT_IN_BACKGROUND', True)
+        self.pool_size = app.config.get('POST_COMMIT_POOL_SIZE', 4)
+        self.retries = app.config.get('POST_COMMIT_RETRIES', 2)
+        self.retry_backoff = app.config.get('POST_COMMIT_RETRY_BACKOFF', 0.5)
+        self.timeout = app.config.get('POST_COMMIT_TIMEOUT', 30)
+
+    def run(self, key: str, business: Business, filing: Filing, chains: List[List[PostCommitCall]]) -> List[Future]:
+        """Run the chains of calls for the committed filing, in the background unless configured otherwise.
+
+        key orders the calls across filings, it is the business identifier.
+        """
+        chains = [chain for chain in chains if chain]
+        if not chains:
+            return []
+
+        if not self.in_background:
+            for chain in chains:
+                self._run_chain(chain, business, filing)
+            return []
+
+        # the instances are expired by the commit, each chain loads its own copy in its own app context
+        business_id = business.id if business else None
+        filing_id = filing.id
+        with self._lock:
+            predecessors = self._tails.get(key, [])
+            futures = [self._get_executor().submit(self._run_chain_in_context, predecessors,
+                                                   business_id, filing_id, chain)
+                       for chain in chains]
+            self._tails[key] = futures
+        for future in futures:
+            future.add_done_callback(lambda _, key=key, futures=futures: self._done(key, futures))
+        return futures
+
+    async def run_awaited(self, business: Business, filing: Filing, chain: List[PostCommitCall]):
+        """Make the calls for the committed filing in order, retrying the ones that fail, and return once they are done.
+
+        The calls signal a failure by raising. Unless configured to run inline, each call runs on a thread pool of
+        its own, so the event loop isn't blocked, and is bounded by the timeout. A call that times out may still be
+        going, so it is reported rather than made again.
+        """
+        business_id = business.id if business else None
+        filing_id = filing.id
+        for call in chain:
+            for attempt in range(self.retries + 1):
+                try:
+                    if not self.in_background:
+                        call(business, filing)
+                    else:
+                        await asyncio.wait_for(
+                            asyncio.get_running_loop().run_in_executor(
+                                self._get_awaited_executor(), self._call_in_context, business_id, filing_id, call),
+                            timeout=self.timeout)
+                    break
+                except asyncio.TimeoutError:
+                    self._report(call, filing_id, f'timed out after {self.timeout}s')
+                    break
+                except Exception as err:  # pylint: disable=broad-except; never fail the filing, note it out instead
+                    if attempt < self.retries:
+                        await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+                        continue
+                    self._report(call, filing_id, err)
+
+    def shutdown(self, wait_for_calls: bool = True):
+        """Stop the thread pools, by default after the pending calls have run."""
+        if self._executor:
+            self._executor.shutdown(wait=wait_for_calls)
+            self._executor = None
+        if self._awaited_executor:
+            self._awaited_executor.shutdown(wait=wait_for_calls)
+            self._awaited_executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool, creating it on first use."""
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='post-commit')
+        return self._executor
+
+    def _get_awaited_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool of the awaited calls, creating it on first use.
+
+        It is kept apart from the background chains, which can be waiting on earlier filings.
+        """
+        if not self._awaited_executor:
+            self._awaited_executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                        thread_name_prefix='post-commit-awaited')
+        return self._awaited_executor
+
+    def _call_in_context(self, business_id: Optional[int], filing_id: int, call: PostCommitCall):
+        """Make the call in an app context of its own, with its own copy of the instances."""
+        with self.app.app_context():
+            business = Business.find_by_internal_id(business_id) if business_id else None
+            filing = Filing.find_by_id(filing_id)
+            return call(business, filing)
+
+    def _done(self, key: str, futures: List[Future]):
+        """Forget the chains of the key once they have all run, unless a later filing has been queued."""
+        if all(future.done() for future in futures):
+            with self._lock:
+                if self._tails.get(key) is futures:
+                    del self._tails[key]
+
+    def _run_chain_in_context(self, predecessors: List[Future], business_id: Optional[int], filing_id: int,
+                              chain: List[PostCommitCall]):
+        """Run the chain after the earlier filings of the business, in an app context of its own."""
+        # the pool is FIFO, so the predecessors are already running or run before this one
+        wait(predecessors)
+        with self.app.app_context():
+            business = Business.find_by_internal_id(business_id) if business_id else None
+            filing = Filing.find_by_id(filing_id)
+            self._run_chain(chain, business, filing)
+
+    def _run_chain(self, chain: List[PostCommitCall], business: Business, filing: Filing):
+        """Run the calls in order."""
+        for call in chain:
+            self._call(call, business, filing)
+
+    @staticmethod
+    def _call(call: PostCommitCall, business: Business, filing: Filing):
+        """Make the call, noting out an error rather than stopping the chain."""
+        try:
+            return call(business, filing)
+        except Exception as err:  # pylint: disable=broad-except; never fail the filing, note it out instead
+            PostCommitCalls._report(call, filing.id if filing else None, err)
+        return None
+
+    @staticmethod
+    def _report(call: PostCommitCall, filing_id: Optional[int], err: Any):
+        """Note out a call that failed, for human review."""
+        name = getattr(call, '__name__', None) or getattr(getattr(call, 'func', None), '__name__', call)
+        capture_message(f'Queue Error: Post commit call {name} failed for filing:{filing_id}, with err:{err}',
+                        level='error')
+        logger.error('Post commit call %s failed for filing: %s', name, filing_id, exc_info=True)
+
+
+post_commit_calls = PostCommitCalls()  # pylint: disable=invalid-name
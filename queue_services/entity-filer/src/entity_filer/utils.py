@@ -15,10 +15,9 @@
 
 When deployed in OKD, it adds the last commit hash onto the version info.
 """
-import io
 import os
+from typing import List, Tuple
 
-import PyPDF2
 from legal_api.services import PdfService
 from legal_api.services.minio import MinioService
 from legal_api.services.pdf_service import RegistrarStampData
@@ -40,15 +39,11 @@ def get_run_version():
 
 def replace_file_with_certified_copy(_bytes: bytes, key: str, data: RegistrarStampData):
     """Create a certified copy and replace it into Minio server."""
-    open_pdf_file = io.BytesIO(_bytes)
-    pdf_reader = PyPDF2.PdfFileReader(open_pdf_file)
-    pdf_writer = PyPDF2.PdfFileWriter()
-    pdf_writer.appendPagesFromReader(pdf_reader)
-    output_original_pdf = io.BytesIO()
-    pdf_writer.write(output_original_pdf)
-    output_original_pdf.seek(0)
-    pdf_service = PdfService()
-    registrars_stamp = pdf_service.create_registrars_stamp(data)
-    certified_copy = pdf_service.stamp_pdf(output_original_pdf, registrars_stamp, only_first_page=True)
-
-    MinioService.put_file(key, certified_copy, certified_copy.getbuffer().nbytes)
+    replace_files_with_certified_copies([(_bytes, key)], data)
+
+
+def replace_files_with_certified_copies(files: List[Tuple[bytes, str]], data: RegistrarStampData):
+    """Create a certified copy of each file, stamped the same, and replace them into Minio server."""
+    certified_copies = PdfService().certify_pdfs([(_bytes, data) for _bytes, _ in files], only_first_page=True)
+    for (_, key), certified_copy in zip(files, certified_copies):
+        MinioService.put_file(key, certified_copy, certified_copy.getbuffer().nbytes)
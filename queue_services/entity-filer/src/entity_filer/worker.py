@@ -24,21 +24,30 @@ If these constraints change, the use of Flask-SQLAlchemy would need to change.
 Flask-SQLAlchemy currently allows the base model to be changed, or reworking
 the model to a standalone SQLAlchemy usage with an async engine would need
 to be pursued.
+
+When FILER_MAX_IN_FLIGHT is more than 1, filings are instead handed to a
+KeyedDispatcher and processed on worker threads, each in its own app context
+and so with its own Flask-SQLAlchemy session. Filings are keyed on their
+business (or temp reg), plus the amalgamating businesses of an amalgamation,
+so the filings of a business are still processed one at a time and in order.
 """
+import asyncio
+import functools
 import json
 import os
 import uuid
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 
 import nats
-from entity_queue_common.messages import publish_email_message
+from entity_queue_common.messages import create_email_msg, publish_email_message
 from entity_queue_common.service import QueueServiceManager
 from entity_queue_common.service_utils import FilingException, QueueException, logger
 from flask import Flask
 from gcp_queue import GcpQueue, SimpleCloudEvent, to_queue_message
 from legal_api import db
 from legal_api.core import Filing as FilingCore
-from legal_api.models import Business, Filing
+from legal_api.models import Business, Filing, OutboxMessage
 from legal_api.services import Flags
 from legal_api.utils.datetime import datetime, timezone
 from sentry_sdk import capture_message
@@ -46,6 +55,7 @@ from sqlalchemy.exc import OperationalError
 from sqlalchemy_continuum import versioning_manager
 
 from entity_filer import config
+from entity_filer.dispatcher import KeyedDispatcher, RedeliverError
 from entity_filer.filing_meta import FilingMeta, json_serial
 from entity_filer.filing_processors import (
     admin_freeze,
@@ -75,6 +85,8 @@ from entity_filer.filing_processors import (
     transition,
 )
 from entity_filer.filing_processors.filing_components import business_profile, name_request
+from entity_filer.outbox import outbox_relay, queue_outbox_message
+from entity_filer.post_commit import post_commit_calls
 
 
 qsm = QueueServiceManager()  # pylint: disable=invalid-name
@@ -85,10 +97,22 @@ FLASK_APP = Flask(__name__)
 FLASK_APP.config.from_object(APP_CONFIG)
 db.init_app(FLASK_APP)
 gcp_queue.init_app(FLASK_APP)
+post_commit_calls.init_app(FLASK_APP)
+outbox_relay.init_app(FLASK_APP, qsm, gcp_queue)
 
 if FLASK_APP.config.get('LD_SDK_KEY', None):
     flags.init_app(FLASK_APP)
 
+_dispatcher = None  # pylint: disable=invalid-name
+_executor = None  # pylint: disable=invalid-name
+
+
+MRAS_FILING_TYPES = [
+    FilingCore.FilingTypes.AMALGAMATIONAPPLICATION,
+    FilingCore.FilingTypes.CONTINUATIONIN,
+    FilingCore.FilingTypes.INCORPORATIONAPPLICATION
+]
+
 
 def get_filing_types(legal_filings: dict):
     """Get the filing type fee codes for the filing.
@@ -104,35 +128,70 @@ def get_filing_types(legal_filings: dict):
     return filing_types
 
 
-async def publish_event(business: Business, filing: Filing):
-    """Publish the filing message onto the NATS filing subject."""
-    try:
-        payload = {
-            'specversion': '1.x-wip',
-            'type': 'bc.registry.business.' + filing.filing_type,
-            'source': ''.join([
-                APP_CONFIG.LEGAL_API_URL,
-                '/business/',
-                business.identifier,
-                '/filing/',
-                str(filing.id)]),
-            'id': str(uuid.uuid4()),
-            'time': datetime.utcnow().isoformat(),
-            'datacontenttype': 'application/json',
-            'identifier': business.identifier,
-            'data': {
-                'filing': {
-                    'header': {'filingId': filing.id,
-                               'effectiveDate': filing.effective_date.isoformat()
-                               },
-                    'business': {'identifier': business.identifier},
-                    'legalFilings': get_filing_types(filing.filing_json)
-                }
+def create_event_payload(business: Business, filing: Filing) -> dict:
+    """Return the payload of the NATS entity event for the filing."""
+    payload = {
+        'specversion': '1.x-wip',
+        'type': 'bc.registry.business.' + filing.filing_type,
+        'source': ''.join([
+            APP_CONFIG.LEGAL_API_URL,
+            '/business/',
+            business.identifier,
+            '/filing/',
+            str(filing.id)]),
+        'id': str(uuid.uuid4()),
+        'time': datetime.utcnow().isoformat(),
+        'datacontenttype': 'application/json',
+        'identifier': business.identifier,
+        'data': {
+            'filing': {
+                'header': {'filingId': filing.id,
+                           'effectiveDate': filing.effective_date.isoformat()
+                           },
+                'business': {'identifier': business.identifier},
+                'legalFilings': get_filing_types(filing.filing_json)
             }
         }
-        if filing.temp_reg:
-            payload['tempidentifier'] = filing.temp_reg
+    }
+    if filing.temp_reg:
+        payload['tempidentifier'] = filing.temp_reg
+    return payload
+
+
+def create_gcp_event(business: Business, filing: Filing) -> dict:
+    """Return the attributes of the GCP queue cloud event for the filing."""
+    data = {
+        'filing': {
+            'header': {'filingId': filing.id,
+                       'effectiveDate': filing.effective_date.isoformat()
+                       },
+            'business': {'identifier': business.identifier},
+            'legalFilings': get_filing_types(filing.filing_json)
+        },
+        'identifier': business.identifier
+    }
+    if filing.temp_reg:
+        data['tempidentifier'] = filing.temp_reg
+
+    return {
+        'id': str(uuid.uuid4()),
+        'source': ''.join([
+            APP_CONFIG.LEGAL_API_URL,
+            '/business/',
+            business.identifier,
+            '/filing/',
+            str(filing.id)]),
+        'subject': APP_CONFIG.BUSINESS_EVENTS_TOPIC,
+        'time': datetime.now(timezone.utc),
+        'type': 'bc.registry.business.' + filing.filing_type,
+        'data': data
+    }
 
+
+async def publish_event(business: Business, filing: Filing):
+    """Publish the filing message onto the NATS filing subject."""
+    try:
+        payload = create_event_payload(business, filing)
         subject = APP_CONFIG.ENTITY_EVENT_PUBLISH_OPTIONS['subject']
         await qsm.service.publish(subject, payload)
     except Exception as err:  # pylint: disable=broad-except; we don't want to fail out the filing, so ignore all.
@@ -144,32 +203,7 @@ def publish_gcp_queue_event(business: Business, filing: Filing):
     """Publish the filing message onto the GCP-QUEUE filing subject."""
     try:
         subject = APP_CONFIG.BUSINESS_EVENTS_TOPIC
-        data = {
-                'filing': {
-                    'header': {'filingId': filing.id,
-                               'effectiveDate': filing.effective_date.isoformat()
-                               },
-                    'business': {'identifier': business.identifier},
-                    'legalFilings': get_filing_types(filing.filing_json)
-                },
-                'identifier': business.identifier
-            }
-        if filing.temp_reg:
-            data['tempidentifier'] = filing.temp_reg
-
-        ce = SimpleCloudEvent(
-            id=str(uuid.uuid4()),
-            source=''.join([
-                APP_CONFIG.LEGAL_API_URL,
-                '/business/',
-                business.identifier,
-                '/filing/',
-                str(filing.id)]),
-            subject=subject,
-            time=datetime.now(timezone.utc),
-            type='bc.registry.business.' + filing.filing_type,
-            data=data
-        )
+        ce = SimpleCloudEvent(**create_gcp_event(business, filing))
 
         gcp_queue.publish(subject, to_queue_message(ce))
 
@@ -178,13 +212,34 @@ def publish_gcp_queue_event(business: Business, filing: Filing):
         logger.error('Queue Publish Event Error: filing.id=%s', filing.id, exc_info=True)
 
 
+def queue_filing_messages(business: Business, filing: Filing, transaction_id: int):
+    """Write the email and event messages of the completed filing to the outbox, in the filing's transaction.
+
+    The messages are held for OUTBOX_HOLD seconds, process_filing releases them once the calls to auth are made.
+    """
+    email_subject = APP_CONFIG.EMAIL_PUBLISH_OPTIONS['subject']
+    hold = APP_CONFIG.OUTBOX_HOLD
+    if filing.filing_type in MRAS_FILING_TYPES:
+        queue_outbox_message(OutboxMessage.Destination.NATS, email_subject,
+                             create_email_msg(filing.id, filing.filing_type, 'mras'),
+                             filing.id, transaction_id, hold)
+    queue_outbox_message(OutboxMessage.Destination.NATS, email_subject,
+                         create_email_msg(filing.id, filing.filing_type, filing.status),
+                         filing.id, transaction_id, hold)
+
+    if business:
+        queue_outbox_message(OutboxMessage.Destination.NATS, APP_CONFIG.ENTITY_EVENT_PUBLISH_OPTIONS['subject'],
+                             create_event_payload(business, filing),
+                             filing.id, transaction_id, hold)
+        gcp_event = create_gcp_event(business, filing)
+        queue_outbox_message(OutboxMessage.Destination.GCP, APP_CONFIG.BUSINESS_EVENTS_TOPIC,
+                             {**gcp_event, 'time': gcp_event['time'].isoformat()},
+                             filing.id, transaction_id, hold)
+
+
 async def publish_mras_email(filing: Filing):
     """Publish MRAS email message onto the NATS emailer subject."""
-    if filing.filing_type in [
-        FilingCore.FilingTypes.AMALGAMATIONAPPLICATION,
-        FilingCore.FilingTypes.CONTINUATIONIN,
-        FilingCore.FilingTypes.INCORPORATIONAPPLICATION
-    ]:
+    if filing.filing_type in MRAS_FILING_TYPES:
         try:
             await publish_email_message(
                 qsm, APP_CONFIG.EMAIL_PUBLISH_OPTIONS['subject'], filing, 'mras')
@@ -343,30 +398,39 @@ async def process_filing(filing_msg: Dict, flask_app: Flask):  # pylint: disable
 
             db.session.add(business)
             db.session.add(filing_submission)
-            db.session.commit()
 
-            if filing_core_submission.filing_type in [
+            creates_business = filing_core_submission.filing_type in [
                 FilingCore.FilingTypes.AMALGAMATIONAPPLICATION,
                 FilingCore.FilingTypes.CONTINUATIONIN,
                 # code says corps conversion creates a new business (not sure: why?, in use (not implemented in UI)?)
                 FilingCore.FilingTypes.CONVERSION,
                 FilingCore.FilingTypes.INCORPORATIONAPPLICATION,
                 FilingCore.FilingTypes.REGISTRATION
-            ]:
-                # update business id for new business
+            ]
+            if creates_business:
+                # update business id for new business, in the filing's transaction so the emailer never sees it unset
+                db.session.flush()
                 filing_submission.business_id = business.id
-                db.session.add(filing_submission)
-                db.session.commit()
 
-                # update affiliation for new business
+            if APP_CONFIG.OUTBOX_ENABLED:
+                # written with the filing, so the messages go out if and only if the filing is completed,
+                # and held until the calls to auth the emailer depends on have been made
+                queue_filing_messages(business, filing_submission, transaction.id)
+
+            db.session.commit()
+
+            # the emailer reads the business contact from auth, so the profile calls are made before the emails go out
+            profile_calls = []
+            if creates_business:
+                # the affiliation creates the entity in auth, so it is made before the profile is updated
                 if filing_core_submission.filing_type != FilingCore.FilingTypes.CONVERSION:
-                    business_profile.update_affiliation(business, filing_submission)
+                    profile_calls.append(functools.partial(business_profile.update_affiliation, raise_error=True))
+                profile_calls.append(functools.partial(business_profile.update_business_profile, raise_error=True))
 
-                name_request.consume_nr(business, filing_submission)
-                business_profile.update_business_profile(business, filing_submission)
-                await publish_mras_email(filing_submission)
+                post_commit_chains = [[name_request.consume_nr]]
             else:
-                # post filing changes to other services
+                # post filing changes to other services, each service's calls in order
+                entity_calls, nr_calls = [], []
                 for filing_type in filing_meta.legal_filings:
                     if filing_type in [
                         FilingCore.FilingTypes.ALTERATION,
@@ -376,7 +440,8 @@ async def process_filing(filing_msg: Dict, flask_app: Flask):  # pylint: disable
                         FilingCore.FilingTypes.PUTBACKON,
                         FilingCore.FilingTypes.RESTORATION
                     ]:
-                        business_profile.update_entity(business, filing_type)
+                        entity_calls.append(lambda business, _, filing_type=filing_type:
+                                            business_profile.update_entity(business, filing_type))
 
                     if filing_type in [
                         FilingCore.FilingTypes.ALTERATION,
@@ -385,46 +450,154 @@ async def process_filing(filing_msg: Dict, flask_app: Flask):  # pylint: disable
                         FilingCore.FilingTypes.CORRECTION,
                         FilingCore.FilingTypes.RESTORATION,
                     ]:
-                        name_request.consume_nr(business, filing_submission, filing_type)
+                        nr_calls.append(functools.partial(name_request.consume_nr, filing_type=filing_type))
                         if filing_type != FilingCore.FilingTypes.CHANGEOFNAME:
-                            business_profile.update_business_profile(business, filing_submission, filing_type)
-
-            try:
-                await publish_email_message(
-                    qsm, APP_CONFIG.EMAIL_PUBLISH_OPTIONS['subject'], filing_submission, filing_submission.status)
-            except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
-                # mark any failure for human review
-                capture_message(
-                    f'Queue Error: Failed to place email for filing:{filing_submission.id}'
-                    f'on Queue with error:{err}',
-                    level='error'
-                )
-
-            try:
-                await publish_event(business, filing_submission)
-            except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
-                # mark any failure for human review
-                print(err)
-                capture_message(
-                    f'Queue Error: Failed to publish event for filing:{filing_submission.id}'
-                    f'on Queue with error:{err}',
-                    level='error'
-                )
-
-            try:
-                publish_gcp_queue_event(business, filing_submission)
-            except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
-                # mark any failure for human review
-                print(err)
-                capture_message(
-                    f'Queue Error: Failed to publish event for filing:{filing_submission.id}'
-                    f'on Queue with error:{err}',
-                    level='error'
-                )
+                            profile_calls.append(functools.partial(business_profile.update_business_profile,
+                                                                   filing_type=filing_type, raise_error=True))
+                post_commit_chains = [entity_calls, nr_calls]
+
+            # the calls update the same entity in auth, so they are made one after the other
+            await post_commit_calls.run_awaited(business, filing_submission, profile_calls)
+            if creates_business and not APP_CONFIG.OUTBOX_ENABLED:
+                await publish_mras_email(filing_submission)
+
+            if APP_CONFIG.OUTBOX_ENABLED:
+                outbox_relay.release(filing_submission.id)
+            else:
+                try:
+                    await publish_email_message(
+                        qsm, APP_CONFIG.EMAIL_PUBLISH_OPTIONS['subject'], filing_submission, filing_submission.status)
+                except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
+                    # mark any failure for human review
+                    capture_message(
+                        f'Queue Error: Failed to place email for filing:{filing_submission.id}'
+                        f'on Queue with error:{err}',
+                        level='error'
+                    )
+
+                try:
+                    await publish_event(business, filing_submission)
+                except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
+                    # mark any failure for human review
+                    print(err)
+                    capture_message(
+                        f'Queue Error: Failed to publish event for filing:{filing_submission.id}'
+                        f'on Queue with error:{err}',
+                        level='error'
+                    )
+
+                try:
+                    publish_gcp_queue_event(business, filing_submission)
+                except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
+                    # mark any failure for human review
+                    print(err)
+                    capture_message(
+                        f'Queue Error: Failed to publish event for filing:{filing_submission.id}'
+                        f'on Queue with error:{err}',
+                        level='error'
+                    )
+
+            # the calls to auth and namex the emails don't depend on run off the event loop
+            post_commit_calls.run(business.identifier, business, filing_submission, post_commit_chains)
+
+
+def get_dispatcher() -> KeyedDispatcher:
+    """Return the dispatcher that orders the concurrently processed filings."""
+    global _dispatcher  # pylint: disable=global-statement,invalid-name
+    if not _dispatcher:
+        _dispatcher = KeyedDispatcher(APP_CONFIG.FILER_MAX_IN_FLIGHT)
+    return _dispatcher
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool the concurrently processed filings run on."""
+    global _executor  # pylint: disable=global-statement,invalid-name
+    if not _executor:
+        # one extra thread, so the key lookup of the next filing never waits on the ones being processed
+        _executor = ThreadPoolExecutor(max_workers=APP_CONFIG.FILER_MAX_IN_FLIGHT + 1,
+                                       thread_name_prefix='entity-filer')
+    return _executor
+
+
+def get_filing_keys(filing_msg: Dict, flask_app: Flask) -> List[str]:
+    """Return the keys of the businesses the filing changes, used to keep their filings in order."""
+    filing_id = filing_msg['filing']['id']
+    with flask_app.app_context():
+        row = db.session.query(Filing.temp_reg, Filing._filing_type,  # pylint: disable=protected-access
+                               Filing._filing_json, Business.identifier).\
+            outerjoin(Business, Filing.business_id == Business.id).\
+            filter(Filing.id == filing_id).\
+            one_or_none()
+
+    if not row:
+        # nothing to order against, process_filing reports the missing filing
+        return [f'filing:{filing_id}']
+
+    temp_reg, filing_type, filing_json, identifier = row
+    keys = [identifier or temp_reg or f'filing:{filing_id}']
+    if filing_type == FilingCore.FilingTypes.AMALGAMATIONAPPLICATION:
+        amalgamating_businesses = ((filing_json or {}).get('filing', {}).
+                                   get('amalgamationApplication', {}).
+                                   get('amalgamatingBusinesses', []))
+        keys.extend(business['identifier'] for business in amalgamating_businesses if business.get('identifier'))
+    return keys
+
+
+def run_process_filing(filing_msg: Dict, flask_app: Flask):
+    """Process the filing on the calling (worker) thread, using a loop of its own."""
+    return asyncio.run(process_filing(filing_msg, flask_app))
+
+
+async def dispatch_filing_msg(msg: nats.aio.client.Msg):
+    """Queue the Msg for concurrent processing, behind the earlier filings of the same business."""
+    logger.info('Received raw message seq:%s, data=  %s', msg.sequence, msg.data.decode())
+    try:
+        filing_msg = json.loads(msg.data.decode('utf-8'))
+        keys = await asyncio.get_running_loop().run_in_executor(
+            get_executor(), get_filing_keys, filing_msg, FLASK_APP)
+    except OperationalError as err:
+        logger.error('Queue Blocked - Database Issue: %s', msg.data.decode(), exc_info=True)
+        raise err  # not acked, so the message is redelivered
+    except Exception:  # pylint: disable=broad-except
+        capture_message('Queue Error:' + msg.data.decode(), level='error')
+        logger.error('Queue Error: %s', msg.data.decode(), exc_info=True)
+        await qsm.service.sc.ack(msg)
+        return
+
+    logger.debug('Dispatching filing msg: %s with keys: %s', filing_msg, keys)
+    await get_dispatcher().submit(keys, functools.partial(process_dispatched_filing, msg, filing_msg), msg.sequence)
+
+
+async def process_dispatched_filing(msg: nats.aio.client.Msg, filing_msg: Dict):
+    """Process the dispatched filing on a worker thread and ack the Msg, unless it has to be redelivered.
+
+    A Msg left to be redelivered raises RedeliverError, so the dispatcher holds back the later filings of the business
+    until the redelivered one has been processed.
+    """
+    try:
+        await asyncio.get_running_loop().run_in_executor(get_executor(), run_process_filing,
+                                                         filing_msg, FLASK_APP)
+    except OperationalError as err:
+        logger.error('Queue Blocked - Database Issue: %s', json.dumps(filing_msg), exc_info=True)
+        raise RedeliverError from err  # not acked, so the message is redelivered
+    except FilingException as err:
+        logger.error('Queue Error - cannot find filing: %s'
+                     '\n\nThis message has been put back on the queue for reprocessing.',
+                     json.dumps(filing_msg), exc_info=True)
+        raise RedeliverError from err
+    except (QueueException, Exception):  # pylint: disable=broad-except
+        capture_message('Queue Error:' + json.dumps(filing_msg), level='error')
+        logger.error('Queue Error: %s', json.dumps(filing_msg), exc_info=True)
+
+    await qsm.service.sc.ack(msg)
 
 
 async def cb_subscription_handler(msg: nats.aio.client.Msg):
     """Use Callback to process Queue Msg objects."""
+    if APP_CONFIG.FILER_MAX_IN_FLIGHT > 1:
+        await dispatch_filing_msg(msg)
+        return
+
     try:
         logger.info('Received raw message seq:%s, data=  %s', msg.sequence, msg.data.decode())
         filing_msg = json.loads(msg.data.decode('utf-8'))
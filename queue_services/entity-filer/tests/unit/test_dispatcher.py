@@ -0,0 +1,123 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Test Suites to ensure that the keyed dispatcher orders and limits the work."""
+import asyncio
+
+import pytest
+
+from entity_filer.dispatcher import KeyedDispatcher, RedeliverError
+
+
+def recorder(events, name, delay=0.01):
+    """Return work that records when it starts and ends."""
+    async def work():
+        events.append(f'start {name}')
+        await asyncio.sleep(delay)
+        events.append(f'end {name}')
+        return name
+    return work
+
+
+async def test_dispatcher_orders_work_per_key():
+    """Assert that work with the same key runs in order, and work with other keys runs alongside it."""
+    events = []
+    dispatcher = KeyedDispatcher(max_in_flight=4)
+
+    await dispatcher.submit(['BC1'], recorder(events, 'a1', 0.05), 1)
+    await dispatcher.submit(['BC2'], recorder(events, 'b1', 0.01), 2)
+    await dispatcher.submit(['BC1'], recorder(events, 'a2', 0.01), 3)
+    await dispatcher.join()
+
+    assert events.index('end a1') < events.index('start a2')
+    # b1 did not wait for a1
+    assert events.index('end b1') < events.index('end a1')
+    assert dispatcher.in_flight == 0
+
+
+async def test_dispatcher_multiple_keys():
+    """Assert that work with several keys waits for the earlier work on each key."""
+    events = []
+    dispatcher = KeyedDispatcher(max_in_flight=4)
+
+    await dispatcher.submit(['BC1'], recorder(events, 'a', 0.03), 1)
+    await dispatcher.submit(['BC2'], recorder(events, 'b', 0.05), 2)
+    await dispatcher.submit(['T123', 'BC1', 'BC2'], recorder(events, 'amalgamation'), 3)
+    await dispatcher.submit(['BC2'], recorder(events, 'b2'), 4)
+    await dispatcher.join()
+
+    assert events.index('end a') < events.index('start amalgamation')
+    assert events.index('end b') < events.index('start amalgamation')
+    assert events.index('end amalgamation') < events.index('start b2')
+
+
+async def test_dispatcher_limits_in_flight():
+    """Assert that no more than max_in_flight work items run at once, and a failure does not stop the key."""
+    running = 0
+    most_running = 0
+
+    async def work():
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def failing_work():
+        raise ValueError('failed')
+
+    dispatcher = KeyedDispatcher(max_in_flight=2)
+    failed = await dispatcher.submit(['BC0'], failing_work, 1)
+    for i in range(6):
+        await dispatcher.submit([f'BC{i}'], work, i + 2)
+    await dispatcher.join()
+
+    assert most_running == 2
+    with pytest.raises(ValueError):
+        failed.result()
+
+
+async def test_dispatcher_holds_key_for_redelivery():
+    """Assert that when work has to run again, the later work on its key waits until it has, in stream order."""
+    events = []
+    attempts = {'a1': 0}
+
+    async def redelivered_once():
+        attempts['a1'] += 1
+        if attempts['a1'] == 1:
+            events.append('redeliver a1')
+            raise RedeliverError()
+        events.append('run a1')
+
+    dispatcher = KeyedDispatcher(max_in_flight=4)
+    await dispatcher.submit(['BC1'], redelivered_once, 1)
+    skipped = await dispatcher.submit(['BC1'], recorder(events, 'a2'), 2)
+    await dispatcher.submit(['BC2'], recorder(events, 'b1'), 3)
+    await dispatcher.join()
+
+    assert 'start a2' not in events
+    assert skipped.result() is None
+    assert 'end b1' in events
+
+    # a later filing of the business arrives before the redeliveries, then they come in order
+    await dispatcher.submit(['BC1'], recorder(events, 'a3'), 4)
+    await dispatcher.join()
+    assert 'start a3' not in events
+
+    await dispatcher.submit(['BC1'], redelivered_once, 1)
+    await dispatcher.submit(['BC1'], recorder(events, 'a2'), 2)
+    await dispatcher.submit(['BC1'], recorder(events, 'a3'), 4)
+    await dispatcher.join()
+
+    assert events.index('redeliver a1') < events.index('run a1') < events.index('start a2') < events.index('start a3')
+    assert not dispatcher._held  # pylint: disable=protected-access
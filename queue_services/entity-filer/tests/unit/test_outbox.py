@@ -0,0 +1,108 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Test Suites to ensure that the filer writes its messages to the outbox and the relay publishes them."""
+import copy
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+from legal_api.models import OutboxMessage
+from legal_api.utils.datetime import datetime
+from registry_schemas.example_data import CHANGE_OF_ADDRESS, FILING_HEADER
+
+from entity_filer.outbox import OutboxRelay
+from entity_filer.worker import APP_CONFIG, process_filing
+from tests.unit import create_business, create_filing
+
+
+def create_message(message_id, filing_id=1, subject='entity.email', payload=None, attempts=0, business_id=None):
+    """Return a message as claimed from the outbox."""
+    return {'id': message_id, 'destination': 'NATS', 'subject': subject, 'payload': payload or {},
+            'filingId': filing_id, 'attempts': attempts, 'businessId': business_id}
+
+
+async def test_process_filing_writes_outbox(app, session, mocker):
+    """Assert that the email and event messages are written with the filing's transaction, then released."""
+    mocker.patch.object(APP_CONFIG, 'OUTBOX_ENABLED', True)
+    publish_event = mocker.patch('entity_filer.worker.publish_event')
+    coa_filing = copy.deepcopy(FILING_HEADER)
+    coa_filing['filing']['changeOfAddress'] = copy.deepcopy(CHANGE_OF_ADDRESS)
+    business = create_business('CP1234567')
+    filing = create_filing(str(random.SystemRandom().getrandbits(0x58)), coa_filing, business.id)
+
+    await process_filing({'filing': {'id': filing.id}}, app)
+
+    messages = OutboxMessage.query.filter_by(filing_id=filing.id).order_by(OutboxMessage.id).all()
+    assert [(message.destination, message.subject) for message in messages] == [
+        (OutboxMessage.Destination.NATS, APP_CONFIG.EMAIL_PUBLISH_OPTIONS['subject']),
+        (OutboxMessage.Destination.NATS, APP_CONFIG.ENTITY_EVENT_PUBLISH_OPTIONS['subject']),
+        (OutboxMessage.Destination.GCP, APP_CONFIG.BUSINESS_EVENTS_TOPIC),
+    ]
+    assert all(message.transaction_id == filing.transaction_id for message in messages)
+    assert messages[0].payload == {'email': {'filingId': filing.id, 'type': 'changeOfAddress', 'option': 'COMPLETED'}}
+    assert messages[1].payload['identifier'] == 'CP1234567'
+    assert messages[2].payload['data']['identifier'] == 'CP1234567'
+    # released once the filing is processed
+    assert all(message.next_attempt_date <= datetime.utcnow() for message in messages)
+    publish_event.assert_not_called()
+
+
+async def test_outbox_relay_batch(app):
+    """Assert that the relay publishes a batch, marks the published messages and backs off the failed ones."""
+    qsm = MagicMock()
+    qsm.service.publish = AsyncMock(side_effect=[None, Exception('nats is down')])
+    relay = OutboxRelay()
+    relay.init_app(app, qsm, MagicMock())
+    relay.retry_backoff = 5
+    relay._in_context = MagicMock()  # pylint: disable=protected-access
+    relay._in_context.return_value = [  # pylint: disable=protected-access
+        create_message(1, subject='entity.events', payload={'a': 1}),
+        create_message(2, subject='entity.email', payload={'b': 2}, attempts=2),
+    ]
+
+    assert await relay.relay_batch() == 2
+
+    calls = relay._in_context.call_args_list  # pylint: disable=protected-access
+    assert calls[0].args == (OutboxMessage.claim_pending, relay.batch_size, relay.lease)
+    assert calls[1].args == (OutboxMessage.mark_failed, 2, 'nats is down', 20)
+    assert calls[2].args == (OutboxMessage.mark_delivered, [1])
+
+
+async def test_outbox_relay_batch_in_order(app):
+    """Assert that a failure stops the later messages of its business, but not those of other businesses."""
+    published = []
+
+    async def publish(subject, payload):
+        if payload == {'email': 1}:
+            raise Exception('nats is down')  # pylint: disable=broad-exception-raised
+        published.append(payload)
+
+    qsm = MagicMock()
+    qsm.service.publish = publish
+    relay = OutboxRelay()
+    relay.init_app(app, qsm, MagicMock())
+    relay._in_context = MagicMock()  # pylint: disable=protected-access
+    relay._in_context.return_value = [  # pylint: disable=protected-access
+        create_message(1, payload={'email': 1}, business_id=1),
+        create_message(2, payload={'event': 1}, business_id=1),
+        create_message(3, filing_id=2, payload={'email': 2}, business_id=2),
+        create_message(4, filing_id=2, payload={'event': 2}, business_id=2),
+    ]
+
+    assert await relay.relay_batch() == 4
+
+    assert published == [{'email': 2}, {'event': 2}]
+    calls = relay._in_context.call_args_list  # pylint: disable=protected-access
+    assert calls[1].args == (OutboxMessage.mark_failed, 1, 'nats is down', relay.retry_backoff)
+    assert calls[2].args == (OutboxMessage.mark_delivered, [3, 4])
+    assert calls[3].args == (OutboxMessage.release_messages, [2])
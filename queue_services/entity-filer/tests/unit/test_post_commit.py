@@ -0,0 +1,107 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Test Suites to ensure that the post commit calls are run and ordered."""
+import asyncio
+import threading
+import time
+from concurrent.futures import wait
+from unittest.mock import MagicMock
+
+from legal_api.models import Business, Filing
+
+from entity_filer.post_commit import PostCommitCalls
+
+
+def test_post_commit_calls_inline(app):
+    """Assert that inline calls run in order with the given instances, and a failing call doesn't stop its chain."""
+    runner = PostCommitCalls(app)
+    runner.in_background = False
+    business = Business(id=1, identifier='BC1234567')
+    filing = Filing(id=1)
+    events = []
+    failing = MagicMock(side_effect=Exception('down'))
+
+    runner.run('BC1234567', business, filing, [[failing, lambda b, f: events.append(('first', b, f))],
+                                               [lambda b, f: events.append(('second', b, f))]])
+
+    assert events == [('first', business, filing), ('second', business, filing)]
+    failing.assert_called_once_with(business, filing)
+
+
+def test_post_commit_calls_background_ordering(app):
+    """Assert that background chains of a later filing wait for those of an earlier filing of the business."""
+    runner = PostCommitCalls(app)
+    runner.in_background = True
+    runner.pool_size = 4
+    events = []
+    lock = threading.Lock()
+
+    def call(name, delay=0):
+        def _call(business, filing):  # pylint: disable=unused-argument
+            time.sleep(delay)
+            with lock:
+                events.append(name)
+        return _call
+
+    business = Business(identifier='BC1234567')
+    first = runner.run('BC1234567', business, Filing(id=0), [[call('first entity', 0.05)], [call('first nr')]])
+    second = runner.run('BC1234567', business, Filing(id=0), [[call('second entity')]])
+    other = runner.run('BC7654321', business, Filing(id=0), [[call('other business')]])
+    wait(first + second + other)
+    runner.shutdown()
+
+    assert events.index('first entity') < events.index('second entity')
+    assert events.index('first nr') < events.index('second entity')
+    assert events.index('other business') < events.index('first entity')
+
+
+def test_post_commit_calls_awaited_retried(app):
+    """Assert that awaited calls run in order, a failing call is retried a bounded number of times."""
+    runner = PostCommitCalls(app)
+    runner.in_background = False
+    runner.retries = 2
+    runner.retry_backoff = 0
+    business = Business(id=1, identifier='BC1234567')
+    filing = Filing(id=1)
+    events = []
+    flaky = MagicMock(side_effect=[Exception('down'), None])
+    failing = MagicMock(side_effect=Exception('down'))
+
+    asyncio.run(runner.run_awaited(business, filing, [flaky, failing, lambda b, f: events.append(('last', b, f))]))
+
+    assert flaky.call_count == 2
+    assert failing.call_count == 3
+    assert events == [('last', business, filing)]
+
+
+def test_post_commit_calls_awaited_timeout(app):
+    """Assert that awaited calls run off the event loop, and a call that times out isn't made again."""
+    runner = PostCommitCalls(app)
+    runner.in_background = True
+    runner.retries = 2
+    runner.retry_backoff = 0
+    runner.timeout = 0.05
+    threads = []
+    slow = MagicMock(side_effect=lambda b, f: time.sleep(0.2))
+
+    async def run():
+        threads.append(threading.get_ident())
+        await runner.run_awaited(None, Filing(id=0), [slow, lambda b, f: threads.append(threading.get_ident())])
+
+    asyncio.run(run())
+    runner.shutdown()
+
+    assert slow.call_count == 1
+    assert len(threads) == 2
+    assert threads[0] != threads[1]
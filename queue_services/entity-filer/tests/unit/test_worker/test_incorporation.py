@@ -149,6 +149,19 @@ def test_update_affiliation_error(mocker):
         level='error'
     )
 
+
+def test_update_affiliation_raise_error(mocker):
+    """Assert that an error before the affiliation is created is raised for the caller to retry."""
+    import sentry_sdk
+    filing = Filing(id=1)
+    mocker.patch('sentry_sdk.capture_message')
+
+    with pytest.raises(AttributeError):
+        business_profile.update_affiliation(None, filing, raise_error=True)
+
+    sentry_sdk.capture_message.assert_not_called()
+
+
 @pytest.mark.skip("AttributeError: can't set attribute")
 @pytest.mark.asyncio
 async def test_publish_email_message(app, session, stan_server, event_loop, client_id, entity_stan, future):
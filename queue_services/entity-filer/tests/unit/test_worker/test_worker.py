@@ -527,3 +527,28 @@ async def test_publish_event():
         }
 
     mock_publish.publish.assert_called_with('entity.events', payload)
+
+
+def test_get_filing_keys(app, session):
+    """Assert that filings are keyed on their business, and amalgamations also on the amalgamating businesses."""
+    from legal_api.models import RegistrationBootstrap
+    from registry_schemas.example_data import AMALGAMATION_APPLICATION
+
+    from entity_filer.worker import get_filing_keys
+
+    business = create_business('BC1234567')
+    filing = create_filing('123', COD_FILING, business.id)
+    assert get_filing_keys({'filing': {'id': filing.id}}, app) == ['BC1234567']
+
+    bootstrap = RegistrationBootstrap(account=1111111, _identifier='TNpUnst/Va')
+    bootstrap.save()
+    amalgamation_json = {'filing': {'header': {'name': 'amalgamationApplication', 'date': '2019-04-08'},
+                                    'amalgamationApplication': copy.deepcopy(AMALGAMATION_APPLICATION)}}
+    amalgamation_json['filing']['amalgamationApplication']['amalgamatingBusinesses'] = [
+        {'role': 'amalgamating', 'identifier': 'BC1234567'},
+        {'role': 'amalgamating', 'foreignJurisdiction': {'country': 'CA'}, 'legalName': 'Foreign Co'}
+    ]
+    filing = create_filing('124', amalgamation_json, bootstrap_id=bootstrap.identifier)
+    assert get_filing_keys({'filing': {'id': filing.id}}, app) == ['TNpUnst/Va', 'BC1234567']
+
+    assert get_filing_keys({'filing': {'id': 0}}, app) == ['filing:0']
@@ -75,6 +75,12 @@ class _Config():  # pylint: disable=too-few-public-methods
     DB_PORT = os.getenv('DATABASE_PORT', '5432')
     SQLALCHEMY_DATABASE_URI = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{int(DB_PORT)}/{DB_NAME}'
 
+    # waiting for the filing with the payment token, woken by the filing_payment notification
+    # or polling on PAYMENT_POLL_INTERVAL when listening is disabled or unavailable
+    PAYMENT_LISTEN_ENABLED = os.getenv('PAYMENT_LISTEN_ENABLED', 'True').lower() == 'true'
+    PAYMENT_WAIT_TIMEOUT = float(os.getenv('PAYMENT_WAIT_TIMEOUT', '1'))
+    PAYMENT_POLL_INTERVAL = float(os.getenv('PAYMENT_POLL_INTERVAL', '0.2'))
+
     NATS_CONNECTION_OPTIONS = {
         'servers': os.getenv('NATS_SERVERS', 'nats://127.0.0.1:4222').split(','),
         'name': os.getenv('NATS_CLIENT_NAME', 'entity.filing.worker')
@@ -0,0 +1,168 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Wait for the filing carrying a payment token to be committed.
+
+A payment token can arrive on the queue before the legal api has committed the filing it belongs to.
+The filings_payment_notify trigger on the filings table sends the payment token on the filing_payment
+channel when the filing with that token is committed. The listener keeps one connection LISTENing on the
+channel, read from the event loop, and wakes the messages waiting on that payment token.
+
+If the listener can't connect, the wait falls back to looking the filing up on an interval until the timeout.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Dict, List, Optional, TypeVar
+
+import psycopg2
+import psycopg2.extensions
+from entity_queue_common.service_utils import logger
+
+
+CHANNEL = 'filing_payment'
+
+T = TypeVar('T')
+
+
+class PaymentListener:
+    """Listen for the filings committed with a payment token."""
+
+    def __init__(self, app=None):
+        """Create the listener, connecting on first use."""
+        self.dsn = None
+        self.enabled = True
+        self.poll_interval = 0.2
+        self._conn = None
+        self._fd = None
+        self._loop = None
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure the listener from the app config."""
+        self.dsn = app.config.get('SQLALCHEMY_DATABASE_URI')
+        self.enabled = app.config.get('PAYMENT_LISTEN_ENABLED', True)
+        self.poll_interval = app.config.get('PAYMENT_POLL_INTERVAL', 0.2)
+
+    @property
+    def listening(self) -> bool:
+        """Return if the listener is connected and listening on the channel."""
+        return self._conn is not None and not self._conn.closed
+
+    def start(self) -> bool:
+        """Connect and LISTEN on the channel, returning if the listener is available."""
+        if self.listening:
+            return True
+        if not self.enabled or not self.dsn:
+            return False
+        conn = None
+        try:
+            conn = psycopg2.connect(self.dsn)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL};')
+            self._loop = asyncio.get_event_loop()
+            self._fd = conn.fileno()
+            self._loop.add_reader(self._fd, self._on_readable)
+            self._conn = conn
+            logger.info('Listening for filing payments on %s', CHANNEL)
+            return True
+        except (psycopg2.Error, OSError) as err:
+            logger.error('Unable to listen for filing payments, falling back to polling: %s', err)
+            if conn is not None:
+                conn.close()
+            return False
+
+    def stop(self):
+        """Stop listening and close the connection."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        self._loop.remove_reader(self._fd)
+        try:
+            conn.close()
+        except psycopg2.Error:  # the connection may already be gone
+            pass
+        self._wake_all()
+
+    async def wait_for(self, payment_id: str, lookup: Callable[[], Optional[T]], timeout: float) -> Optional[T]:
+        """Return the lookup result, waiting up to timeout seconds for the filing with payment_id to be committed.
+
+        The waiter is registered before the first lookup, so a filing committed in between is not missed.
+        """
+        if not self.start():
+            return await self._poll(lookup, timeout)
+
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        waiter = loop.create_future()
+        self._waiters.setdefault(payment_id, []).append(waiter)
+        try:
+            if result := lookup():
+                return result
+            try:
+                notified = await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                return lookup()
+        finally:
+            self._remove_waiter(payment_id, waiter)
+
+        if notified:
+            return lookup()
+        # the listener went away while waiting, so look for the filing for the rest of the timeout
+        return await self._poll(lookup, deadline - loop.time())
+
+    async def _poll(self, lookup: Callable[[], Optional[T]], timeout: float) -> Optional[T]:
+        """Return the lookup result, trying it on the poll interval until timeout seconds have passed."""
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        while not (result := lookup()):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(self.poll_interval, remaining))
+        return result
+
+    def _on_readable(self):
+        """Read the notifications waiting on the connection and wake the messages waiting on them."""
+        try:
+            self._conn.poll()
+        except (psycopg2.Error, OSError) as err:
+            logger.error('Lost the filing payment listener connection: %s', err)
+            self.stop()
+            return
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            for waiter in self._waiters.pop(notify.payload, []):
+                if not waiter.done():
+                    waiter.set_result(True)
+
+    def _remove_waiter(self, payment_id: str, waiter: asyncio.Future):
+        """Remove the waiter, if it is still registered."""
+        waiters = self._waiters.get(payment_id)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._waiters[payment_id]
+
+    def _wake_all(self):
+        """Wake every waiter, so they look the filing up again rather than wait out the timeout."""
+        waiters, self._waiters = self._waiters, {}
+        for waiter in (waiter for pending in waiters.values() for waiter in pending):
+            if not waiter.done():
+                waiter.set_result(False)
+
+
+payment_listener = PaymentListener()  # pylint: disable=invalid-name
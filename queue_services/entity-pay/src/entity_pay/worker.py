@@ -25,7 +25,6 @@ Flask-SQLAlchemy currently allows the base model to be changed, or reworking
 the model to a standalone SQLAlchemy usage with an async engine would need
 to be pursued.
 """
-import asyncio
 import datetime
 import json
 import os
@@ -41,6 +40,7 @@ from sentry_sdk import capture_message
 from sqlalchemy.exc import OperationalError
 
 from entity_pay import config
+from entity_pay.payment_listener import payment_listener
 
 
 qsm = QueueServiceManager()  # pylint: disable=invalid-name
@@ -48,6 +48,7 @@ APP_CONFIG = config.get_named_config(os.getenv('DEPLOYMENT_ENV', 'production'))
 FLASK_APP = Flask(__name__)
 FLASK_APP.config.from_object(APP_CONFIG)
 db.init_app(FLASK_APP)
+payment_listener.init_app(FLASK_APP)
 
 
 def extract_payment_token(msg: nats.aio.client.Msg) -> dict:
@@ -84,15 +85,12 @@ async def process_payment(payment_token, flask_app):
         raise QueueException('Flask App not available.')
 
     with flask_app.app_context():
-        # try to find the filing 5 times before putting back on the queue - in case payment token ends up on the queue
-        # before it is assigned to filing.
-        counter = 1
-        filing_submission = None
-        while not filing_submission and counter <= 5:
-            filing_submission = get_filing_by_payment_id(payment_token['paymentToken'].get('id'))
-            counter += 1
-            if not filing_submission:
-                await asyncio.sleep(0.2)
+        # the payment token can end up on the queue before it is assigned to the filing,
+        # so wait for the filing with the token to be committed before giving up on it.
+        payment_id = payment_token['paymentToken'].get('id')
+        filing_submission = await payment_listener.wait_for(str(payment_id),
+                                                            lambda: get_filing_by_payment_id(payment_id),
+                                                            flask_app.config.get('PAYMENT_WAIT_TIMEOUT', 1))
         if not filing_submission:
             raise FilingException
 
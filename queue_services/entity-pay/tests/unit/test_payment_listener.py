@@ -0,0 +1,70 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Test Suites to ensure that the payment listener wakes the waiting payments."""
+import asyncio
+from collections import namedtuple
+
+from entity_pay.payment_listener import PaymentListener
+
+
+Notify = namedtuple('Notify', 'pid channel payload')
+
+
+class FakeConnection:
+    """A listening connection holding the notifications to deliver."""
+
+    closed = 0
+
+    def __init__(self):
+        """Create the connection with no notifications."""
+        self.notifies = []
+
+    def poll(self):
+        """Notifications are added directly."""
+
+
+async def test_wait_for_notification(monkeypatch):
+    """Assert the waiting payment is woken by the notification for its payment token, well before the timeout."""
+    listener = PaymentListener()
+    listener._conn = FakeConnection()  # pylint: disable=protected-access
+    monkeypatch.setattr(listener, 'start', lambda: True)
+
+    filings = {}
+    loop = asyncio.get_event_loop()
+
+    def commit_filing():
+        filings['1234'] = 'filing'
+        listener._conn.notifies.append(Notify(1, 'filing_payment', '9999'))  # pylint: disable=protected-access
+        listener._conn.notifies.append(Notify(1, 'filing_payment', '1234'))  # pylint: disable=protected-access
+        listener._on_readable()  # pylint: disable=protected-access
+
+    loop.call_later(0.05, commit_filing)
+    start = loop.time()
+    filing = await listener.wait_for('1234', lambda: filings.get('1234'), timeout=10)
+
+    assert filing == 'filing'
+    assert loop.time() - start < 5
+    assert not listener._waiters  # pylint: disable=protected-access
+
+
+async def test_wait_for_polls_without_listener():
+    """Assert the filing is still found by polling when the listener is not available."""
+    listener = PaymentListener()
+    listener.enabled = False
+    listener.poll_interval = 0.01
+
+    lookups = iter([None, None, 'filing'])
+    assert await listener.wait_for('1234', lambda: next(lookups), timeout=1) == 'filing'
+
+    assert await listener.wait_for('1234', lambda: None, timeout=0.05) is None